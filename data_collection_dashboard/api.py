@@ -0,0 +1,352 @@
+"""
+API HTTP de sólo lectura sobre los datos del dashboard.
+
+Servicio independiente (sin Streamlit) que lee el mismo fichero que
+data_manager.load_data. Cada respuesta lleva un ETag derivado de la
+versión de los datos (mtime_ns y tamaño del fichero), de la fecha de
+referencia de los vencidos y de la URL pedida; un cliente que repite la
+petición con If-None-Match recibe 304 sin cuerpo mientras los datos (y
+el día) no cambien.
+
+Endpoints:
+    GET /items        items filtrados y paginados (JSON) o todos (NDJSON)
+    GET /stats        salida de generate_summary_stats
+    GET /categories   agregados por categoría
+    GET /version      versión actual de los datos
+
+Filtros de /items y /categories (repetibles): category, status, priority,
+risk, y q para búsqueda de texto. Paginación: page (desde 0) y page_size.
+Con format=ndjson o Accept: application/x-ndjson, /items devuelve todas
+las filas que cumplen los filtros, una por línea, en bloques.
+
+Uso (desde la raíz del repositorio):
+    python data_collection_dashboard/api.py --port 8502
+"""
+import argparse
+import hashlib
+import json
+import threading
+import traceback
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from config import DATA_FILE
+from out_of_core import is_large_dataset, iter_matching, read_page, scan_aggregates
+from sidecar import load_sidecar
+from utils.aggregates import SUMMARY_COLUMNS, build_cube, counts_by, data_dimensions, overdue_mask, slice_cube
+from utils.helpers import build_filter_mask, file_version, generate_summary_stats, read_items_csv
+from utils.search_index import SearchIndex
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NDJSON_CHUNK_ROWS = 10_000
+
+# Parámetro de la URL → clave de filtro del sidebar (FILTER_COLUMNS)
+FILTER_PARAMS = {
+    "category": "categories",
+    "status": "statuses",
+    "priority": "priorities",
+    "risk": "risks",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _to_json(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _dumps(payload):
+    return json.dumps(payload, default=_to_json).encode("utf-8")
+
+
+def _records(df):
+    """Filas como JSON (lista de objetos, fechas ISO)"""
+    return df.to_json(orient="records", date_format="iso")
+
+
+class DataStore:
+    """Datos en memoria recargados sólo cuando cambia la versión del fichero"""
+
+    def __init__(self, path=DATA_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._search_lock = threading.Lock()  # SearchIndex no es seguro entre hilos
+        self._version = None
+        self._df = None
+        self._dimensions = None     # (DataFrame, vocabulario)
+        self._search_index = None   # (DataFrame, SearchIndex)
+        self._aggregates = {}
+
+    def version(self):
+        return file_version(self.path)
+
+    def large(self):
+        return is_large_dataset(self.path)
+
+    def frame(self):
+        """DataFrame completo de la versión actual (modo en memoria)"""
+        version = self.version()
+        with self._lock:
+            if self._df is None or self._version != version:
+                try:
+                    self._df = read_items_csv(self.path)
+                except FileNotFoundError:
+                    self._df = pd.DataFrame()
+                self._version = version
+                self._aggregates = {}
+            return self._df
+
+    def dimensions(self, df):
+        """Vocabulario real de las columnas del cubo (modo en memoria)"""
+        with self._lock:
+            if self._dimensions is None or self._dimensions[0] is not df:
+                self._dimensions = (df, data_dimensions(df))
+            return self._dimensions[1]
+
+    def search(self, df, query):
+        """Ids de fila que casan con la búsqueda (None si no hay términos)"""
+        with self._search_lock:
+            if self._search_index is None or self._search_index[0] is not df:
+                self._search_index = (df, SearchIndex(df))
+            return self._search_index[1].search(query)
+
+    def filtered(self, filters):
+        """Filas que cumplen los filtros y la búsqueda (modo en memoria)"""
+        df = self.frame()
+        if df.empty:
+            return df
+        row_ids = df.index[build_filter_mask(df, filters)]
+        if filters.get("search"):
+            hits = self.search(df, filters["search"])
+            if hits is not None:
+                row_ids = row_ids.intersection(hits)
+        return df.loc[row_ids] if len(row_ids) < len(df) else df
+
+    def cubes(self, filters):
+        """Cubo de conteos, cubo de vencidos y vocabulario de las filas filtradas"""
+        if not self.large():
+            dimensions = self.dimensions(self.frame())
+            df = self.filtered(filters)
+            return (build_cube(df, SUMMARY_COLUMNS, dimensions=dimensions),
+                    build_cube(df, SUMMARY_COLUMNS, mask=overdue_mask(df), dimensions=dimensions), dimensions)
+
+        # Modo fuera de memoria: un recorrido por versión, búsqueda y día
+        # (los vencidos dependen de la fecha); los filtros categóricos se
+        # aplican sobre el cubo
+        key = (self.version(), filters.get("search", ""), date.today())
+        with self._lock:
+            cached = self._aggregates.get(key)
+        if cached is None:
+            cached = scan_aggregates({"search": key[1]}, path=self.path)
+            with self._lock:
+                self._aggregates = {key: cached}
+        cube, overdue, dimensions = cached
+        return (slice_cube(cube, SUMMARY_COLUMNS, filters, dimensions),
+                slice_cube(overdue, SUMMARY_COLUMNS, filters, dimensions), dimensions)
+
+    def stats(self):
+        """generate_summary_stats de todos los datos"""
+        if not self.large():
+            df = self.frame()
+            return generate_summary_stats(df) if not df.empty else {}
+
+        sidecar = load_sidecar(self.version(), self.path)
+        if sidecar is not None:
+            return sidecar.stats
+
+        # Sin sidecar: mismas claves a partir del cubo (sin días restantes)
+        cube, _, dimensions = self.cubes({})
+        total = int(cube.sum())
+        by_status = counts_by(cube, SUMMARY_COLUMNS, "Status", dimensions)
+        return {
+            "by_status": by_status,
+            "by_priority": counts_by(cube, SUMMARY_COLUMNS, "Priority", dimensions),
+            "by_risk": counts_by(cube, SUMMARY_COLUMNS, "Risk Level", dimensions),
+            "completion_rate": by_status.get("Completed", 0) / total * 100 if total else 0.0,
+            "avg_days_remaining": None,
+        }
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ProvenanceAPI/1.0"
+    store = None
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        routes = {
+            "/items": self._items,
+            "/stats": self._stats,
+            "/categories": self._categories,
+            "/version": self._version,
+        }
+        route = routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return self._send_error(404, f"Unknown endpoint: {url.path}")
+
+        version = self.store.version()
+        if version is None:
+            return self._send_error(503, "No data file found")
+
+        # Los vencidos dependen del día: el ETag cambia aunque el fichero no
+        reference = f"{date.today().isoformat()} {self.path}"
+        etag = '"%x-%x-%s"' % (version[0], version[1], hashlib.sha1(reference.encode()).hexdigest()[:12])
+        if_none_match = [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]
+        if etag in if_none_match or "*" in if_none_match:
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        self._headers_sent = False
+        try:
+            route(params, etag, send_body)
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+        except Exception:
+            self.log_error("Error handling %s", self.path)
+            traceback.print_exc()
+            if self._headers_sent:
+                # Respuesta ya empezada (NDJSON): sólo queda cortar la conexión
+                self.close_connection = True
+            else:
+                self._send_error(500, "Internal server error")
+
+    def end_headers(self):
+        super().end_headers()
+        self._headers_sent = True
+
+    def _send_cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+
+    def _send_json(self, body, etag, send_body, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(_dumps({"error": message}), None, self.command != "HEAD", status=status)
+
+    def _send_ndjson(self, frames, etag, send_body):
+        """Enviar bloques de filas como NDJSON con codificación chunked"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if not send_body:
+            return
+        for frame in frames:
+            for start in range(0, len(frame), NDJSON_CHUNK_ROWS):
+                part = frame.iloc[start:start + NDJSON_CHUNK_ROWS]
+                data = part.to_json(orient="records", lines=True, date_format="iso").encode("utf-8")
+                if not data.endswith(b"\n"):
+                    data += b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _filters(self, params):
+        filters = {key: params[name] for name, key in FILTER_PARAMS.items() if name in params}
+        filters["search"] = params.get("q", [""])[0]
+        return filters
+
+    def _int_param(self, params, name, default, minimum, maximum=None):
+        try:
+            value = int(params.get(name, [default])[0])
+        except ValueError:
+            raise ApiError(400, f"Invalid {name}")
+        if value < minimum or (maximum is not None and value > maximum):
+            raise ApiError(400, f"{name} out of range")
+        return value
+
+    def _items(self, params, etag, send_body):
+        filters = self._filters(params)
+        ndjson = params.get("format", [""])[0] == "ndjson" or \
+            "application/x-ndjson" in self.headers.get("Accept", "")
+
+        if ndjson:
+            if self.store.large():
+                frames = iter_matching(filters, path=self.store.path)
+            else:
+                frames = [self.store.filtered(filters)]
+            return self._send_ndjson(frames, etag, send_body)
+
+        page = self._int_param(params, "page", 0, 0)
+        page_size = self._int_param(params, "page_size", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        if self.store.large():
+            rows, total = read_page(filters, page, page_size, path=self.store.path)
+        else:
+            matched = self.store.filtered(filters)
+            total = len(matched)
+            rows = matched.iloc[page * page_size:(page + 1) * page_size]
+
+        body = (
+            '{"total": %d, "page": %d, "page_size": %d, "items": %s}'
+            % (total, page, page_size, _records(rows) if not rows.empty else "[]")
+        ).encode("utf-8")
+        self._send_json(body, etag, send_body)
+
+    def _stats(self, params, etag, send_body):
+        self._send_json(_dumps(self.store.stats()), etag, send_body)
+
+    def _categories(self, params, etag, send_body):
+        cube, overdue, dimensions = self.store.cubes(self._filters(params))
+        categories = []
+        for category, total in counts_by(cube, SUMMARY_COLUMNS, "Category", dimensions).items():
+            only = {"categories": [category]}
+            by_status = counts_by(slice_cube(cube, SUMMARY_COLUMNS, only, dimensions), SUMMARY_COLUMNS, "Status",
+                                  dimensions)
+            categories.append({
+                "category": category,
+                "total": total,
+                "by_status": by_status,
+                "completion_rate": by_status.get("Completed", 0) / total * 100,
+                "overdue": int(slice_cube(overdue, SUMMARY_COLUMNS, only, dimensions).sum()),
+            })
+        self._send_json(_dumps({"categories": categories}), etag, send_body)
+
+    def _version(self, params, etag, send_body):
+        mtime_ns, size = self.store.version()
+        self._send_json(_dumps({"mtime_ns": mtime_ns, "size": size, "large": self.store.large()}), etag, send_body)
+
+
+def serve(host="127.0.0.1", port=8502, path=DATA_FILE):
+    ApiHandler.store = DataStore(path)
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    print(f"Serving read-only API for {path} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the dashboard data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data-file", default=DATA_FILE)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.data_file)
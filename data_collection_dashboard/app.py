@@ -1,12 +1,31 @@
 import streamlit as st
 import pandas as pd
-from views.overview import show_overview
+from views.overview import show_overview, show_overview_from_cube
 from views.data_table import show_data_table
 from views.detailed_view import show_detailed_view
 from views.analytics import show_analytics
 from views.settings import show_settings
+from views.monitoring import show_monitoring
 from components.sidebar import show_sidebar
-from data_manager import load_data, save_data, initialize_data
+from utils.helpers import build_filter_mask
+from data_manager import (load_data, save_data, initialize_data, get_search_index, get_data_version,
+                          load_aggregates, get_sidecar, rebuild_sidecar, record_session_memory,
+                          get_hierarchy_index)
+from config import SESSION_MEMORY_BUDGET_MB
+from out_of_core import is_large_dataset
+from utils.aggregates import SUMMARY_COLUMNS, sidebar_summary, slice_cube
+from datetime import datetime, date
+
+# Copy-on-write: filtros y vistas comparten buffers con el DataFrame cacheado
+pd.options.mode.copy_on_write = True
+
+def show_footer(total_items):
+    """Mostrar pie de página"""
+    st.divider()
+    st.caption(f"""
+**Provenance Scanner Dashboard** | *Distributed System Data Collection*  
+*Last Updated:* {datetime.now().strftime("%Y-%m-%d %H:%M:%S")} | *Total Items Tracked:* {total_items}
+""")
 
 # Configuración de página
 st.set_page_config(
@@ -23,6 +42,47 @@ st.markdown("""
 *Version*: 1.0
 """)
 
+# Modo fuera de memoria: agregados y páginas leídos por bloques sin cargar el DataFrame
+if is_large_dataset():
+    from views.large_dataset import show_large_dataset
+    
+    version = get_data_version()
+    cube, overdue_cube, dimensions = load_aggregates(version, date.today())
+    filters = show_sidebar(pd.DataFrame(), summary=sidebar_summary(cube, dimensions))
+    if filters["search"]:
+        cube, overdue_cube, dimensions = load_aggregates(version, date.today(), filters["search"])
+    
+    show_large_dataset(cube, overdue_cube, filters, version, dimensions)
+    show_footer(int(cube.sum()))
+    st.stop()
+
+# Arranque en caliente: sidebar y Overview desde el sidecar antes de parsear el CSV
+version = get_data_version()
+sidecar = get_sidecar(version)
+
+# Pestañas principales
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+    "📈 Overview Dashboard",
+    "📋 Data Collection Table",
+    "🔍 Detailed View",
+    "📊 Analytics",
+    "📡 Monitoring",
+    "⚙️ Settings"
+])
+
+if sidecar is not None:
+    # Opciones del sidebar con las etiquetas reales guardadas en el sidecar,
+    # las mismas que build_filter_mask compara después con las filas
+    filters = show_sidebar(pd.DataFrame(), summary=sidebar_summary(sidecar.cube, sidecar.dimensions))
+    
+    if not filters["search"]:
+        with tab1:
+            show_overview_from_cube(
+                slice_cube(sidecar.cube, SUMMARY_COLUMNS, filters, sidecar.dimensions),
+                slice_cube(sidecar.overdue_cube(), SUMMARY_COLUMNS, filters, sidecar.dimensions),
+                sidecar.dimensions
+            )
+
 # Cargar datos
 df = load_data()
 
@@ -33,54 +93,60 @@ if df.empty:
     save_data(df)
     st.experimental_rerun()
 
-# Mostrar sidebar y obtener filtros
-filters = show_sidebar(df)
+if sidecar is None:
+    # Sidecar ausente o de otra versión de los datos: reconstruirlo
+    rebuild_sidecar(df)
+    
+    # Mostrar sidebar y obtener filtros
+    filters = show_sidebar(df)
 
 # Aplicar filtros (manejar casos donde no hay valores)
-filtered_df = df.copy()
+filtered_df = df
 
 if not df.empty:
-    if filters["categories"]:
-        filtered_df = filtered_df[filtered_df["Category"].isin(filters["categories"])]
+    mask = build_filter_mask(df, filters)
     
-    if filters["statuses"]:
-        filtered_df = filtered_df[filtered_df["Status"].isin(filters["statuses"])]
+    # Intersección de ids de fila entre filtros y búsqueda
+    row_ids = df.index[mask]
+    if filters["search"]:
+        search_hits = get_search_index(df).search(filters["search"])
+        if search_hits is not None:
+            row_ids = row_ids.intersection(search_hits)
     
-    if filters["priorities"]:
-        filtered_df = filtered_df[filtered_df["Priority"].isin(filters["priorities"])]
-    
-    if filters["risks"]:
-        filtered_df = filtered_df[filtered_df["Risk Level"].isin(filters["risks"])]
+    # Sólo materializar una selección si los filtros excluyen alguna fila
+    if len(row_ids) < len(df):
+        filtered_df = df.loc[row_ids]
 
-# Pestañas principales
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📈 Overview Dashboard",
-    "📋 Data Collection Table",
-    "🔍 Detailed View",
-    "📊 Analytics",
-    "⚙️ Settings"
-])
+# Índice jerárquico compartido por Detailed View y Analytics
+hierarchy = get_hierarchy_index(get_data_version(), filters, filtered_df)
 
 # Mostrar cada vista
-with tab1:
-    show_overview(filtered_df, df)
+if sidecar is None or filters["search"]:
+    with tab1:
+        show_overview(filtered_df, df)
 
 with tab2:
     show_data_table(filtered_df, df, save_data)
 
 with tab3:
-    show_detailed_view(filtered_df)
+    show_detailed_view(filtered_df, hierarchy)
 
 with tab4:
-    show_analytics(filtered_df)
+    show_analytics(filtered_df, hierarchy)
 
 with tab5:
+    show_monitoring()
+
+with tab6:
     show_settings(df, save_data)
 
+# Contabilidad de memoria de la sesión
+session_memory = record_session_memory({"filtered": filtered_df}, shared=df)
+if session_memory["bytes"] > SESSION_MEMORY_BUDGET_MB * 1024 * 1024:
+    st.sidebar.warning(
+        f"⚠️ This session holds {session_memory['bytes'] / 1024 / 1024:.0f} MB of data "
+        f"(budget {SESSION_MEMORY_BUDGET_MB} MB). Narrow the filters to reduce it."
+    )
+
 # Footer
-st.divider()
-from datetime import datetime
-st.caption(f"""
-**Provenance Scanner Dashboard** | *Distributed System Data Collection*  
-*Last Updated:* {datetime.now().strftime("%Y-%m-%d %H:%M:%S")} | *Total Items Tracked:* {len(df)}
-""")
\ No newline at end of file
+show_footer(len(df))
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Importación masiva de items desde CSV, Excel, YAML o NDJSON.
+
+Los ficheros se leen por bloques de tamaño acotado; cada bloque se valida
+columna a columna y las filas válidas se combinan (upsert) con los datos
+existentes por la clave Category/Subcategory/Item. En las filas existentes
+sólo se actualizan las columnas que trae el fichero, así que un fichero con
+Category/Subcategory/Item/Priority/Status/Notes sirve para actualizar estados.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from utils.helpers import validate_items_frame
+
+KEY_COLUMNS = ["Category", "Subcategory", "Item"]
+ITEM_COLUMNS = [
+    "Category", "Subcategory", "Item", "Description", "Type", "Priority",
+    "Status", "Due Date", "Notes", "Risk Level", "Validation Status"
+]
+DEFAULTS = {
+    "Subcategory": "",
+    "Description": "",
+    "Type": "Static",
+    "Status": "Pending",
+    "Notes": "",
+    "Validation Status": "Not Validated",
+}
+SUPPORTED_FORMATS = {
+    ".csv": "csv",
+    ".xlsx": "excel",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+MAX_ERROR_ROWS = 1000
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _stream_size(stream):
+    pos = stream.tell()
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(pos)
+    return size or 1
+
+
+def _iter_csv(stream, chunksize):
+    size = _stream_size(stream)
+    for chunk in pd.read_csv(stream, chunksize=chunksize, dtype=str, keep_default_na=False):
+        yield chunk, min(stream.tell() / size, 1.0)
+
+
+def _iter_ndjson(stream, chunksize):
+    size = _stream_size(stream)
+    for chunk in pd.read_json(stream, lines=True, chunksize=chunksize, dtype=False):
+        yield chunk, min(stream.tell() / size, 1.0)
+
+
+def _iter_excel(stream, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    sheet = workbook.active
+    total = max(sheet.max_row or 1, 1)
+    rows = sheet.iter_rows(values_only=True)
+    header = [str(c) for c in next(rows, ())]
+    batch = []
+    done = 1
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunksize:
+            done += len(batch)
+            yield pd.DataFrame(batch, columns=header), min(done / total, 1.0)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=header), 1.0
+    workbook.close()
+
+
+def _iter_yaml(stream, chunksize):
+    """Leer una lista YAML de nivel superior item a item.
+
+    Los items que empiezan con "- " en la columna 0 se agrupan en bloques
+    y se parsean por separado. Cualquier otra estructura se carga entera.
+    """
+    size = _stream_size(stream)
+    text = io.TextIOWrapper(stream, encoding="utf-8") if not isinstance(stream, io.TextIOBase) else stream
+    lines, items, read = [], 0, 0
+
+    def flush():
+        data = yaml.load("".join(lines), Loader=_YAML_LOADER) or []
+        return pd.DataFrame(data)
+
+    for line in text:
+        read += len(line)
+        if line.startswith("- "):
+            if items >= chunksize:
+                yield flush(), min(read / size, 1.0)
+                lines, items = [], 0
+            items += 1
+        elif not lines and not line.startswith(("#", "---")) and line.strip():
+            # No es una lista de nivel superior: cargar el documento completo
+            data = yaml.load(line + text.read(), Loader=_YAML_LOADER)
+            if isinstance(data, dict):
+                data = next((v for v in data.values() if isinstance(v, list)), [data])
+            for start in range(0, len(data), chunksize):
+                yield pd.DataFrame(data[start:start + chunksize]), 1.0
+            return
+        lines.append(line)
+    if items:
+        yield flush(), 1.0
+
+
+_READERS = {"csv": _iter_csv, "excel": _iter_excel, "yaml": _iter_yaml, "ndjson": _iter_ndjson}
+
+
+def detect_format(file_name):
+    """Formato de importación según la extensión del fichero"""
+    return SUPPORTED_FORMATS.get(os.path.splitext(file_name)[1].lower())
+
+
+def iter_chunks(stream, file_name, chunksize=50_000):
+    """Iterar (bloque, progreso) sobre un fichero de items"""
+    file_format = detect_format(file_name)
+    if file_format is None:
+        raise ValueError(f"Unsupported file type: {file_name}")
+    yield from _READERS[file_format](stream, chunksize)
+
+
+def _normalize(chunk):
+    """Completar columnas opcionales y normalizar tipos"""
+    for column, default in DEFAULTS.items():
+        if column not in chunk.columns:
+            chunk[column] = default
+        else:
+            chunk[column] = chunk[column].fillna(default).replace("", default)
+    if "Risk Level" not in chunk.columns:
+        chunk["Risk Level"] = chunk["Priority"]
+    else:
+        missing = chunk["Risk Level"].isna() | (chunk["Risk Level"].astype(str).str.strip() == "")
+        chunk["Risk Level"] = chunk["Risk Level"].mask(missing, chunk["Priority"])
+    if "Due Date" not in chunk.columns:
+        chunk["Due Date"] = pd.NaT
+    chunk["Due Date"] = pd.to_datetime(chunk["Due Date"], errors="coerce")
+    chunk["Notes"] = chunk["Notes"].astype(str)
+    return chunk[ITEM_COLUMNS]
+
+
+def import_items(stream, file_name, store_df, chunksize=50_000, progress=None):
+    """Importar un fichero y combinarlo con los datos existentes.
+
+    Devuelve el DataFrame resultante y un informe con los conteos y los
+    errores por fila (limitados a MAX_ERROR_ROWS).
+    """
+    store = store_df.reindex(columns=ITEM_COLUMNS).reset_index(drop=True) \
+        if not store_df.empty else pd.DataFrame(columns=ITEM_COLUMNS)
+    store_keys = pd.MultiIndex.from_frame(store[KEY_COLUMNS].fillna("").astype(str))
+    # Si el almacén ya trae claves repetidas se actualiza la última aparición
+    # (get_indexer exige un índice sin duplicados)
+    last = ~store_keys.duplicated(keep="last")
+    store_rows = np.flatnonzero(last)
+    store_keys = store_keys[last]
+
+    report = {"read": 0, "valid": 0, "invalid": 0, "inserted": 0, "updated": 0}
+    errors = []
+    new_rows = []
+    source_row = 2  # primera fila de datos tras la cabecera
+
+    for chunk, fraction in iter_chunks(stream, file_name, chunksize):
+        chunk = chunk.rename(columns=lambda c: str(c).strip())
+        chunk.index = pd.RangeIndex(source_row, source_row + len(chunk))
+        source_row += len(chunk)
+        report["read"] += len(chunk)
+
+        valid, row_errors = validate_items_frame(chunk)
+        kept = MAX_ERROR_ROWS - report["invalid"]
+        if kept > 0 and not row_errors.empty:
+            errors.append(row_errors.head(kept))
+        report["invalid"] += len(row_errors)
+
+        # Columnas presentes en el fichero: son las únicas que se actualizan
+        # en las filas existentes (las demás conservan su valor)
+        present = [store.columns.get_loc(c) for c in ITEM_COLUMNS if c in chunk.columns]
+        rows = _normalize(chunk[valid.to_numpy()].copy())
+        rows = rows.drop_duplicates(KEY_COLUMNS, keep="last")
+        report["valid"] += int(valid.sum())
+
+        # Upsert del bloque: actualizar filas existentes en lote y acumular las nuevas
+        keys = pd.MultiIndex.from_frame(rows[KEY_COLUMNS].astype(str))
+        positions = store_keys.get_indexer(keys)
+        existing = positions >= 0
+        if existing.any():
+            store.iloc[store_rows[positions[existing]], present] = rows[existing].iloc[:, present].to_numpy()
+            report["updated"] += int(existing.sum())
+        new_rows.append(rows[~existing])
+
+        if progress is not None:
+            progress(fraction, report)
+
+    if new_rows:
+        added = pd.concat(new_rows, ignore_index=True).drop_duplicates(KEY_COLUMNS, keep="last")
+        report["inserted"] = len(added)
+        if not added.empty:
+            store = pd.concat([store, added], ignore_index=True) if not store.empty else added.reset_index(drop=True)
+
+    report["errors"] = (
+        pd.concat(errors).rename("Errors").rename_axis("Row").reset_index()
+        if errors else pd.DataFrame(columns=["Row", "Errors"])
+    )
+    return store, report
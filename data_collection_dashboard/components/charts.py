@@ -18,6 +18,21 @@ def create_pie_chart(df, column, title):
     )
     return fig
 
+def create_pie_chart_from_counts(counts, column, title):
+    """Crear gráfico de pastel a partir de conteos precalculados"""
+    if not counts:
+        return None
+    
+    value_counts = pd.DataFrame({column: list(counts), "Count": list(counts.values())})
+    
+    fig = px.pie(
+        value_counts, 
+        values="Count", 
+        names=column,
+        title=title
+    )
+    return fig
+
 def create_bar_chart(df, x_column, y_column, title, color_column=None):
     """Crear gráfico de barras"""
     if df.empty or x_column not in df.columns or y_column not in df.columns:
@@ -35,4 +50,53 @@ def create_bar_chart(df, x_column, y_column, title, color_column=None):
     else:
         fig = px.bar(df, x=x_column, y=y_column, title=title)
     
-    return fig
\ No newline at end of file
+    return fig
+
+def create_line_chart(df, y_columns, title, y_title="Count"):
+    """Crear gráfico de líneas sobre un índice temporal"""
+    if df.empty:
+        return None
+    
+    fig = px.line(df, y=y_columns, title=title, markers=len(df) < 50)
+    fig.update_layout(xaxis_title=None, yaxis_title=y_title, legend_title=None)
+    return fig
+
+def create_treemap(nodes, title):
+    """Crear treemap jerárquico coloreado por porcentaje completado"""
+    if nodes.empty:
+        return None
+    
+    fig = go.Figure(go.Treemap(
+        ids=nodes["id"],
+        labels=nodes["label"],
+        parents=nodes["parent"],
+        values=nodes["value"],
+        branchvalues="total",
+        marker=dict(colors=nodes["completion"], colorscale="RdYlGn", cmin=0, cmax=100,
+                    colorbar=dict(title="% Completed")),
+        hovertemplate="<b>%{label}</b><br>Items: %{value}<br>Completed: %{color:.0f}%<extra></extra>",
+        maxdepth=2
+    ))
+    fig.update_layout(title=title, margin=dict(t=50, l=10, r=10, b=10))
+    return fig
+
+def create_range_chart(series, title, y_title=None):
+    """Crear gráfico de líneas con banda min/max por serie
+
+    series: {nombre: DataFrame con índice temporal y columnas avg, min, max}
+    """
+    series = {name: frame for name, frame in series.items() if not frame.empty}
+    if not series:
+        return None
+    
+    fig = go.Figure()
+    for name, frame in series.items():
+        fig.add_trace(go.Scatter(x=frame.index, y=frame["max"], mode="lines", line=dict(width=0),
+                                 showlegend=False, hoverinfo="skip", legendgroup=name))
+        fig.add_trace(go.Scatter(x=frame.index, y=frame["min"], mode="lines", line=dict(width=0),
+                                 fill="tonexty", opacity=0.2, showlegend=False, hoverinfo="skip",
+                                 legendgroup=name))
+        fig.add_trace(go.Scatter(x=frame.index, y=frame["avg"], mode="lines", name=name, legendgroup=name))
+    fig.update_layout(title=title, xaxis_title=None, yaxis_title=y_title, legend_title=None,
+                      hovermode="x unified")
+    return fig
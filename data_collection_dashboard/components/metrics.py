@@ -7,23 +7,28 @@ def show_metrics(df):
         st.warning("No data available")
         return {"total": 0, "completed": 0, "critical": 0, "overdue": 0}
     
+    total_items = len(df)
+    completed = int((df["Status"] == "Completed").sum())
+    critical_items = int((df["Priority"] == "Critical").sum())
+    overdue = int(((df["Due Date"] < pd.Timestamp.now()) & (df["Status"] != "Completed")).sum())
+    
+    return show_metric_cards(total_items, completed, critical_items, overdue)
+
+def show_metric_cards(total_items, completed, critical_items, overdue):
+    """Mostrar las tarjetas de métricas a partir de conteos ya calculados"""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_items = len(df)
         st.metric("Total Items", total_items)
     
     with col2:
-        completed = len(df[df["Status"] == "Completed"])
         completion_rate = (completed/total_items*100) if total_items > 0 else 0
         st.metric("Completed", f"{completed} ({completion_rate:.1f}%)")
     
     with col3:
-        critical_items = len(df[df["Priority"] == "Critical"])
         st.metric("Critical Items", critical_items)
     
     with col4:
-        overdue = len(df[(df["Due Date"] < pd.Timestamp.now()) & (df["Status"] != "Completed")])
         st.metric("Overdue", overdue, delta_color="inverse")
     
     return {
@@ -1,17 +1,34 @@
 import streamlit as st
 
-def show_sidebar(df):
-    """Mostrar sidebar con controles y filtros"""
+def show_sidebar(df, summary=None):
+    """Mostrar sidebar con controles y filtros
+    
+    En modo fuera de memoria df está vacío y las opciones y totales se
+    toman de summary (opciones por columna, total y críticos pendientes).
+    """
     st.sidebar.header("📊 Dashboard Controls")
     
+    # Búsqueda de texto completo
+    search_query = st.sidebar.text_input(
+        "🔎 Search",
+        placeholder="Search item, description or notes...",
+        key="search_query"
+    )
+    
     # Filtros - manejar DataFrames vacíos
     st.sidebar.subheader("Filters")
     
     # Obtener opciones únicas, manejando DataFrames vacíos
-    categories = df["Category"].unique().tolist() if not df.empty else []
-    statuses = df["Status"].unique().tolist() if not df.empty else []
-    priorities = df["Priority"].unique().tolist() if not df.empty else []
-    risks = df["Risk Level"].unique().tolist() if not df.empty else []
+    if summary is not None:
+        categories = summary["options"]["Category"]
+        statuses = summary["options"]["Status"]
+        priorities = summary["options"]["Priority"]
+        risks = summary["options"]["Risk Level"]
+    else:
+        categories = df["Category"].unique().tolist() if not df.empty else []
+        statuses = df["Status"].unique().tolist() if not df.empty else []
+        priorities = df["Priority"].unique().tolist() if not df.empty else []
+        risks = df["Risk Level"].unique().tolist() if not df.empty else []
     
     # Valores predeterminados seguros
     default_categories = categories[:] if categories else []
@@ -52,6 +69,7 @@ def show_sidebar(df):
     
     if st.sidebar.button("🔄 Refresh All Data", use_container_width=True):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.experimental_rerun()
     
     if st.sidebar.button("📊 Generate Summary Report", use_container_width=True):
@@ -61,7 +79,10 @@ def show_sidebar(df):
     st.sidebar.divider()
     st.sidebar.subheader("System Info")
     
-    if not df.empty:
+    if summary is not None:
+        total_items = summary["total"]
+        critical_pending = summary["critical_pending"]
+    elif not df.empty:
         total_items = len(df)
         critical_pending = len(df[(df["Priority"] == "Critical") & (df["Status"] == "Pending")])
     else:
@@ -75,5 +96,6 @@ def show_sidebar(df):
         "categories": categories_filter,
         "statuses": statuses_filter,
         "priorities": priorities_filter,
-        "risks": risks_filter
+        "risks": risks_filter,
+        "search": search_query
     }
\ No newline at end of file
@@ -1,3 +1,19 @@
+# Almacenamiento de datos
+DATA_FILE = "data_collection_dashboard/data_collection_progress.csv"
+HISTORY_DIR = "data_collection_dashboard/history"
+
+# Métricas de hosts del colector dinámico (almacén de series temporales del scanner)
+METRICS_DIR = "scanner/data/metrics"
+TIMESERIES_MODULE = "scanner/storage/timeseries.py"
+
+# Modo fuera de memoria: se activa cuando el fichero de datos supera este tamaño
+OUT_OF_CORE_THRESHOLD_MB = 200
+OUT_OF_CORE_CHUNK_ROWS = 100_000
+
+# Presupuestos de memoria (avisos en el sidebar y en Settings)
+SESSION_MEMORY_BUDGET_MB = 256
+PROCESS_MEMORY_BUDGET_MB = 2048
+
 # Opciones para dropdowns
 STATUS_OPTIONS = ["Pending", "In Progress", "Completed", "Verified", "Blocked"]
 PRIORITY_OPTIONS = ["Critical", "High", "Medium", "Low"]
@@ -5,6 +21,14 @@ RISK_LEVEL_OPTIONS = ["Critical", "High", "Medium", "Low"]
 VALIDATION_OPTIONS = ["Not Validated", "Validated", "Failed", "In Review"]
 TYPE_OPTIONS = ["Static", "Dynamic", "Static+Dynamic"]
 
+# Filtros del sidebar y columna a la que se aplican
+FILTER_COLUMNS = {
+    "categories": "Category",
+    "statuses": "Status",
+    "priorities": "Priority",
+    "risks": "Risk Level",
+}
+
 # Configuración de columnas para data_editor
 COLUMN_CONFIG = {
     "Status": {"options": STATUS_OPTIONS},
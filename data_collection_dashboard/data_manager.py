@@ -1,34 +1,141 @@
+import os
+import importlib.util
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
+from config import DATA_FILE, STATUS_OPTIONS, METRICS_DIR, TIMESERIES_MODULE
 from utils.initial_data import get_full_initial_data
+from utils.helpers import file_version, read_items_csv
+from utils.search_index import SearchIndex
+from utils.hierarchy import HierarchyIndex
+from history_store import record_snapshot
+from out_of_core import scan_aggregates, read_page
+from sidecar import write_sidecar, load_sidecar
+from utils.memory import MemoryRegistry
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-@st.cache_data
+def get_data_version():
+    """Versión de los datos almacenados (mtime y tamaño del fichero)"""
+    return file_version(DATA_FILE)
+
+@st.cache_resource
 def load_data():
-    """Cargar datos desde CSV o inicializar si no existe"""
+    """Cargar datos desde CSV o inicializar si no existe
+    
+    El DataFrame se comparte entre sesiones y es de sólo lectura: con
+    copy-on-write las vistas derivadas no lo copian, y quien necesite
+    modificarlo debe partir de df.copy(deep=False).
+    """
     try:
-        df = pd.read_csv("data_collection_dashboard/data_collection_progress.csv")
-        
-        # Asegurar tipos de datos correctos
-        if "Due Date" in df.columns:
-            df["Due Date"] = pd.to_datetime(df["Due Date"], errors='coerce')
-        
-        # Asegurar que Notes sea string, no float
-        if "Notes" in df.columns:
-            df["Notes"] = df["Notes"].astype(str).replace('nan', '').replace('None', '')
-        
-        return df
+        return read_items_csv(DATA_FILE)
     except FileNotFoundError:
         return pd.DataFrame()  # Devolver DataFrame vacío
 
+@st.cache_resource
+def get_memory_registry():
+    """Registro de memoria compartido por todas las sesiones del proceso"""
+    return MemoryRegistry()
+
+def record_session_memory(frames, shared):
+    """Registrar la memoria propia de la sesión actual y devolver su entrada"""
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx is not None else "local"
+    return get_memory_registry().record(session_id, frames, shared=shared)
+
+@st.cache_resource(max_entries=2)
+def get_sidecar(version):
+    """Sidecar mapeado en memoria de la versión de datos actual (None si no es válido)"""
+    return load_sidecar(version)
+
+def rebuild_sidecar(df):
+    """Reconstruir el sidecar cuando falta o no corresponde a los datos"""
+    write_sidecar(df, get_data_version())
+    get_sidecar.clear()
+
+@st.cache_data(max_entries=8)
+def load_aggregates(version, day, search=""):
+    """Cubos agregados del fichero completo y su vocabulario (modo fuera de memoria).
+    
+    Sin búsqueda se usan los del sidecar si es válido; si no, se recorre
+    el fichero por bloques.
+    """
+    sidecar = get_sidecar(version) if not search else None
+    if sidecar is not None:
+        return np.array(sidecar.cube), sidecar.overdue_cube(), sidecar.dimensions
+    return scan_aggregates({"search": search})
+
+@st.cache_data(max_entries=32)
+def load_page(version, filters, page, page_size):
+    """Página de filas filtradas leída por bloques (modo fuera de memoria).
+
+    El total ya lo da el cubo, así que la lectura termina en la página pedida.
+    """
+    rows, _ = read_page(filters, page, page_size, count_total=False)
+    return rows
+
+@st.cache_resource
+def _search_index_state():
+    """Índice de búsqueda compartido entre sesiones"""
+    return {"version": None, "index": None}
+
+def get_search_index(df):
+    """Obtener el índice de búsqueda, construyéndolo una vez por versión de datos"""
+    state = _search_index_state()
+    version = get_data_version()
+    if state["index"] is None or state["version"] != version:
+        state["index"] = SearchIndex(df)
+        state["version"] = version
+    return state["index"]
+
+@st.cache_resource
+def _open_metrics_store():
+    """Almacén de series temporales compartido entre sesiones
+
+    El formato lo define scanner/storage/timeseries.py, que sólo depende de
+    NumPy y se carga directamente desde su fichero.
+    """
+    spec = importlib.util.spec_from_file_location("scanner_timeseries", TIMESERIES_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.TimeSeriesStore(METRICS_DIR)
+
+def get_metrics_store():
+    """Almacén de métricas de hosts en sólo lectura (None si aún no se ha recogido ninguna)"""
+    if not os.path.isdir(METRICS_DIR) or not os.path.exists(TIMESERIES_MODULE):
+        return None
+    return _open_metrics_store()
+
+@st.cache_resource(max_entries=8)
+def get_hierarchy_index(version, filters, _df):
+    """Índice jerárquico de las filas filtradas, uno por versión de datos y filtros"""
+    return HierarchyIndex(_df)
+
 def save_data(df):
     """Guardar datos en CSV"""
-    # Asegurar tipos antes de guardar
+    # Asegurar tipos antes de guardar (sin modificar el DataFrame recibido)
     if "Notes" in df.columns:
-        df["Notes"] = df["Notes"].astype(str).fillna('')
+        df = df.assign(Notes=df["Notes"].fillna('').astype(str))
     
-    df.to_csv("data_collection_dashboard/data_collection_progress.csv", index=False)
+    # Escritura atómica: fichero temporal + rename
+    tmp_file = f"{DATA_FILE}.tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, DATA_FILE)
+    load_data.clear()
     st.session_state['last_update'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Registrar snapshot agregado para el histórico de tendencias
+    record_snapshot(df)
+    
+    # Sidecar de arranque en caliente para la nueva versión de los datos
+    write_sidecar(df, get_data_version())
+    get_sidecar.clear()
+    
+    # Actualizar el índice de búsqueda sólo con las filas modificadas
+    state = _search_index_state()
+    if state["index"] is not None:
+        state["index"].update(df.reset_index(drop=True))
+        state["version"] = get_data_version()
 
 def initialize_data():
     """Inicializar datos con TODA la especificación"""
@@ -56,5 +163,33 @@ def initialize_data():
         })
     
     df = pd.DataFrame(data)
+    save_data(df)
+    return df
+
+def initialize_sample_data():
+    """Inicializar datos de ejemplo: dos items por categoría con estados variados"""
+    sample_items = []
+    per_category = {}
+    for item in get_full_initial_data():
+        count = per_category.get(item["Category"], 0)
+        if count < 2:
+            sample_items.append(item)
+            per_category[item["Category"]] = count + 1
+    
+    now = datetime.now()
+    df = pd.DataFrame([{
+        "Category": item["Category"],
+        "Subcategory": item["Subcategory"],
+        "Item": item["Item"],
+        "Description": item["Description"],
+        "Type": item["Type"],
+        "Priority": item["Priority"],
+        "Status": STATUS_OPTIONS[i % len(STATUS_OPTIONS)],
+        "Due Date": now + timedelta(days=7 * (i % 8) - 14),
+        "Notes": "",
+        "Risk Level": item["Risk Level"],
+        "Validation Status": "Not Validated"
+    } for i, item in enumerate(sample_items)])
+    
     save_data(df)
     return df
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+Histórico compacto del progreso para burndown y tendencias.
+
+Cada guardado añade un snapshot de conteos Category × Status × Priority
+(más los vencidos por categoría) codificado como delta disperso respecto
+al snapshot anterior. Los cambios de Status por item (Category,
+Subcategory, Item) van a un log de sólo-añadir; un item borrado pasa a
+-1. Todos los ficheros son arrays binarios de ancho fijo.
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import HISTORY_DIR
+from utils.aggregates import DIMENSIONS, CLOSED_STATUSES, build_cube, cube_shape, encode_column, overdue_mask
+
+CUBE_COLUMNS = ["Category", "Status", "Priority"]
+ITEM_KEY = ["Category", "Subcategory", "Item"]
+
+SNAPSHOT_DTYPE = np.dtype([("ts", "<i8"), ("offset", "<i8"), ("count", "<i4")])
+DELTA_DTYPE = np.dtype([("cell", "<u2"), ("delta", "<i4")])
+TRANSITION_DTYPE = np.dtype([("ts", "<i8"), ("item", "<u8"), ("from", "i1"), ("to", "i1")])
+
+_META = "meta.json"
+_SNAPSHOTS = "snapshots.bin"
+_DELTAS = "deltas.bin"
+_TRANSITIONS = "transitions.bin"
+_STATE = "state.npz"
+
+
+def _path(name, history_dir):
+    return os.path.join(history_dir, name)
+
+
+def _layout():
+    return {"version": 3, "cube": CUBE_COLUMNS, "dimensions": {c: DIMENSIONS[c] for c in CUBE_COLUMNS}}
+
+
+def _cells(df, now):
+    """Vector plano de conteos: cubo Category × Status × Priority + vencidos por categoría"""
+    cube = build_cube(df, CUBE_COLUMNS)
+    overdue = build_cube(df, ["Category"], mask=overdue_mask(df, now))
+    return np.concatenate([cube.ravel(), overdue]).astype(np.int32)
+
+
+def _item_ids(df):
+    """Hash estable de (Category, Subcategory, Item) por fila.
+
+    Las claves repetidas se distinguen por su ordinal de aparición, así cada
+    repetición conserva su propio Status entre guardados.
+    """
+    if df.empty:
+        return np.empty(0, dtype=np.uint64)
+    keys = df[ITEM_KEY].fillna("").astype(str)
+    keys["ordinal"] = keys.groupby(ITEM_KEY, sort=False).cumcount()
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def _read(name, dtype, history_dir):
+    path = _path(name, history_dir)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _check_layout(history_dir):
+    """Rotar el histórico si las dimensiones de config.py han cambiado"""
+    meta_path = _path(_META, history_dir)
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            if json.load(f) == _layout():
+                return
+        os.rename(history_dir, f"{history_dir}.{int(time.time())}")
+    os.makedirs(history_dir, exist_ok=True)
+    with open(meta_path, "w") as f:
+        json.dump(_layout(), f)
+
+
+def record_snapshot(df, history_dir=HISTORY_DIR, now=None):
+    """Añadir un snapshot y las transiciones de Status desde el anterior"""
+    now = pd.Timestamp.now() if now is None else now
+    ts = int(now.timestamp())
+    _check_layout(history_dir)
+
+    cells = _cells(df, now)
+    statuses = encode_column(df["Status"], "Status") if not df.empty else np.empty(0, np.int8)
+    items = _item_ids(df)
+
+    state_path = _path(_STATE, history_dir)
+    if os.path.exists(state_path):
+        with np.load(state_path) as state:
+            prev_cells = state["cells"]
+            prev_statuses = pd.Series(state["statuses"], index=state["items"])
+    else:
+        prev_cells, prev_statuses = np.zeros_like(cells), pd.Series([], dtype=np.int8)
+
+    # Delta disperso respecto al snapshot anterior
+    changed = np.flatnonzero(cells != prev_cells)
+    deltas = np.empty(changed.size, dtype=DELTA_DTYPE)
+    deltas["cell"] = changed
+    deltas["delta"] = cells[changed] - prev_cells[changed]
+
+    offset = os.path.getsize(_path(_DELTAS, history_dir)) // DELTA_DTYPE.itemsize \
+        if os.path.exists(_path(_DELTAS, history_dir)) else 0
+    snapshot = np.array([(ts, offset, changed.size)], dtype=SNAPSHOT_DTYPE)
+
+    # Transiciones por item, no por posición: insertar o borrar filas no
+    # desplaza el Status de las demás (los items nuevos parten de -1 y los
+    # borrados pasan a -1)
+    before = prev_statuses.reindex(items, fill_value=-1).to_numpy(dtype=np.int8)
+    rows = np.flatnonzero(before != statuses)
+    removed = prev_statuses[~prev_statuses.index.isin(items)]
+    transitions = np.empty(rows.size + removed.size, dtype=TRANSITION_DTYPE)
+    transitions["ts"] = ts
+    transitions["item"] = np.concatenate([items[rows], removed.index.to_numpy(dtype=np.uint64)])
+    transitions["from"] = np.concatenate([before[rows], removed.to_numpy(dtype=np.int8)])
+    transitions["to"] = np.concatenate([statuses[rows], np.full(removed.size, -1, np.int8)])
+
+    with open(_path(_DELTAS, history_dir), "ab") as f:
+        deltas.tofile(f)
+    with open(_path(_TRANSITIONS, history_dir), "ab") as f:
+        transitions.tofile(f)
+    with open(_path(_SNAPSHOTS, history_dir), "ab") as f:
+        snapshot.tofile(f)
+
+    tmp_path = state_path + ".tmp.npz"
+    np.savez(tmp_path, cells=cells, statuses=statuses, items=items)
+    os.replace(tmp_path, state_path)
+
+
+def load_history(history_dir=HISTORY_DIR, since=None):
+    """Reconstruir los conteos de cada snapshot.
+
+    Devuelve (timestamps, cubos, vencidos): cubos con forma
+    (snapshots, Category, Status, Priority) y vencidos (snapshots, Category).
+    """
+    shape = cube_shape(CUBE_COLUMNS)
+    n_cube = int(np.prod(shape))
+    n_cells = n_cube + shape[0]
+
+    snapshots = _read(_SNAPSHOTS, SNAPSHOT_DTYPE, history_dir)
+    deltas = _read(_DELTAS, DELTA_DTYPE, history_dir)
+    if not snapshots.size:
+        return pd.DatetimeIndex([]), np.zeros((0,) + shape, np.int32), np.zeros((0, shape[0]), np.int32)
+
+    # Acumular los deltas dispersos en una matriz densa snapshot × celda
+    snap_of_delta = np.repeat(np.arange(snapshots.size), snapshots["count"])
+    flat = snap_of_delta * n_cells + deltas["cell"][:snap_of_delta.size]
+    dense = np.bincount(flat, weights=deltas["delta"][:snap_of_delta.size],
+                        minlength=snapshots.size * n_cells)
+    cells = np.cumsum(dense.reshape(snapshots.size, n_cells), axis=0).astype(np.int32)
+
+    timestamps = pd.to_datetime(np.asarray(snapshots["ts"]), unit="s")
+    if since is not None:
+        keep = timestamps >= since
+        timestamps, cells = timestamps[keep], cells[keep]
+    return timestamps, cells[:, :n_cube].reshape((-1,) + shape), cells[:, n_cube:]
+
+
+def load_transitions(history_dir=HISTORY_DIR):
+    """Log de transiciones de Status como DataFrame"""
+    transitions = _read(_TRANSITIONS, TRANSITION_DTYPE, history_dir)
+    df = pd.DataFrame(np.asarray(transitions))
+    df["ts"] = pd.to_datetime(df["ts"], unit="s")
+    return df
+
+
+def status_trend(history_dir=HISTORY_DIR, since=None):
+    """Conteos por Status, pendientes, vencidos y % completado por snapshot"""
+    timestamps, cubes, overdue = load_history(history_dir, since)
+    labels = DIMENSIONS["Status"]
+    by_status = cubes.sum(axis=(1, 3))
+    trend = pd.DataFrame(by_status, index=timestamps, columns=labels)
+    total = by_status.sum(axis=1)
+    closed = trend[CLOSED_STATUSES].sum(axis=1)
+    trend["Remaining"] = total - closed
+    trend["Overdue"] = overdue.sum(axis=1)
+    trend["Completion %"] = np.where(total > 0, trend["Completed"] / np.maximum(total, 1) * 100, 0.0)
+    return trend
+
+
+def velocity(history_dir=HISTORY_DIR, freq="W", since=None):
+    """Items que pasan a Completed por periodo"""
+    transitions = load_transitions(history_dir)
+    completed = DIMENSIONS["Status"].index("Completed")
+    done = transitions[transitions["to"] == completed]
+    if since is not None:
+        done = done[done["ts"] >= since]
+    return done.set_index("ts")["item"].resample(freq).count()
+
+
+def time_in_status(history_dir=HISTORY_DIR, now=None):
+    """Días medios que los items pasan en cada Status"""
+    now = pd.Timestamp.now() if now is None else now
+    transitions = load_transitions(history_dir)
+    if transitions.empty:
+        return pd.Series(dtype=float)
+
+    transitions = transitions.sort_values(["item", "ts"], kind="stable")
+    ends = transitions["ts"].shift(-1)
+    last = transitions["item"] != transitions["item"].shift(-1)
+    ends[last] = now
+    # Una transición a -1 (item borrado) sólo cierra el intervalo anterior
+    current = transitions["to"] >= 0
+    days = (ends - transitions["ts"])[current].dt.total_seconds() / 86400
+    labels = np.array(DIMENSIONS["Status"])
+    return days.groupby(labels[transitions.loc[current, "to"].to_numpy()]).mean()
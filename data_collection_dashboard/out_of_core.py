@@ -0,0 +1,139 @@
+"""
+Modo fuera de memoria para inventarios que no caben en RAM.
+
+El CSV se lee por bloques de OUT_OF_CORE_CHUNK_ROWS filas y sólo con las
+columnas necesarias. Agregados, filtros y paginación se calculan bloque a
+bloque, de modo que la memoria máxima depende del tamaño de bloque y no
+del número total de filas.
+"""
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_FILE, OUT_OF_CORE_THRESHOLD_MB, OUT_OF_CORE_CHUNK_ROWS, FILTER_COLUMNS
+from utils.aggregates import SUMMARY_COLUMNS, cube_from_counts, data_dimensions, overdue_mask
+from utils.helpers import build_filter_mask
+from utils.search_index import SEARCH_COLUMNS, tokenize
+
+
+def is_large_dataset(path=DATA_FILE, threshold_mb=OUT_OF_CORE_THRESHOLD_MB):
+    """Indicar si el fichero de datos supera el umbral del modo fuera de memoria"""
+    try:
+        return os.path.getsize(path) > threshold_mb * 1024 * 1024
+    except FileNotFoundError:
+        return False
+
+
+def iter_chunks(path=DATA_FILE, columns=None, chunk_rows=OUT_OF_CORE_CHUNK_ROWS):
+    """Iterar el fichero por bloques conservando la posición de cada fila como índice"""
+    start = 0
+    # El lector se cierra también si quien itera se detiene antes del final
+    with pd.read_csv(path, usecols=columns, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+
+            if "Due Date" in chunk.columns:
+                chunk["Due Date"] = pd.to_datetime(chunk["Due Date"], errors="coerce")
+            if "Notes" in chunk.columns:
+                chunk["Notes"] = chunk["Notes"].fillna("").astype(str)
+            yield chunk
+
+            # Los bloques de pandas quedan en ciclos de referencias: liberarlos
+            # antes de leer el siguiente mantiene la memoria acotada
+            del chunk
+            gc.collect()
+
+
+def _search_mask(chunk, query):
+    """Filas de un bloque que contienen todos los términos de la búsqueda"""
+    terms = tokenize(query)
+    mask = np.ones(len(chunk), dtype=bool)
+    if not terms:
+        return mask
+
+    columns = [c for c in SEARCH_COLUMNS if c in chunk.columns]
+    text = chunk[columns[0]].fillna("").astype(str)
+    for column in columns[1:]:
+        text = text.str.cat(chunk[column].fillna("").astype(str), sep=" ")
+    text = text.str.lower()
+    for term in terms:
+        mask &= text.str.contains(term, regex=False).to_numpy()
+    return mask
+
+
+def _chunk_mask(chunk, filters):
+    mask = build_filter_mask(chunk, filters)
+    if filters.get("search"):
+        mask &= _search_mask(chunk, filters["search"])
+    return mask
+
+
+def _columns_for(filters, columns):
+    """Columnas a leer: las pedidas más las necesarias para filtrar"""
+    needed = list(columns)
+    needed += [c for k, c in FILTER_COLUMNS.items() if filters.get(k) and c not in needed]
+    if filters.get("search"):
+        needed += [c for c in SEARCH_COLUMNS if c not in needed]
+    return needed
+
+
+def scan_aggregates(filters=None, path=DATA_FILE, now=None):
+    """Cubo Category × Status × Priority × Risk Level, cubo de vencidos y
+    vocabulario de cada dimensión.
+
+    Sin búsqueda de texto los filtros categóricos se aplican después con
+    slice_cube, así que basta con un único recorrido sin filtros. El
+    vocabulario sale de todas las filas (no sólo de las que casan con la
+    búsqueda) para que coincida con las opciones del sidebar.
+    """
+    filters = filters or {}
+    counts = None
+    columns = _columns_for(filters, SUMMARY_COLUMNS + ["Due Date"])
+
+    for chunk in iter_chunks(path, columns):
+        # Conteos por combinación de valores reales; el número de
+        # combinaciones distintas es pequeño aunque el fichero no lo sea
+        hits = _chunk_mask(chunk, filters) if filters.get("search") else np.ones(len(chunk), dtype=bool)
+        flags = pd.DataFrame({"hits": hits, "late": overdue_mask(chunk, now) & hits}, index=chunk.index)
+        grouped = flags.groupby([chunk[c] for c in SUMMARY_COLUMNS], dropna=False).sum()
+        counts = grouped if counts is None else counts.add(grouped, fill_value=0)
+
+    if counts is None:
+        counts = pd.DataFrame({"hits": [], "late": []},
+                              index=pd.MultiIndex.from_arrays([[]] * len(SUMMARY_COLUMNS), names=SUMMARY_COLUMNS))
+    dimensions = data_dimensions(counts.index.to_frame(index=False))
+    cube = cube_from_counts(counts["hits"], SUMMARY_COLUMNS, dimensions)
+    overdue = cube_from_counts(counts["late"], SUMMARY_COLUMNS, dimensions)
+    return cube, overdue, dimensions
+
+
+def iter_matching(filters, path=DATA_FILE, columns=None):
+    """Iterar los bloques del fichero quedándose sólo con las filas que cumplen los filtros"""
+    for chunk in iter_chunks(path, _columns_for(filters, columns) if columns else None):
+        hits = chunk[_chunk_mask(chunk, filters)]
+        yield hits[columns] if columns else hits
+
+
+def read_page(filters, page, page_size, path=DATA_FILE, columns=None, count_total=True):
+    """Leer una página del resultado filtrado.
+
+    Devuelve las filas de la página y el número total de filas que
+    cumplen los filtros. Con count_total=False la lectura se detiene en
+    cuanto la página está completa y el total es None.
+    """
+    start, end = page * page_size, (page + 1) * page_size
+    pages = []
+    matched = 0
+
+    for hits in iter_matching(filters, path, columns):
+        if matched < end and matched + len(hits) > start:
+            pages.append(hits.iloc[max(start - matched, 0):end - matched])
+        matched += len(hits)
+        if not count_total and matched >= end:
+            break
+
+    rows = pd.concat(pages) if pages else pd.DataFrame()
+    return rows, matched if count_total else None
@@ -0,0 +1,141 @@
+"""
+Sidecar de arranque en caliente junto al fichero de datos.
+
+save_data escribe, además del CSV, un fichero binario con el cubo de
+conteos Category × Status × Priority × Risk Level, el vocabulario real de
+cada una de esas columnas, los códigos de cada fila por columna de filtro, las fechas de vencimiento y las estadísticas
+de generate_summary_stats. Un proceso nuevo puede pintar el Overview
+mapeando el sidecar en memoria sin parsear el CSV. Si la versión de los
+datos no coincide, el sidecar se ignora y se reconstruye.
+
+Formato: cabecera fija (struct), metadatos JSON y arrays alineados a 64
+bytes, cada uno descrito en los metadatos por offset, dtype y forma.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_FILE
+from utils.aggregates import CLOSED_STATUSES, SUMMARY_COLUMNS, build_cube, data_dimensions, encode_column
+from utils.helpers import generate_summary_stats
+
+MAGIC = b"PSSIDE01"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sIIqqQ")  # magic, formato, reservado, mtime_ns, tamaño, longitud JSON
+_ALIGN = 64
+_NAT = np.iinfo(np.int64).min
+
+
+def sidecar_path(data_file=DATA_FILE):
+    return f"{data_file}.sidecar"
+
+
+def _to_json(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_sidecar(df, version, data_file=DATA_FILE):
+    """Escribir el sidecar para la versión de datos dada (mtime_ns, tamaño)"""
+    if version is None:
+        return
+
+    # Vocabulario de los datos: las categorías que no están en config.py
+    # conservan su nombre en lugar de agruparse en "Other"
+    dimensions = data_dimensions(df)
+    arrays = {"cube": build_cube(df, SUMMARY_COLUMNS, dimensions=dimensions)}
+    for column in SUMMARY_COLUMNS:
+        arrays[f"codes/{column}"] = encode_column(df[column], column, dimensions) \
+            if not df.empty else np.empty(0, np.int8)
+    due = pd.to_datetime(df["Due Date"], errors="coerce") if "Due Date" in df.columns else pd.Series(pd.NaT, index=df.index)
+    arrays["due"] = due.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    stats = {}
+    if not df.empty:
+        stats = generate_summary_stats(df)
+        stats["computed_at"] = pd.Timestamp.now().isoformat()
+
+    # Calcular offsets de cada array tras la cabecera y los metadatos
+    layout = {}
+    meta = {"dimensions": dimensions, "stats": stats, "arrays": layout}
+    meta_bytes = b""
+    while True:  # la longitud del JSON depende de los offsets y viceversa
+        offset = _aligned(_HEADER.size + len(meta_bytes))
+        for name, array in arrays.items():
+            layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+            offset = _aligned(offset + array.nbytes)
+        encoded = json.dumps(meta, default=_to_json).encode("utf-8")
+        if len(encoded) == len(meta_bytes):
+            meta_bytes = encoded
+            break
+        meta_bytes = encoded
+
+    path = sidecar_path(data_file)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, version[0], version[1], len(meta_bytes)))
+        f.write(meta_bytes)
+        for name, array in arrays.items():
+            f.seek(layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(offset)
+    os.replace(tmp_path, path)
+
+
+class Sidecar:
+    """Vista de sólo lectura sobre un sidecar mapeado en memoria"""
+
+    def __init__(self, path, meta):
+        self.dimensions = meta["dimensions"]
+        self.stats = meta["stats"]
+        self._arrays = {
+            name: np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r",
+                            offset=spec["offset"], shape=tuple(spec["shape"]))
+            if np.prod(spec["shape"]) else np.empty(spec["shape"], dtype=np.dtype(spec["dtype"]))
+            for name, spec in meta["arrays"].items()
+        }
+
+    @property
+    def cube(self):
+        return self._arrays["cube"]
+
+    def codes(self, column):
+        return self._arrays[f"codes/{column}"]
+
+    def overdue_cube(self, now=None):
+        """Cubo de items vencidos y no cerrados en el instante dado"""
+        now = pd.Timestamp.now() if now is None else now
+        due = self._arrays["due"]
+        statuses = self.dimensions["Status"]
+        closed = [statuses.index(s) for s in CLOSED_STATUSES if s in statuses[:-1]]
+        late = (due != _NAT) & (due < now.value) & ~np.isin(self.codes("Status"), closed)
+        codes = [self.codes(c)[late] for c in SUMMARY_COLUMNS]
+        shape = self.cube.shape
+        flat = np.ravel_multi_index(codes, shape)
+        return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+
+def load_sidecar(version, data_file=DATA_FILE):
+    """Abrir el sidecar si existe y corresponde a la versión actual de los datos"""
+    path = sidecar_path(data_file)
+    if version is None or not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, format_version, _, mtime_ns, size, meta_len = _HEADER.unpack(header)
+        if magic != MAGIC or format_version != FORMAT_VERSION or (mtime_ns, size) != tuple(version):
+            return None
+        meta = json.loads(f.read(meta_len))
+
+    if list(meta["dimensions"]) != SUMMARY_COLUMNS:
+        return None
+    return Sidecar(path, meta)
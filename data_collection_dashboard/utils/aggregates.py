@@ -0,0 +1,139 @@
+"""
+Cubos de conteos agregados sobre las columnas categóricas del dashboard
+"""
+import numpy as np
+import pandas as pd
+from config import BASE_CATEGORIES, STATUS_OPTIONS, PRIORITY_OPTIONS, RISK_LEVEL_OPTIONS, FILTER_COLUMNS
+
+OTHER = "Other"
+
+# Dimensiones fijas: opciones de config.py más un hueco final para valores desconocidos.
+# Las funciones aceptan también un vocabulario propio de los datos (data_dimensions)
+DIMENSIONS = {
+    "Category": BASE_CATEGORIES + [OTHER],
+    "Status": STATUS_OPTIONS + [OTHER],
+    "Priority": PRIORITY_OPTIONS + [OTHER],
+    "Risk Level": RISK_LEVEL_OPTIONS + [OTHER],
+}
+
+CLOSED_STATUSES = ["Completed", "Verified"]
+
+# Cubo completo usado por el modo fuera de memoria y el sidecar
+SUMMARY_COLUMNS = ["Category", "Status", "Priority", "Risk Level"]
+
+
+def data_dimensions(df, columns=SUMMARY_COLUMNS):
+    """Vocabulario real de cada columna.
+
+    Opciones de config.py, después los valores presentes en los datos que
+    no están en config.py y por último el hueco de los valores vacíos.
+    """
+    dimensions = {}
+    for column in columns:
+        base = DIMENSIONS[column][:-1]
+        present = pd.unique(df[column].dropna()) if column in df.columns else []
+        known = set(base)
+        extra = sorted((v for v in present if v not in known), key=str)
+        dimensions[column] = base + extra + [OTHER]
+    return dimensions
+
+
+def encode_column(values, column, dimensions=None):
+    """Codificar una columna como índices enteros de su dimensión"""
+    labels = (dimensions or DIMENSIONS)[column]
+    dtype = np.int8 if len(labels) <= np.iinfo(np.int8).max else np.int32
+    codes = pd.Categorical(values, categories=labels[:-1]).codes.astype(dtype)
+    codes[codes < 0] = len(labels) - 1
+    return codes
+
+
+def cube_shape(columns, dimensions=None):
+    return tuple(len((dimensions or DIMENSIONS)[c]) for c in columns)
+
+
+def build_cube(df, columns, mask=None, dimensions=None):
+    """Contar filas por cada combinación de valores de las columnas dadas"""
+    shape = cube_shape(columns, dimensions)
+    if df.empty:
+        return np.zeros(shape, dtype=np.int64)
+
+    codes = [encode_column(df[c], c, dimensions) for c in columns]
+    flat = np.ravel_multi_index(codes, shape)
+    if mask is not None:
+        flat = flat[np.asarray(mask, dtype=bool)]
+    return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+
+def cube_from_counts(counts, columns, dimensions=None):
+    """Cubo a partir de conteos indexados por combinaciones de valores"""
+    shape = cube_shape(columns, dimensions)
+    if counts.empty:
+        return np.zeros(shape, dtype=np.int64)
+
+    keys = counts.index.to_frame(index=False)
+    codes = [encode_column(keys[c], c, dimensions) for c in columns]
+    flat = np.ravel_multi_index(codes, shape)
+    cube = np.bincount(flat, weights=counts.to_numpy(), minlength=int(np.prod(shape)))
+    return cube.astype(np.int64).reshape(shape)
+
+
+def overdue_mask(df, now=None):
+    """Filas vencidas y no cerradas (Completed o Verified)"""
+    if df.empty or "Due Date" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    now = pd.Timestamp.now() if now is None else now
+    return ((df["Due Date"] < now) & ~df["Status"].isin(CLOSED_STATUSES)).to_numpy()
+
+
+def counts_by(cube, columns, column, dimensions=None):
+    """Sumar el cubo sobre todas las dimensiones salvo una"""
+    axis = columns.index(column)
+    other_axes = tuple(i for i in range(len(columns)) if i != axis)
+    totals = cube.sum(axis=other_axes)
+    counts = {}
+    for label, n in zip((dimensions or DIMENSIONS)[column], totals):
+        if n:
+            counts[label] = counts.get(label, 0) + int(n)
+    return counts
+
+
+def slice_cube(cube, columns, filters, dimensions=None):
+    """Anular las celdas del cubo que no cumplen los filtros del sidebar.
+
+    El cubo conserva su forma, así que counts_by sigue siendo válido.
+    """
+    for key, column in FILTER_COLUMNS.items():
+        selected = filters.get(key)
+        if not selected or column not in columns:
+            continue
+        labels = (dimensions or DIMENSIONS)[column]
+        keep = np.zeros(len(labels), dtype=cube.dtype)
+        keep[[labels.index(v) if v in labels else len(labels) - 1 for v in selected]] = 1
+        shape = [1] * cube.ndim
+        shape[columns.index(column)] = len(labels)
+        cube = cube * keep.reshape(shape)
+    return cube
+
+
+def cube_labels(cube, columns, column, dimensions=None):
+    """Valores presentes (con algún conteo) en una dimensión del cubo.
+
+    Excluye el hueco final: no es un valor real y filtrar las filas por él
+    no devolvería ninguna.
+    """
+    axis = columns.index(column)
+    other_axes = tuple(i for i in range(len(columns)) if i != axis)
+    totals = cube.sum(axis=other_axes)
+    labels = (dimensions or DIMENSIONS)[column]
+    return [label for label, n in zip(labels[:-1], totals[:-1]) if n]
+
+
+def sidebar_summary(cube, dimensions=None):
+    """Opciones de filtro y totales del sidebar a partir del cubo completo"""
+    critical_pending = slice_cube(cube, SUMMARY_COLUMNS, {"priorities": ["Critical"], "statuses": ["Pending"]},
+                                  dimensions)
+    return {
+        "options": {c: cube_labels(cube, SUMMARY_COLUMNS, c, dimensions) for c in SUMMARY_COLUMNS},
+        "total": int(cube.sum()),
+        "critical_pending": int(critical_pending.sum()),
+    }
@@ -1,5 +1,30 @@
+import os
 import pandas as pd
 from datetime import datetime, timedelta
+from config import (STATUS_OPTIONS, PRIORITY_OPTIONS, RISK_LEVEL_OPTIONS,
+                    VALIDATION_OPTIONS, TYPE_OPTIONS, FILTER_COLUMNS)
+
+def file_version(path):
+    """Versión de un fichero de datos (mtime_ns, tamaño) o None si no existe"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_items_csv(path):
+    """Leer el CSV de items con los tipos que esperan las vistas"""
+    df = pd.read_csv(path)
+    
+    # Asegurar tipos de datos correctos
+    if "Due Date" in df.columns:
+        df["Due Date"] = pd.to_datetime(df["Due Date"], errors='coerce')
+    
+    # Asegurar que Notes sea string, no float
+    if "Notes" in df.columns:
+        df["Notes"] = df["Notes"].fillna('').astype(str).replace({'nan': '', 'None': ''})
+    
+    return df
 
 def calculate_days_remaining(due_date):
     """Calcular días restantes hasta la fecha de vencimiento"""
@@ -47,6 +72,56 @@ def validate_item_data(item_data):
     
     return errors
 
+def validate_items_frame(df):
+    """Validar un DataFrame de items columna a columna.
+    
+    Devuelve una máscara booleana de filas válidas y una Serie con los
+    errores (separados por "; ") de las filas inválidas.
+    """
+    def blank(column, rows=None):
+        if column not in df.columns:
+            return pd.Series(True, index=df.index)
+        values = df[column] if rows is None else df.loc[rows, column]
+        text = values.astype(str)
+        return values.isna() | (text == "") | text.str.isspace().astype(bool)
+    
+    def not_in(column, options, required=False):
+        if column not in df.columns:
+            return pd.Series(required, index=df.index)
+        invalid = ~df[column].isin(options)
+        if not required and invalid.any():
+            # Los valores vacíos se completan con valores por defecto
+            invalid[invalid] = ~blank(column, invalid).to_numpy()
+        return invalid
+    
+    checks = [
+        ("Category is required", blank("Category")),
+        ("Item name is required", blank("Item")),
+        ("Invalid priority level", not_in("Priority", PRIORITY_OPTIONS, required=True)),
+        ("Invalid status", not_in("Status", STATUS_OPTIONS)),
+        ("Invalid risk level", not_in("Risk Level", RISK_LEVEL_OPTIONS)),
+        ("Invalid validation status", not_in("Validation Status", VALIDATION_OPTIONS)),
+        ("Invalid type", not_in("Type", TYPE_OPTIONS)),
+    ]
+    if "Due Date" in df.columns:
+        due = pd.to_datetime(df["Due Date"], errors="coerce")
+        missing = due.isna()
+        if missing.any():
+            missing[missing] = ~blank("Due Date", missing).to_numpy()
+        checks.append(("Invalid due date", missing))
+    
+    invalid = pd.Series(False, index=df.index)
+    for _, failed in checks:
+        invalid |= failed
+    
+    # Mensajes sólo para las filas inválidas
+    errors = pd.Series("", index=df.index[invalid])
+    for message, failed in checks:
+        failed = failed[invalid]
+        errors = errors.where(~failed, errors + message + "; ")
+    
+    return ~invalid, errors.str.rstrip("; ")
+
 def generate_summary_stats(df):
     """Generar estadísticas resumidas"""
     stats = {
@@ -57,11 +132,21 @@ def generate_summary_stats(df):
         "avg_days_remaining": None
     }
     
-    # Calcular días promedio restantes si hay fechas
+    # Calcular días promedio restantes si hay fechas (vectorizado, igual que calculate_days_remaining)
     if "Due Date" in df.columns:
-        days_remaining = df["Due Date"].apply(calculate_days_remaining)
+        days_remaining = (pd.to_datetime(df["Due Date"], errors="coerce") - pd.Timestamp.now()).dt.days
         days_remaining = days_remaining[days_remaining.notna()]
         if not days_remaining.empty:
             stats["avg_days_remaining"] = days_remaining.mean()
     
-    return stats
\ No newline at end of file
+    return stats
+
+def build_filter_mask(df, filters):
+    """Máscara booleana de las filas que cumplen los filtros categóricos"""
+    mask = pd.Series(True, index=df.index)
+    
+    for key, column in FILTER_COLUMNS.items():
+        if filters.get(key):
+            mask &= df[column].isin(filters[key])
+    
+    return mask.to_numpy()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Índice jerárquico Category → Subcategory → Item.
+
+Las filas se ordenan una sola vez por categoría y subcategoría (orden de
+aparición) y cada grupo queda descrito por un rango [inicio, fin) sobre
+ese orden, con los conteos por estado ya acumulados en cada nivel. Las
+vistas leen los totales del índice y sólo materializan las filas de un
+grupo cuando hace falta mostrarlas.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.aggregates import DIMENSIONS, encode_column
+
+# Número máximo de hojas (items) que se dibujan en el treemap
+TREEMAP_MAX_ITEMS = 2000
+
+
+def _labels(values):
+    """Códigos por orden de aparición y etiquetas (los nulos cuentan como un valor más)"""
+    codes, labels = pd.factorize(values, use_na_sentinel=False)
+    return codes, ["(none)" if pd.isna(label) else str(label) for label in labels]
+
+
+class HierarchyIndex:
+    """Rangos y conteos por estado de cada categoría y subcategoría de un DataFrame"""
+
+    def __init__(self, df):
+        self.size = len(df)
+        statuses = DIMENSIONS["Status"]
+
+        if df.empty:
+            self.order = np.empty(0, dtype=np.int64)
+            self._categories = {}
+            return
+
+        cat_codes, cat_labels = _labels(df["Category"])
+        sub_codes, sub_labels = _labels(df["Subcategory"])
+
+        # Orden estable: dentro de cada grupo se conserva el orden original
+        self.order = np.lexsort((sub_codes, cat_codes))
+        cats = cat_codes[self.order]
+        subs = sub_codes[self.order]
+
+        new_cat = np.r_[True, cats[1:] != cats[:-1]]
+        new_sub = new_cat | np.r_[False, subs[1:] != subs[:-1]]
+        sub_starts = np.flatnonzero(new_sub)
+        sub_ends = np.r_[sub_starts[1:], self.size]
+
+        # Conteos por estado de cada subcategoría en una sola pasada
+        group = np.cumsum(new_sub) - 1
+        status = encode_column(df["Status"], "Status")[self.order]
+        counts = np.bincount(
+            group * len(statuses) + status, minlength=len(sub_starts) * len(statuses)
+        ).reshape(len(sub_starts), len(statuses))
+
+        self._categories = {}
+        for g, (start, end) in enumerate(zip(sub_starts, sub_ends)):
+            category = cat_labels[cats[start]]
+            entry = self._categories.setdefault(category, {
+                "start": int(start), "end": int(end),
+                "counts": np.zeros(len(statuses), dtype=np.int64),
+                "subcategories": {},
+            })
+            entry["end"] = int(end)
+            entry["counts"] += counts[g]
+            entry["subcategories"][sub_labels[subs[start]]] = {
+                "start": int(start), "end": int(end), "counts": counts[g],
+            }
+
+    @property
+    def categories(self):
+        return list(self._categories)
+
+    @staticmethod
+    def _summary(entry):
+        counts = dict(zip(DIMENSIONS["Status"], entry["counts"].tolist()))
+        return {"total": entry["end"] - entry["start"], **counts}
+
+    def category_summary(self, category):
+        """Total y conteo por estado de una categoría"""
+        return self._summary(self._categories[category])
+
+    def subcategories(self, category):
+        """Subcategorías de una categoría con su total, conteos por estado y rango"""
+        return [
+            {"name": name, "start": entry["start"], "end": entry["end"], **self._summary(entry)}
+            for name, entry in self._categories[category]["subcategories"].items()
+        ]
+
+    def rows(self, df, start, end):
+        """Filas de un rango del índice (un grupo es siempre un rango contiguo)"""
+        return df.iloc[self.order[start:end]]
+
+    def treemap_nodes(self, df=None, max_items=TREEMAP_MAX_ITEMS):
+        """Nodos (id, padre, etiqueta, valor, % completado) del árbol de la especificación.
+
+        Si se pasa el DataFrame y el número de filas no supera max_items,
+        se añaden los items como hojas.
+        """
+        completed = DIMENSIONS["Status"].index("Completed")
+        nodes = []
+
+        def add(node_id, parent, label, total, done):
+            nodes.append({
+                "id": node_id, "parent": parent, "label": label, "value": total,
+                "completion": 100 * done / total if total else 0.0,
+            })
+
+        with_items = df is not None and self.size <= max_items
+        for category, entry in self._categories.items():
+            add(category, "", category, entry["end"] - entry["start"], entry["counts"][completed])
+            for sub, sub_entry in entry["subcategories"].items():
+                sub_id = f"{category}/{sub}"
+                add(sub_id, category, sub, sub_entry["end"] - sub_entry["start"], sub_entry["counts"][completed])
+                if with_items:
+                    rows = self.rows(df, sub_entry["start"], sub_entry["end"])
+                    for position, (item, status) in enumerate(zip(rows["Item"], rows["Status"])):
+                        add(f"{sub_id}/{position}", sub_id, str(item), 1, status == "Completed")
+        return pd.DataFrame(nodes, columns=["id", "parent", "label", "value", "completion"])
@@ -0,0 +1,98 @@
+"""
+Contabilidad de memoria por sesión y por proceso.
+
+Con copy-on-write los DataFrames de una sesión comparten buffers con el
+DataFrame cacheado del proceso; sólo cuentan como memoria de la sesión
+los buffers que no comparte con él.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+_OBJECT_SAMPLE = 1000
+
+
+def _column_buffers(df):
+    """(dirección, bytes) de los buffers de cada columna del DataFrame"""
+    for name in df.columns:
+        values = df[name].to_numpy(copy=False)
+        if not isinstance(values, np.ndarray) or not values.size:
+            continue
+        nbytes = values.nbytes
+        if values.dtype == object:
+            # Estimar el tamaño de los objetos con una muestra
+            sample = values[:: max(len(values) // _OBJECT_SAMPLE, 1)]
+            nbytes += int(np.mean([v.__sizeof__() for v in sample]) * len(values))
+        yield values.__array_interface__["data"][0], nbytes
+
+
+def frame_bytes(df, exclude=()):
+    """Bytes de un DataFrame sin contar los buffers presentes en exclude"""
+    return sum(n for addr, n in _column_buffers(df) if addr not in exclude)
+
+
+def buffer_addresses(df):
+    return {addr for addr, _ in _column_buffers(df)}
+
+
+def process_rss_mb():
+    """Memoria residente actual del proceso en MB"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        # Sin /proc (macOS): usar el pico
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MemoryRegistry:
+    """Memoria propia de cada sesión del proceso, medida al final de cada ejecución.
+
+    Se comparte entre los hilos de las sesiones: el diccionario sólo se toca
+    con el lock tomado.
+    """
+
+    def __init__(self, idle_seconds=3600):
+        self._sessions = {}
+        self._idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+
+    def record(self, session_id, frames, shared=None):
+        """Medir los DataFrames de una sesión descontando los buffers compartidos"""
+        shared_addresses = buffer_addresses(shared) if shared is not None else set()
+        owned = {}
+        per_frame = {}
+        for name, df in frames.items():
+            buffers = [(addr, n) for addr, n in _column_buffers(df) if addr not in shared_addresses]
+            per_frame[name] = sum(n for _, n in buffers)
+            owned.update(buffers)
+        entry = {
+            "bytes": sum(owned.values()),
+            "frames": per_frame,
+            "last_seen": time.time(),
+        }
+        with self._lock:
+            self._sessions[session_id] = entry
+        return entry
+
+    def report(self, shared=None):
+        """Memoria compartida, por sesión y residente del proceso"""
+        now = time.time()
+        with self._lock:
+            for session_id, entry in list(self._sessions.items()):
+                if now - entry["last_seen"] > self._idle_seconds:
+                    del self._sessions[session_id]
+            sessions = dict(self._sessions)
+        return {
+            "shared_bytes": frame_bytes(shared) if shared is not None else 0,
+            "sessions": sessions,
+            "process_rss_mb": process_rss_mb(),
+        }
@@ -0,0 +1,225 @@
+"""
+Índice invertido en memoria para la búsqueda de texto completo
+sobre las columnas Item, Description y Notes
+"""
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ["Item", "Description", "Notes"]
+
+# Letras y dígitos Unicode (\w sin el guion bajo), p. ej. "configuración"
+_TOKEN_PATTERN = r"[^\W_]+"
+_TOKEN_RE = re.compile(_TOKEN_PATTERN, re.UNICODE)
+_EMPTY = np.empty(0, dtype=np.int64)
+
+# Compactar el índice cuando las filas obsoletas superan este umbral
+_STALE_MIN = 1024
+_STALE_RATIO = 0.1
+
+
+def tokenize(text):
+    """Dividir un texto en tokens normalizados"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _row_texts(df):
+    """Concatenar las columnas de búsqueda en un único texto por fila"""
+    columns = [c for c in SEARCH_COLUMNS if c in df.columns]
+    if df.empty or not columns:
+        return pd.Series([], dtype=object)
+    parts = [df[c].fillna("").astype(str) for c in columns]
+    return parts[0].str.cat(parts[1:], sep=" ").str.lower()
+
+
+class SearchIndex:
+    """Índice invertido token → ids de fila, con trigramas para subcadenas.
+
+    Los ids de fila son las etiquetas del índice del DataFrame. Las
+    búsquedas devuelven un array ordenado de ids que se puede intersecar
+    con los filtros categóricos.
+    """
+
+    def __init__(self, df):
+        self._texts = _row_texts(df)
+        self._reset()
+        self._build(self._texts)
+
+    def _reset(self):
+        self._tokens = []           # id de token -> token
+        self._token_ids = {}        # token -> id de token
+        self._vocab = []            # tokens ordenados (búsqueda por prefijo)
+        self._trigrams = defaultdict(set)  # trigrama -> ids de token
+        self._postings = {}         # id de token -> array ordenado de filas
+        self._delta = defaultdict(set)     # id de token -> filas añadidas
+        self._row_delta = {}        # fila -> ids de token en el delta
+        self._stale = set()         # filas cuyo posting base ya no es válido
+        self._stale_sorted = _EMPTY  # self._stale como array ordenado
+        self._parts_cache = {}      # término -> postings (se vacía al actualizar)
+
+    def _build(self, texts):
+        if texts.empty:
+            return
+        if not texts.index.is_monotonic_increasing:
+            texts = texts.sort_index()
+
+        # Tokenizar sólo los textos distintos y expandir a pares (token, fila)
+        text_codes, unique_texts = pd.factorize(texts)
+        token_sets = [set(_TOKEN_RE.findall(text)) for text in unique_texts]
+        counts = np.fromiter(map(len, token_sets), dtype=np.int64, count=len(token_sets))
+        flat = np.array([token for tokens in token_sets for token in tokens], dtype=object)
+        if not flat.size:
+            return
+        token_codes, vocab = pd.factorize(flat, sort=True)
+
+        per_row = counts[text_codes]
+        total = int(per_row.sum())
+        firsts = np.cumsum(counts) - counts
+        row_starts = np.cumsum(per_row) - per_row
+        pair_rows = np.repeat(np.arange(len(texts)), per_row)
+        offsets = np.arange(total) - np.repeat(row_starts, per_row)
+        pair_tokens = token_codes[np.repeat(firsts[text_codes], per_row) + offsets]
+
+        order = np.argsort(pair_tokens, kind="stable")
+        rows = texts.index.to_numpy(dtype=np.int64)[pair_rows[order]]
+        bounds = np.searchsorted(pair_tokens[order], np.arange(len(vocab) + 1))
+        for i, token in enumerate(vocab.tolist()):
+            token_id = self._add_token(token, sort=False)
+            self._postings[token_id] = rows[bounds[i]:bounds[i + 1]]
+        self._vocab = vocab.tolist()
+
+    def _add_token(self, token, sort=True):
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._tokens.append(token)
+            self._token_ids[token] = token_id
+            for gram in _trigrams(token):
+                self._trigrams[gram].add(token_id)
+            if sort:
+                insort(self._vocab, token)
+        return token_id
+
+    def __len__(self):
+        return len(self._texts)
+
+    def update(self, df):
+        """Actualizar incrementalmente las filas cuyo texto ha cambiado"""
+        texts = _row_texts(df)
+        old = self._texts.reindex(texts.index)
+        changed = texts.index[old.isna() | (old != texts)]
+        removed = self._texts.index.difference(texts.index)
+
+        for row in removed:
+            self._discard_row(row)
+        for row, text in texts.loc[changed].items():
+            self._discard_row(row)
+            token_ids = {self._add_token(token) for token in _TOKEN_RE.findall(text)}
+            for token_id in token_ids:
+                self._delta[token_id].add(row)
+            self._row_delta[row] = token_ids
+
+        self._texts = texts
+        self._parts_cache.clear()
+        if len(self._stale) > max(_STALE_MIN, _STALE_RATIO * len(texts)):
+            # Reconstruir en lugar de arrastrar un delta cada vez mayor
+            self._reset()
+            self._build(texts)
+        else:
+            self._stale_sorted = np.fromiter(self._stale, dtype=np.int64, count=len(self._stale))
+            self._stale_sorted.sort()
+        return len(changed) + len(removed)
+
+    def _discard_row(self, row):
+        self._stale.add(row)
+        for token_id in self._row_delta.pop(row, ()):
+            self._delta[token_id].discard(row)
+
+    def _matching_tokens(self, term):
+        """Ids de token que contienen el término (prefijo si es corto)"""
+        if len(term) < 3:
+            matches = []
+            pos = bisect_left(self._vocab, term)
+            while pos < len(self._vocab) and self._vocab[pos].startswith(term):
+                matches.append(self._token_ids[self._vocab[pos]])
+                pos += 1
+            return matches
+
+        candidates = None
+        for gram in _trigrams(term):
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return []
+            candidates = set(ids) if candidates is None else candidates & ids
+        return [t for t in candidates if term in self._tokens[t]]
+
+    def _term_parts(self, term):
+        """Postings base y filas añadidas de los tokens que casan con el término"""
+        parts = self._parts_cache.get(term)
+        if parts is None:
+            token_ids = self._matching_tokens(term)
+            base = [self._postings[t] for t in token_ids if t in self._postings]
+            added = set().union(*(self._delta.get(t, ()) for t in token_ids))
+            added = np.fromiter(added, dtype=np.int64, count=len(added))
+            added.sort()
+            parts = (base, added)
+            self._parts_cache[term] = parts
+        return parts
+
+    def _term_hits(self, base, added):
+        """Materializar todas las filas de un término"""
+        if len(base) == 1:
+            hits = base[0]
+        else:
+            hits = np.unique(np.concatenate(base)) if base else _EMPTY
+        if self._stale and hits.size:
+            hits = hits[~_contains_sorted(self._stale_sorted, hits)]
+        if added.size:
+            hits = np.union1d(hits, added)
+        return hits
+
+    def _filter_hits(self, candidates, base, added):
+        """Conservar los candidatos presentes en las filas de un término"""
+        keep = np.zeros(candidates.size, dtype=bool)
+        for postings in base:
+            keep |= _contains_sorted(postings, candidates)
+        if self._stale:
+            keep &= ~_contains_sorted(self._stale_sorted, candidates)
+        keep |= _contains_sorted(added, candidates)
+        return candidates[keep]
+
+    def search(self, query):
+        """Buscar filas que contengan todos los términos de la consulta.
+
+        Devuelve None si la consulta no tiene términos (sin búsqueda activa).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        # Materializar sólo el término más selectivo y filtrar con el resto
+        parts = sorted(
+            (self._term_parts(term) for term in set(terms)),
+            key=lambda p: sum(map(len, p[0])) + len(p[1])
+        )
+        result = self._term_hits(*parts[0])
+        for base, added in parts[1:]:
+            if result.size == 0:
+                break
+            result = self._filter_hits(result, base, added)
+        return result
+
+
+def _contains_sorted(haystack, needles):
+    """Máscara de pertenencia de needles en un array ordenado"""
+    if not haystack.size:
+        return np.zeros(needles.size, dtype=bool)
+    pos = np.searchsorted(haystack, needles).clip(max=haystack.size - 1)
+    return haystack[pos] == needles
@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
+from history_store import status_trend, velocity, time_in_status
+from components.charts import create_line_chart, create_bar_chart
 
-def show_analytics(df):
+def show_analytics(df, hierarchy):
     """Mostrar vista de analytics"""
     st.header("Analytics & Reports")
     
@@ -27,16 +29,67 @@ def show_analytics(df):
     # Por categoría
     st.subheader("By Category")
     
-    for category in df["Category"].unique():
+    for category in hierarchy.categories:
+        summary = hierarchy.category_summary(category)
         with st.expander(f"📊 {category}"):
-            cat_df = df[df["Category"] == category]
-            
             cols = st.columns(3)
             with cols[0]:
-                st.metric("Total", len(cat_df))
+                st.metric("Total", summary["total"])
             with cols[1]:
-                completed = len(cat_df[cat_df["Status"] == "Completed"])
-                st.metric("Completed", completed)
+                st.metric("Completed", summary["Completed"])
             with cols[2]:
-                pending = len(cat_df[cat_df["Status"] == "Pending"])
-                st.metric("Pending", pending)
\ No newline at end of file
+                st.metric("Pending", summary["Pending"])
+    
+    # Tendencias a partir del histórico de snapshots
+    show_trends()
+
+def show_trends():
+    """Mostrar burndown, velocidad y tiempo en cada estado"""
+    st.subheader("Trends")
+    
+    period = st.selectbox(
+        "Time Range:",
+        ["Last 30 days", "Last 90 days", "Last year", "All time"],
+        index=2,
+        key="trend_period"
+    )
+    days = {"Last 30 days": 30, "Last 90 days": 90, "Last year": 365}.get(period)
+    since = pd.Timestamp.now() - pd.Timedelta(days=days) if days else None
+    
+    trend = status_trend(since=since)
+    if trend.empty:
+        st.info("No history recorded yet. Trends appear after data is saved.")
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = create_line_chart(trend, ["Remaining", "Overdue"], "Burndown")
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = create_line_chart(trend, ["Completion %"], "Completion Rate", y_title="%")
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
+    statuses = [s for s in ["Pending", "In Progress", "Completed", "Verified", "Blocked"] if trend[s].any()]
+    fig = create_line_chart(trend, statuses, "Status Counts Over Time")
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        weekly = velocity(since=since).reset_index()
+        weekly.columns = ["Week", "Completed"]
+        fig = create_bar_chart(weekly, "Week", "Completed", "Velocity (items completed per week)")
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        durations = time_in_status().reset_index()
+        durations.columns = ["Status", "Avg Days"]
+        fig = create_bar_chart(durations, "Status", "Avg Days", "Average Time in Status")
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
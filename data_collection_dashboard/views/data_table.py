@@ -23,8 +23,8 @@ def show_data_table(filtered_df, full_df, save_callback):
         horizontal=True
     )
     
-    # Filtrar según modo de vista
-    display_df = filtered_df.copy()
+    # Filtrar según modo de vista (sin copiar: los filtros crean sus propias selecciones)
+    display_df = filtered_df
     
     if view_mode == "By Category":
         categories = filtered_df["Category"].unique()
@@ -83,13 +83,16 @@ def show_data_table(filtered_df, full_df, save_callback):
     
     with col1:
         if st.button("💾 Save Changes", type="primary", use_container_width=True):
-            # Encontrar índices de las filas editadas y actualizar el DataFrame original
-            for idx in edited_df.index:
-                if idx in full_df.index:
-                    for col in edited_df.columns:
-                        full_df.at[idx, col] = edited_df.at[idx, col]
+            # Encontrar índices de las filas editadas y actualizar el DataFrame original.
+            # full_df es compartido: copia superficial y copy-on-write sólo de las columnas editadas
+            updated_df = full_df.copy(deep=False)
+            rows = edited_df.index.intersection(updated_df.index)
+            for col in edited_df.columns:
+                changed = edited_df.loc[rows, col].ne(updated_df.loc[rows, col])
+                if changed.any():
+                    updated_df.loc[rows[changed.to_numpy()], col] = edited_df.loc[rows, col][changed]
             
-            save_callback(full_df)
+            save_callback(updated_df)
             st.success("Changes saved successfully!")
             st.experimental_rerun()
     
@@ -1,56 +1,55 @@
 import streamlit as st
 import pandas as pd
+from components.charts import create_treemap
 
-def show_detailed_view(df):
+def show_detailed_view(df, hierarchy):
     """Mostrar vista detallada"""
     st.header("Detailed View")
-    
+
     if df.empty:
         st.info("No data available for detailed view.")
         return
-    
+
+    # Árbol de la especificación (clic en un nodo para profundizar)
+    fig = create_treemap(hierarchy.treemap_nodes(df), "Specification Tree")
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+
     # Selector de categoría
-    categories = df["Category"].unique()
+    categories = hierarchy.categories
     if len(categories) == 0:
         st.info("No categories available.")
         return
-    
+
     selected_category = st.selectbox(
         "Select Category:",
         categories,
         key="detail_category"
     )
-    
-    # Filtrar datos
-    detail_df = df[df["Category"] == selected_category]
-    
-    if not detail_df.empty:
-        st.subheader(f"Category: {selected_category}")
-        
-        # Métricas específicas
-        cols = st.columns(3)
-        
-        with cols[0]:
-            total = len(detail_df)
-            st.metric("Total Items", total)
-        
-        with cols[1]:
-            completed = len(detail_df[detail_df["Status"] == "Completed"])
-            st.metric("Completed", completed)
-        
-        with cols[2]:
-            pending = len(detail_df[detail_df["Status"] == "Pending"])
-            st.metric("Pending", pending)
-        
-        # Mostrar subcategorías
-        st.subheader("Subcategories")
-        
-        for subcategory in detail_df["Subcategory"].unique():
-            with st.expander(f"📁 {subcategory}"):
-                sub_df = detail_df[detail_df["Subcategory"] == subcategory]
+
+    summary = hierarchy.category_summary(selected_category)
+    st.subheader(f"Category: {selected_category}")
+
+    # Métricas específicas
+    cols = st.columns(3)
+
+    with cols[0]:
+        st.metric("Total Items", summary["total"])
+
+    with cols[1]:
+        st.metric("Completed", summary["Completed"])
+
+    with cols[2]:
+        st.metric("Pending", summary["Pending"])
+
+    # Mostrar subcategorías: las filas sólo se materializan al pedirlas
+    st.subheader("Subcategories")
+
+    for sub in hierarchy.subcategories(selected_category):
+        with st.expander(f"📁 {sub['name']} ({sub['total']} items, {sub['Completed']} completed)"):
+            if st.toggle("Show items", key=f"detail_rows_{selected_category}_{sub['name']}"):
+                sub_df = hierarchy.rows(df, sub["start"], sub["end"])
                 st.dataframe(
                     sub_df[["Item", "Status", "Priority", "Risk Level"]],
                     use_container_width=True
                 )
-    else:
-        st.info(f"No items found for category: {selected_category}")
\ No newline at end of file
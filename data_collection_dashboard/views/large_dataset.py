@@ -0,0 +1,116 @@
+import streamlit as st
+import pandas as pd
+from config import OUT_OF_CORE_THRESHOLD_MB, OUT_OF_CORE_CHUNK_ROWS
+from data_manager import load_page
+from utils.aggregates import SUMMARY_COLUMNS, counts_by, cube_labels, slice_cube
+from views.overview import show_overview_from_cube
+from views.analytics import show_trends
+
+def show_large_dataset(cube, overdue_cube, filters, version, dimensions=None):
+    """Mostrar el dashboard en modo fuera de memoria (agregados y tabla paginada)"""
+    st.info(
+        f"📦 Large dataset mode: data is above {OUT_OF_CORE_THRESHOLD_MB} MB and is read from disk "
+        f"in chunks of {OUT_OF_CORE_CHUNK_ROWS:,} rows. Editing and import are disabled."
+    )
+
+    filtered_cube = slice_cube(cube, SUMMARY_COLUMNS, filters, dimensions)
+    filtered_overdue = slice_cube(overdue_cube, SUMMARY_COLUMNS, filters, dimensions)
+
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "📈 Overview Dashboard",
+        "📋 Data Collection Table",
+        "🔍 Detailed View",
+        "📊 Analytics"
+    ])
+
+    with tab1:
+        show_overview_from_cube(filtered_cube, filtered_overdue, dimensions)
+
+    with tab2:
+        st.header("Data Collection Table")
+        show_paged_rows(filtered_cube, filters, version, key="table")
+
+    with tab3:
+        show_large_detailed_view(filtered_cube, filters, version, dimensions)
+
+    with tab4:
+        show_large_analytics(filtered_cube, dimensions)
+
+def show_paged_rows(cube, filters, version, key):
+    """Mostrar una tabla paginada leyendo sólo la página seleccionada"""
+    total = int(cube.sum())
+    if total == 0:
+        st.info("No data available with current filters.")
+        return
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page:", [50, 100, 500], index=1, key=f"{key}_page_size")
+    pages = (total + page_size - 1) // page_size
+    with col2:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+
+    rows = load_page(version, filters, page - 1, page_size)
+    st.dataframe(rows, use_container_width=True, height=400)
+    st.caption(f"Showing rows {(page - 1) * page_size + 1:,}–{min(page * page_size, total):,} of {total:,}")
+
+def show_large_detailed_view(cube, filters, version, dimensions=None):
+    """Mostrar vista detallada por categoría a partir del cubo y de páginas de filas"""
+    st.header("Detailed View")
+
+    # Sólo categorías reales: las filas de la página se filtran por su nombre
+    categories = cube_labels(cube, SUMMARY_COLUMNS, "Category", dimensions)
+    if not categories:
+        st.info("No categories available.")
+        return
+
+    selected_category = st.selectbox("Select Category:", categories, key="large_detail_category")
+    category_cube = slice_cube(cube, SUMMARY_COLUMNS, {"categories": [selected_category]}, dimensions)
+    by_status = counts_by(category_cube, SUMMARY_COLUMNS, "Status", dimensions)
+
+    st.subheader(f"Category: {selected_category}")
+    cols = st.columns(3)
+    with cols[0]:
+        st.metric("Total Items", int(category_cube.sum()))
+    with cols[1]:
+        st.metric("Completed", by_status.get("Completed", 0))
+    with cols[2]:
+        st.metric("Pending", by_status.get("Pending", 0))
+
+    show_paged_rows(category_cube, {**filters, "categories": [selected_category]}, version, key="detail")
+
+def show_large_analytics(cube, dimensions=None):
+    """Mostrar analytics a partir del cubo agregado"""
+    st.header("Analytics & Reports")
+
+    if cube.sum() == 0:
+        st.info("No data available for analytics.")
+        return
+
+    st.subheader("Basic Statistics")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**Status Distribution:**")
+        st.dataframe(pd.Series(counts_by(cube, SUMMARY_COLUMNS, "Status", dimensions), name="count"))
+
+    with col2:
+        st.write("**Priority Distribution:**")
+        st.dataframe(pd.Series(counts_by(cube, SUMMARY_COLUMNS, "Priority", dimensions), name="count"))
+
+    st.subheader("By Category")
+
+    for category, total in counts_by(cube, SUMMARY_COLUMNS, "Category", dimensions).items():
+        with st.expander(f"📊 {category}"):
+            category_cube = slice_cube(cube, SUMMARY_COLUMNS, {"categories": [category]}, dimensions)
+            by_status = counts_by(category_cube, SUMMARY_COLUMNS, "Status", dimensions)
+            cols = st.columns(3)
+            with cols[0]:
+                st.metric("Total", total)
+            with cols[1]:
+                st.metric("Completed", by_status.get("Completed", 0))
+            with cols[2]:
+                st.metric("Pending", by_status.get("Pending", 0))
+
+    show_trends()
@@ -0,0 +1,96 @@
+import time
+import streamlit as st
+import pandas as pd
+from data_manager import get_metrics_store
+from components.charts import create_range_chart
+
+# Rango → segundos hacia atrás desde ahora
+TIME_RANGES = {
+    "Last 15 minutes": 15 * 60,
+    "Last hour": 3600,
+    "Last 24 hours": 86400,
+    "Last 7 days": 7 * 86400,
+    "Last 30 days": 30 * 86400,
+    "Last year": 365 * 86400,
+}
+
+# Gráficos de la vista: título → (métricas, unidad)
+METRIC_GROUPS = {
+    "CPU": (["cpu_percent"], "%"),
+    "Memory": (["memory_percent", "swap_percent"], "%"),
+    "Load average": (["load_1", "load_5", "load_15"], None),
+    "Disk I/O": (["disk_read_kbs", "disk_write_kbs"], "KB/s"),
+    "Network": (["net_recv_kbs", "net_sent_kbs"], "KB/s"),
+}
+
+# Valores actuales mostrados como métricas: métrica → etiqueta
+CURRENT_VALUES = {
+    "cpu_percent": "CPU %",
+    "memory_percent": "Memory %",
+    "load_1": "Load (1 min)",
+    "uptime_s": "Uptime (days)",
+}
+
+MAX_POINTS = 600
+
+def _frame(result):
+    """DataFrame con índice temporal a partir del resultado de una consulta"""
+    return pd.DataFrame(
+        {"avg": result["avg"], "min": result["min"], "max": result["max"]},
+        index=pd.to_datetime(result["t"], unit="s")
+    )
+
+def show_monitoring():
+    """Mostrar métricas de hosts (CPU, RAM, I/O, red, carga, uptime)"""
+    st.header("Monitoring and Metrics")
+    
+    store = get_metrics_store()
+    hosts = store.hosts() if store is not None else []
+    if not hosts:
+        st.info("No host metrics collected yet. Start the dynamic collector with "
+                "`python agents/dynamic_collector/dynamic_collector.py --follow --metrics data/metrics` "
+                "from the scanner directory.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_hosts = st.multiselect("Hosts", hosts, default=hosts[:1])
+    with col2:
+        period = st.selectbox("Time range", list(TIME_RANGES), index=1)
+    
+    if not selected_hosts:
+        st.info("Select at least one host.")
+        return
+    
+    end = int(time.time())
+    start = end - TIME_RANGES[period]
+    
+    # Valores actuales (última muestra de los dos últimos minutos) por host
+    for host in selected_hosts:
+        available = store.metrics(host)
+        cols = st.columns(len(CURRENT_VALUES))
+        for col, (metric, label) in zip(cols, CURRENT_VALUES.items()):
+            result = store.query(host, metric, end - 120, end) if metric in available else {"avg": []}
+            value = result["avg"][-1] if len(result["avg"]) else None
+            if metric == "uptime_s" and value is not None:
+                value /= 86400
+            col.metric(f"{host} · {label}", "—" if value is None else f"{value:.1f}")
+    
+    # Un gráfico por grupo, leído de la resolución que cubre el rango (1 s, 1 min o 1 h)
+    step = None
+    for title, (metric_names, unit) in METRIC_GROUPS.items():
+        series = {}
+        for host in selected_hosts:
+            available = store.metrics(host)
+            for metric in metric_names:
+                if metric in available:
+                    result = store.query(host, metric, start, end, max_points=MAX_POINTS)
+                    step = result["step"]
+                    name = metric if len(selected_hosts) == 1 else f"{host} · {metric}"
+                    series[name] = _frame(result)
+        fig = create_range_chart(series, title, unit)
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
+    if step:
+        st.caption(f"Resolution: {step} s buckets (average line, min/max band)")
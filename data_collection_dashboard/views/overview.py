@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-from components.metrics import show_metrics
-from components.charts import create_pie_chart, create_bar_chart
+from components.metrics import show_metrics, show_metric_cards
+from components.charts import create_pie_chart, create_pie_chart_from_counts, create_bar_chart
+from utils.aggregates import SUMMARY_COLUMNS, counts_by, slice_cube
 
 def show_overview(filtered_df, full_df):
     """Mostrar vista Overview"""
@@ -48,5 +49,53 @@ def show_overview(filtered_df, full_df):
     with col2:
         st.subheader("Priority Distribution")
         fig_priority = create_pie_chart(filtered_df, "Priority", "Priority Distribution")
+        if fig_priority:
+            st.plotly_chart(fig_priority, use_container_width=True)
+
+def show_overview_from_cube(cube, overdue_cube, dimensions=None):
+    """Mostrar vista Overview a partir de cubos agregados (sin cargar las filas)"""
+    st.header("Overview Dashboard")
+    
+    total = int(cube.sum())
+    if total == 0:
+        st.info("No data available with current filters. Try adjusting your filters or add new data.")
+        return
+    
+    by_status = counts_by(cube, SUMMARY_COLUMNS, "Status", dimensions)
+    by_priority = counts_by(cube, SUMMARY_COLUMNS, "Priority", dimensions)
+    show_metric_cards(total, by_status.get("Completed", 0), by_priority.get("Critical", 0), int(overdue_cube.sum()))
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Progress by Category")
+        totals = counts_by(cube, SUMMARY_COLUMNS, "Category", dimensions)
+        completed_cube = slice_cube(cube, SUMMARY_COLUMNS, {"statuses": ["Completed"]}, dimensions)
+        completed = counts_by(completed_cube, SUMMARY_COLUMNS, "Category", dimensions)
+        category_progress = pd.DataFrame({
+            "Category": list(totals),
+            "Completion %": [completed.get(c, 0) / n * 100 for c, n in totals.items()]
+        })
+        fig1 = create_bar_chart(category_progress, "Category", "Completion %", "Completion % by Category")
+        if fig1:
+            st.plotly_chart(fig1, use_container_width=True)
+    
+    with col2:
+        st.subheader("Risk Distribution")
+        fig2 = create_pie_chart_from_counts(counts_by(cube, SUMMARY_COLUMNS, "Risk Level", dimensions), "Risk Level", "Risk Level Distribution")
+        if fig2:
+            st.plotly_chart(fig2, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Status Distribution")
+        fig_status = create_pie_chart_from_counts(by_status, "Status", "Status Distribution")
+        if fig_status:
+            st.plotly_chart(fig_status, use_container_width=True)
+    
+    with col2:
+        st.subheader("Priority Distribution")
+        fig_priority = create_pie_chart_from_counts(by_priority, "Priority", "Priority Distribution")
         if fig_priority:
             st.plotly_chart(fig_priority, use_container_width=True)
\ No newline at end of file
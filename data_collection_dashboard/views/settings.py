@@ -7,7 +7,7 @@ def show_settings(df, save_callback):
     st.header("Settings & Configuration")
     
     # Pestañas
-    tab1, tab2 = st.tabs(["📁 Data Management", "📤 Import/Export"])
+    tab1, tab2, tab3 = st.tabs(["📁 Data Management", "📤 Import/Export", "💾 Memory"])
     
     with tab1:
         st.subheader("Data Management")
@@ -23,7 +23,7 @@ def show_settings(df, save_callback):
                 st.experimental_rerun()
             
             if st.button("➕ Load Sample Data", type="secondary", use_container_width=True):
-                from data_manager import initialize_sample_data  # Si tienes esta función
+                from data_manager import initialize_sample_data
                 new_df = initialize_sample_data()
                 save_callback(new_df)
                 st.success("Sample data loaded!")
@@ -39,6 +39,9 @@ def show_settings(df, save_callback):
     with tab2:
         st.subheader("Import/Export")
         
+        # Importación
+        show_import(df, save_callback)
+        
         # Exportación
         st.write("### Export Data")
         
@@ -66,4 +69,92 @@ def show_settings(df, save_callback):
                 file_name=f"provenance_data_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.ms-excel",
                 type="primary"
-            )
\ No newline at end of file
+            )
+    
+    with tab3:
+        show_memory_report(df)
+
+def show_memory_report(df):
+    """Mostrar la memoria del proceso, la compartida y la de cada sesión"""
+    from data_manager import get_memory_registry
+    from config import SESSION_MEMORY_BUDGET_MB, PROCESS_MEMORY_BUDGET_MB
+    
+    st.subheader("Memory Usage")
+    report = get_memory_registry().report(shared=df)
+    sessions = report["sessions"]
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Process RSS", f"{report['process_rss_mb']:.0f} MB",
+                help=f"Budget: {PROCESS_MEMORY_BUDGET_MB} MB")
+    col2.metric("Shared Dataset", f"{report['shared_bytes'] / 1024 / 1024:.1f} MB")
+    col3.metric("Active Sessions", len(sessions))
+    
+    if report["process_rss_mb"] > PROCESS_MEMORY_BUDGET_MB:
+        st.warning(f"Process memory is above the {PROCESS_MEMORY_BUDGET_MB} MB budget.")
+    
+    if sessions:
+        rows = [{
+            "Session": session_id[:8],
+            "Own MB": entry["bytes"] / 1024 / 1024,
+            "Over Budget": entry["bytes"] > SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+            "Last Seen": datetime.fromtimestamp(entry["last_seen"]).strftime("%H:%M:%S"),
+        } for session_id, entry in sessions.items()]
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    st.caption("Own MB counts only buffers a session does not share with the cached dataset (object columns are estimated).")
+
+def show_import(df, save_callback):
+    """Mostrar importación masiva con validación y progreso"""
+    from bulk_import import import_items, SUPPORTED_FORMATS
+    
+    st.write("### Import Data")
+    st.caption("Rows are matched by Category, Subcategory and Item: existing items are updated, new ones are added.")
+    
+    uploaded = st.file_uploader(
+        "Upload file",
+        type=[ext.lstrip(".") for ext in SUPPORTED_FORMATS],
+        key="import_file"
+    )
+    
+    if uploaded is None:
+        return
+    
+    if st.button("📥 Import", type="primary"):
+        progress_bar = st.progress(0.0, text="Importing...")
+        
+        def on_progress(fraction, report):
+            progress_bar.progress(
+                fraction,
+                text=f"Imported {report['read']:,} rows ({report['invalid']:,} invalid)"
+            )
+        
+        try:
+            new_df, report = import_items(uploaded, uploaded.name, df, progress=on_progress)
+        except Exception as e:
+            st.error(f"Import failed: {e}")
+            return
+        
+        if report["valid"]:
+            save_callback(new_df)
+        progress_bar.progress(1.0, text="Import finished")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Rows Read", f"{report['read']:,}")
+        col2.metric("Inserted", f"{report['inserted']:,}")
+        col3.metric("Updated", f"{report['updated']:,}")
+        col4.metric("Invalid", f"{report['invalid']:,}")
+        
+        if not report["errors"].empty:
+            st.warning("Some rows were rejected:")
+            st.dataframe(report["errors"], use_container_width=True, hide_index=True)
+            st.download_button(
+                label="📥 Download Error Report",
+                data=report["errors"].to_csv(index=False),
+                file_name="import_errors.csv",
+                mime="text/csv"
+            )
+        
+        if report["valid"]:
+            st.success("Import completed. Refresh to see the new data.")
+    
+    st.divider()
\ No newline at end of file
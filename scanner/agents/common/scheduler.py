@@ -0,0 +1,232 @@
+"""
+Adaptive probe scheduler that keeps a collector under a resource budget.
+
+Every probe has a base interval and a priority. After each window the
+scheduler measures the collector's own CPU time, RSS and I/O through
+psutil and compares them with the budget:
+
+- over budget: intervals are stretched by ``backoff`` and, once they reach
+  ``max_scale``, the lowest-priority probes are suspended;
+- well under budget (below ``relax_below`` of it): suspended probes come
+  back first, then intervals shrink towards their base value.
+
+Every rate change and every skipped run is recorded in ``metrics()``, so
+gaps in the collected data can be explained afterwards.
+"""
+import time
+from dataclasses import dataclass, field
+
+import psutil
+
+# Entries kept in the rate-change and per-probe gap logs
+MAX_EVENTS = 200
+
+
+@dataclass
+class Budget:
+    cpu_percent: float = 1.0
+    rss_mb: float = 50.0
+    io_kb_per_sec: float = None
+
+
+@dataclass
+class Probe:
+    name: str
+    func: callable
+    interval: float
+    priority: int = 0
+    next_run: float = 0.0
+    runs: int = 0
+    skipped: int = 0
+    errors: int = 0
+    cpu_seconds: float = 0.0
+    last_error: str = None
+    gaps: list = field(default_factory=list)
+
+
+class ResourceMonitor:
+    """CPU, RSS and I/O of the current process between two samples."""
+
+    def __init__(self, process=None):
+        self.process = process or psutil.Process()
+        self._last = self._sample()
+
+    def _sample(self):
+        cpu = self.process.cpu_times()
+        try:
+            io = self.process.io_counters()
+            io_bytes = io.read_bytes + io.write_bytes
+        except (AttributeError, psutil.AccessDenied):
+            io_bytes = None
+        return time.monotonic(), cpu.user + cpu.system, io_bytes
+
+    def cpu_seconds(self):
+        cpu = self.process.cpu_times()
+        return cpu.user + cpu.system
+
+    def usage(self):
+        """Usage since the previous call: CPU %, RSS in MB and I/O in KB/s."""
+        wall, cpu, io_bytes = self._sample()
+        last_wall, last_cpu, last_io = self._last
+        self._last = (wall, cpu, io_bytes)
+        elapsed = max(wall - last_wall, 1e-6)
+        return {
+            "cpu_percent": 100 * (cpu - last_cpu) / elapsed,
+            "rss_mb": self.process.memory_info().rss / 1024 / 1024,
+            "io_kb_per_sec": (io_bytes - last_io) / 1024 / elapsed if io_bytes is not None and last_io is not None else None,
+        }
+
+
+class AdaptiveScheduler:
+    """Run probes at adaptive intervals under a CPU/RSS/I/O budget."""
+
+    def __init__(self, budget=None, window=10.0, backoff=2.0, max_scale=16.0,
+                 relax_below=0.5, monitor=None, clock=time.monotonic):
+        self.budget = budget or Budget()
+        self.window = window
+        self.backoff = backoff
+        self.max_scale = max_scale
+        self.relax_below = relax_below
+        self.monitor = monitor or ResourceMonitor()
+        self.clock = clock
+        self.probes = {}
+        self.scale = 1.0
+        self.min_priority = None
+        self.events = []
+        self.last_usage = {}
+        self._window_start = clock()
+
+    def add_probe(self, name, func, interval, priority=0):
+        self.probes[name] = Probe(name, func, interval, priority, next_run=self.clock())
+        return self.probes[name]
+
+    def interval(self, probe):
+        return probe.interval * self.scale
+
+    def suspended(self, probe):
+        return self.min_priority is not None and probe.priority < self.min_priority
+
+    def pressure(self, usage):
+        """Highest usage/budget ratio over the budgeted resources."""
+        ratios = [usage["cpu_percent"] / self.budget.cpu_percent,
+                  usage["rss_mb"] / self.budget.rss_mb]
+        if self.budget.io_kb_per_sec and usage["io_kb_per_sec"] is not None:
+            ratios.append(usage["io_kb_per_sec"] / self.budget.io_kb_per_sec)
+        return max(ratios)
+
+    def _record(self, action, pressure):
+        del self.events[:-MAX_EVENTS + 1]
+        self.events.append({
+            "time": time.time(),
+            "action": action,
+            "pressure": round(pressure, 3),
+            "scale": self.scale,
+            "min_priority": self.min_priority,
+        })
+
+    def adapt(self, now=None):
+        """Measure the last window and throttle or relax accordingly."""
+        now = self.clock() if now is None else now
+        usage = self.monitor.usage()
+        self.last_usage = usage
+        self._window_start = now
+        pressure = self.pressure(usage)
+        priorities = sorted({p.priority for p in self.probes.values()})
+
+        if pressure > 1:
+            if self.scale < self.max_scale:
+                self.scale = min(self.scale * self.backoff, self.max_scale)
+                self._record("slow_down", pressure)
+            else:
+                # Intervals already at their limit: suspend the lowest remaining priority
+                active = [p for p in priorities if self.min_priority is None or p >= self.min_priority]
+                if len(active) > 1:
+                    self.min_priority = active[1]
+                    self._record("suspend", pressure)
+        elif pressure < self.relax_below:
+            if self.min_priority is not None:
+                lower = [p for p in priorities if p < self.min_priority]
+                self.min_priority = lower[-1] if len(lower) > 1 else None
+                self._record("resume", pressure)
+            elif self.scale > 1:
+                self.scale = max(self.scale / self.backoff, 1.0)
+                self._record("speed_up", pressure)
+        return pressure
+
+    def _run(self, probe, now):
+        gap = now - probe.next_run
+        start = self.monitor.cpu_seconds()
+        try:
+            result = probe.func()
+        except Exception as e:  # a failing probe must not stop the collector
+            probe.errors += 1
+            probe.last_error = f"{type(e).__name__}: {e}"
+            result = None
+        probe.cpu_seconds += self.monitor.cpu_seconds() - start
+        probe.runs += 1
+        if gap > self.interval(probe):
+            del probe.gaps[:-MAX_EVENTS + 1]
+            probe.gaps.append({"time": time.time(), "late_seconds": round(gap, 3)})
+        probe.next_run = now + self.interval(probe)
+        return result
+
+    def run_once(self, now=None, force=False):
+        """Run the due probes, highest priority first, and return their results.
+
+        With force=True every probe runs regardless of schedule and throttling.
+        """
+        now = self.clock() if now is None else now
+        results = {}
+        for probe in sorted(self.probes.values(), key=lambda p: -p.priority):
+            if not force and probe.next_run > now:
+                continue
+            if not force and self.suspended(probe):
+                probe.skipped += 1
+                probe.next_run = now + self.interval(probe)
+                continue
+            results[probe.name] = self._run(probe, now)
+        if self.clock() - self._window_start >= self.window:
+            self.adapt()
+        return results
+
+    def next_due(self):
+        pending = [p.next_run for p in self.probes.values()]
+        return min(pending) if pending else self.clock() + self.window
+
+    def run(self, on_results=None, duration=None, stop=None):
+        """Run until duration elapses or stop() returns True."""
+        end = self.clock() + duration if duration is not None else None
+        while not (stop and stop()) and (end is None or self.clock() < end):
+            results = self.run_once()
+            if results and on_results:
+                on_results(results)
+            wake = min(self.next_due(), self._window_start + self.window)
+            if end is not None:
+                wake = min(wake, end)
+            time.sleep(max(wake - self.clock(), 0.01))
+
+    def metrics(self):
+        """Scheduler state: budget, usage, rate changes and per-probe counters."""
+        return {
+            "budget": {"cpu_percent": self.budget.cpu_percent, "rss_mb": self.budget.rss_mb,
+                       "io_kb_per_sec": self.budget.io_kb_per_sec},
+            "usage": {k: round(v, 3) if v is not None else None for k, v in self.last_usage.items()},
+            "scale": self.scale,
+            "min_priority": self.min_priority,
+            "rate_changes": list(self.events),
+            "probes": {
+                p.name: {
+                    "priority": p.priority,
+                    "base_interval": p.interval,
+                    "interval": self.interval(p),
+                    "suspended": self.suspended(p),
+                    "runs": p.runs,
+                    "skipped": p.skipped,
+                    "errors": p.errors,
+                    "last_error": p.last_error,
+                    "cpu_seconds": round(p.cpu_seconds, 4),
+                    "gaps": list(p.gaps),
+                }
+                for p in self.probes.values()
+            },
+        }
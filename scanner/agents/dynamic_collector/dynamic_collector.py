@@ -0,0 +1,110 @@
+"""
+Dynamic collector entrypoint (log activity and host metrics).
+
+Tails auth.log, syslog and nginx access logs from their last checkpoint
+and appends the parsed events (failed/accepted logins, invalid users,
+connection drops, retries, HTTP requests) to data/output/events.ndjson.
+With --metrics, host metrics are also sampled every --metrics-interval
+seconds into the time-series store (read by the dashboard's Monitoring
+view). With --alerts, events and metric samples are evaluated against the
+alert rules (analysis/alert_rules.yml) as they arrive and fired alerts
+are appended to the given NDJSON file.
+
+Run from the scanner directory:
+    python agents/dynamic_collector/dynamic_collector.py --follow --metrics data/metrics \
+        --alerts data/output/alerts.ndjson
+"""
+import argparse
+import socket
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agents.dynamic_collector.exporter.event_writer import append_events  # noqa: E402
+from agents.dynamic_collector.parser.host_metrics import HostMetrics  # noqa: E402
+from agents.dynamic_collector.parser.log_events import log_format, parse_chunk  # noqa: E402
+from agents.dynamic_collector.parser.log_tailer import DEFAULT_CHECKPOINTS, Checkpoints, LogTailer  # noqa: E402
+from analysis.alerting import DEFAULT_RULES, RuleEngine  # noqa: E402
+from storage.timeseries import TimeSeriesStore  # noqa: E402
+
+DEFAULT_LOGS = ("/var/log/auth.log", "/var/log/syslog", "/var/log/nginx/access.log")
+DEFAULT_OUTPUT = "data/output/events.ndjson"
+
+
+def collect_events(tailer):
+    """Events of every line appended to the tailed logs since the last call."""
+    events = []
+    for path, chunk in tailer.read_new():
+        events += parse_chunk(chunk, log_format(path), path)
+    return events
+
+
+def metric_events(host, samples, timestamp):
+    """A host metrics sample as "metric" events for the alert rules."""
+    return [{"type": "metric", "host": host, "name": name, "value": value, "ts": timestamp}
+            for name, value in samples.items() if value is not None]
+
+
+def append_alerts(alerts, output_path):
+    return append_events([asdict(alert) for alert in alerts], output_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect log activity events")
+    parser.add_argument("logs", nargs="*", default=DEFAULT_LOGS, help="log files to tail")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="NDJSON events file")
+    parser.add_argument("--checkpoints", default=DEFAULT_CHECKPOINTS, help="checkpoint file")
+    parser.add_argument("--from-start", action="store_true", help="read logs never seen before from the start")
+    parser.add_argument("--follow", action="store_true", help="keep polling the logs")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between log polls with --follow")
+    parser.add_argument("--metrics", help="time-series store directory for host metrics (with --follow)")
+    parser.add_argument("--metrics-interval", type=float, default=1.0, help="seconds between metric samples")
+    parser.add_argument("--alerts", help="evaluate the alert rules and append fired alerts (NDJSON) to this file")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="alert rules YAML (with --alerts)")
+    args = parser.parse_args(argv)
+
+    tailer = LogTailer(args.logs, Checkpoints(args.checkpoints), from_start=args.from_start)
+    host = socket.gethostname()
+    store = TimeSeriesStore(args.metrics, writable=True) if args.metrics else None
+    sampler = HostMetrics() if store else None
+    engine = RuleEngine.from_yaml(args.rules) if args.alerts else None
+    next_poll = next_sample = next_flush = time.monotonic()
+    try:
+        while True:
+            now = time.monotonic()
+            if sampler and now >= next_sample:
+                timestamp = time.time()
+                samples = sampler.sample()
+                store.append(host, samples, timestamp)
+                if engine:
+                    append_alerts(engine.process_batch(metric_events(host, samples, timestamp)), args.alerts)
+                next_sample += args.metrics_interval
+                if now >= next_flush:
+                    store.flush()
+                    next_flush = now + 60
+            if now >= next_poll:
+                events = collect_events(tailer)
+                count = append_events(events, args.output)
+                if count or not args.follow:
+                    print(f"{count} event(s) appended to {args.output}")
+                if engine:
+                    fired = append_alerts(engine.process_batch(events), args.alerts)
+                    if fired:
+                        print(f"{fired} alert(s) appended to {args.alerts}")
+                    engine.prune()
+                if not args.follow:
+                    break
+                next_poll += args.interval
+            time.sleep(max(0.0, min(next_poll, next_sample if sampler else next_poll) - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store:
+            store.flush()
+
+
+if __name__ == "__main__":
+    main()
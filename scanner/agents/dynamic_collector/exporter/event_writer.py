@@ -0,0 +1,13 @@
+"""NDJSON event output of the dynamic collector."""
+import json
+import os
+
+
+def append_events(events, output_path):
+    """Append events to an NDJSON file, one event per line; return how many were written."""
+    if not events:
+        return 0
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+    return len(events)
@@ -0,0 +1,49 @@
+"""Host metrics (CPU, RAM, I/O, network, load average, uptime) via psutil."""
+import os
+import time
+
+import psutil
+
+
+class HostMetrics:
+    """Samples host metrics; I/O and network counters are turned into per-second rates."""
+
+    def __init__(self):
+        self._counters = None
+        self._time = None
+        psutil.cpu_percent(None)  # the first call only sets the reference point
+
+    def _read_counters(self):
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return {
+            "disk_read_kbs": disk.read_bytes if disk else 0,
+            "disk_write_kbs": disk.write_bytes if disk else 0,
+            "net_sent_kbs": net.bytes_sent if net else 0,
+            "net_recv_kbs": net.bytes_recv if net else 0,
+        }
+
+    def sample(self):
+        """{metric: value} for this instant (rates are None on the first sample)."""
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+        load1, load5, load15 = os.getloadavg() if hasattr(os, "getloadavg") else (None, None, None)
+        metrics = {
+            "cpu_percent": psutil.cpu_percent(None),
+            "memory_percent": memory.percent,
+            "memory_used_mb": (memory.total - memory.available) / 1024 / 1024,
+            "swap_percent": psutil.swap_memory().percent,
+            "load_1": load1,
+            "load_5": load5,
+            "load_15": load15,
+            "uptime_s": time.time() - psutil.boot_time(),
+        }
+
+        counters = self._read_counters()
+        elapsed = now - self._time if self._time is not None else 0
+        for name, value in counters.items():
+            # Counters can go back (device removed, wrap): report no rate then
+            delta = value - self._counters[name] if self._counters else -1
+            metrics[name] = delta / elapsed / 1024 if elapsed > 0 and delta >= 0 else None
+        self._counters, self._time = counters, now
+        return metrics
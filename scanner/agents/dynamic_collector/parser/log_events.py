@@ -0,0 +1,76 @@
+"""
+Structured events from auth.log, syslog and nginx access logs.
+
+Lines are parsed a chunk at a time: every precompiled pattern runs once
+over the decoded chunk with finditer (MULTILINE), so lines that match
+nothing are skipped by the regex engine instead of a Python loop.
+"""
+import re
+
+AUTH = "auth"
+SYSLOG = "syslog"
+NGINX = "nginx"
+
+_SYSLOG_PREFIX = r"^(?P<time>\w{3} [ \d]\d \d\d:\d\d:\d\d|\d{4}-\d\d-\d\dT[\d:.]+(?:[+-]\d\d:?\d\d|Z)?) (?P<host>\S+) "
+
+# Format → [(event type, pattern)]
+PATTERNS = {
+    AUTH: [
+        ("failed_login", re.compile(
+            _SYSLOG_PREFIX + r"sshd\[\d+\]: Failed (?P<method>\S+) for (?:invalid user )?(?P<user>\S+) "
+            r"from (?P<ip>\S+) port (?P<port>\d+)", re.M)),
+        ("accepted_login", re.compile(
+            _SYSLOG_PREFIX + r"sshd\[\d+\]: Accepted (?P<method>\S+) for (?P<user>\S+) from (?P<ip>\S+) port (?P<port>\d+)",
+            re.M)),
+        ("invalid_user", re.compile(
+            _SYSLOG_PREFIX + r"sshd\[\d+\]: Invalid user (?P<user>\S*) from (?P<ip>\S+)", re.M)),
+        ("auth_failure", re.compile(
+            _SYSLOG_PREFIX + r"(?P<program>[\w-]+)(?:\[\d+\])?: pam_unix\([^)]*\): authentication failure;"
+            r".*? rhost=(?P<ip>\S*)(?:\s+user=(?P<user>\S+))?", re.M)),
+        ("connection_closed", re.compile(
+            _SYSLOG_PREFIX + r"sshd\[\d+\]: (?:Connection (?:closed|reset) by|Disconnected from)"
+            r"(?: invalid| authenticating)?(?: user (?P<user>\S+))? (?P<ip>[\d.:a-fA-F]+)", re.M)),
+        ("sudo", re.compile(
+            _SYSLOG_PREFIX + r"sudo(?:\[\d+\])?: +(?P<user>\S+) : .*?COMMAND=(?P<command>.*)$", re.M)),
+    ],
+    SYSLOG: [
+        ("connection_drop", re.compile(
+            _SYSLOG_PREFIX + r"(?P<program>[\w./-]+)(?:\[\d+\])?: (?P<message>.*?"
+            r"(?:[Cc]onnection (?:reset|refused|timed out|lost)|[Ll]ink is [Dd]own|NIC Link is Down).*)$", re.M)),
+        ("retry", re.compile(
+            _SYSLOG_PREFIX + r"(?P<program>[\w./-]+)(?:\[\d+\])?: (?P<message>.*?\b(?:[Rr]etry|[Rr]etrying)\b.*)$", re.M)),
+    ],
+    NGINX: [
+        ("http_request", re.compile(
+            r'^(?P<ip>\S+) \S+ (?P<user>\S+) \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" '
+            r"(?P<status>\d{3}) (?P<bytes>\d+|-)", re.M)),
+    ],
+}
+
+
+def log_format(path):
+    """Format of a log file from its name."""
+    name = path.rsplit("/", 1)[-1]
+    if name.startswith(("auth.log", "secure")):
+        return AUTH
+    if "access" in name:
+        return NGINX
+    return SYSLOG
+
+
+def parse_chunk(chunk, log_type, source=""):
+    """Events of a chunk of complete lines (bytes), in file order."""
+    text = chunk.decode("utf-8", "replace")
+    events = []
+    for event_type, pattern in PATTERNS[log_type]:
+        for match in pattern.finditer(text):
+            event = {k: v for k, v in match.groupdict().items() if v is not None}
+            event["type"] = event_type
+            event["source"] = source
+            event["_position"] = match.start()
+            events.append(event)
+    if len(PATTERNS[log_type]) > 1:
+        events.sort(key=lambda e: e["_position"])
+    for event in events:
+        del event["_position"]
+    return events
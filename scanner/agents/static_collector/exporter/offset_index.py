@@ -0,0 +1,145 @@
+"""
+Byte-offset index written next to a collector output file.
+
+The index maps (host, section, key) to the byte range of that entry in the
+YAML file, so a reader can mmap the output and decode one section or one
+entry without parsing the rest. Keys are 64-bit hashes sorted for binary
+search; equal keys (e.g. a package installed for two architectures) sit
+next to each other and are all returned.
+
+Layout of ``<output>.idx``: fixed header (struct), JSON metadata with the
+sections of each host, then three uint64 arrays (hashes, starts, ends).
+The header records the output's (mtime_ns, size); a stale index is ignored.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import textwrap
+
+import numpy as np
+import yaml
+
+MAGIC = b"PSOIDX01"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIqqQQ")  # magic, version, reserved, mtime_ns, size, meta length, count
+_ALIGN = 8
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def index_path(output_path):
+    return f"{output_path}.idx"
+
+
+def key_hash(host, section, key=""):
+    digest = hashlib.blake2b(f"{host}\0{section}\0{key}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def file_version(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_index(output_path, host, ranges):
+    """Write the index for an output file.
+
+    ``ranges`` is a list of (section, key, start, end); key "" marks the
+    whole section.
+    """
+    order_keys = np.array([key_hash(host, s, k) for s, k, _, _ in ranges], dtype=np.uint64)
+    starts = np.array([r[2] for r in ranges], dtype=np.uint64)
+    ends = np.array([r[3] for r in ranges], dtype=np.uint64)
+    order = np.argsort(order_keys, kind="stable")
+
+    sections = {s: [start, end] for s, k, start, end in ranges if k == ""}
+    meta = json.dumps({"hosts": {host: sections}}).encode("utf-8")
+    mtime_ns, size = file_version(output_path)
+
+    path = index_path(output_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, mtime_ns, size, len(meta), len(ranges)))
+        f.write(meta)
+        f.write(b"\0" * (-f.tell() % _ALIGN))
+        for array in (order_keys[order], starts[order], ends[order]):
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+class OutputIndex:
+    """Read-only view over an output file and its offset index."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        with open(index_path(output_path), "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, mtime_ns, size, meta_len, count = _HEADER.unpack_from(self._index)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{index_path(output_path)} is not an output index")
+        if (mtime_ns, size) != file_version(output_path):
+            raise ValueError(f"{index_path(output_path)} is stale")
+
+        offset = _HEADER.size
+        self._meta = json.loads(self._index[offset:offset + meta_len])
+        offset += meta_len + (-(offset + meta_len) % _ALIGN)
+        self._hashes, self._starts, self._ends = (
+            np.frombuffer(self._index, dtype=np.uint64, count=count, offset=offset + i * count * 8)
+            for i in range(3)
+        )
+        with open(output_path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @classmethod
+    def open(cls, output_path):
+        """Open the index, or return None if it is missing or stale."""
+        try:
+            return cls(output_path)
+        except (OSError, ValueError):
+            return None
+
+    def hosts(self):
+        return list(self._meta["hosts"])
+
+    def sections(self, host=None):
+        return list(self._meta["hosts"][host or self._default_host()])
+
+    def _default_host(self):
+        return next(iter(self._meta["hosts"]))
+
+    def _ranges(self, host, section, key):
+        h = np.uint64(key_hash(host or self._default_host(), section, key))
+        lo = np.searchsorted(self._hashes, h, side="left")
+        hi = np.searchsorted(self._hashes, h, side="right")
+        return [(int(self._starts[i]), int(self._ends[i])) for i in range(lo, hi)]
+
+    def raw(self, section, key="", host=None):
+        """Raw YAML bytes of a section or entry (one per matching entry)."""
+        return [self._data[start:end] for start, end in self._ranges(host, section, key)]
+
+    def section(self, section, host=None):
+        """Decode one section, or None if the host has no such section."""
+        chunks = self.raw(section, host=host)
+        if not chunks:
+            return None
+        return yaml.load(chunks[0], Loader=Loader)[section]
+
+    def entries(self, section, key, host=None):
+        """Decode every entry of a section with the given key."""
+        decoded = []
+        for chunk in self.raw(section, str(key), host=host):
+            text = chunk.decode("utf-8")
+            if text.startswith("- "):
+                decoded.append(yaml.load(text, Loader=Loader)[0])
+            else:
+                decoded.append(yaml.load(textwrap.dedent(text), Loader=Loader)[str(key)])
+        return decoded
+
+    def close(self):
+        # The arrays are views of the mapping: drop them before closing it
+        self._hashes = self._starts = self._ends = None
+        self._index.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
@@ -0,0 +1,67 @@
+"""YAML exporter for collector output, with a byte-offset index."""
+import os
+
+import yaml
+
+from agents.static_collector.exporter.offset_index import write_index
+
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Field used as the index key of each entry in list sections
+KEY_FIELDS = {
+    "processes": "pid",
+    "services": "name",
+    "autostart": "name",
+    "packages": "name",
+}
+
+
+def _dump(value):
+    return yaml.dump(value, Dumper=Dumper, default_flow_style=False, sort_keys=False,
+                     allow_unicode=True).encode("utf-8")
+
+
+def dump_yaml(data):
+    """Collector output as YAML bytes, without an index."""
+    return _dump(data)
+
+
+def _indent(data):
+    return b"".join(b"  " + line if line.strip() else line for line in data.splitlines(keepends=True))
+
+
+def export_yaml(data, output_path):
+    """Write collector output as YAML and index every section and entry.
+
+    Sections are dumped one entry at a time, which yields the same YAML as
+    dumping the whole document while recording where each entry starts.
+    """
+    host = data.get("host") or data.get("os", {}).get("hostname", "")
+    ranges = []
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        for section, value in data.items():
+            start = f.tell()
+            if isinstance(value, list) and value:
+                f.write(f"{section}:\n".encode("utf-8"))
+                key_field = KEY_FIELDS.get(section)
+                for entry in value:
+                    entry_start = f.tell()
+                    f.write(_dump([entry]))
+                    if key_field and isinstance(entry, dict):
+                        ranges.append((section, str(entry.get(key_field)), entry_start, f.tell()))
+            elif isinstance(value, dict) and value:
+                f.write(f"{section}:\n".encode("utf-8"))
+                for key, item in value.items():
+                    entry_start = f.tell()
+                    f.write(_indent(_dump({key: item})))
+                    ranges.append((section, str(key), entry_start, f.tell()))
+            else:
+                f.write(_dump({section: value}))
+            ranges.append((section, "", start, f.tell()))
+
+    os.replace(tmp_path, output_path)
+    write_index(output_path, host, ranges)
+    return output_path
@@ -0,0 +1,145 @@
+"""
+Streaming parser for the dpkg status database (/var/lib/dpkg/status).
+
+The file is read once, line by line, without running dpkg-query. Only the
+fields needed for the package table and the dependency graph are kept;
+continuation lines (descriptions, conffiles) are skipped.
+"""
+import re
+import sys
+
+STATUS_FILE = "/var/lib/dpkg/status"
+
+# Fields kept from every stanza
+FIELDS = {
+    b"Package": "name",
+    b"Version": "version",
+    b"Architecture": "architecture",
+    b"Status": "status",
+    b"Depends": "depends",
+    b"Pre-Depends": "pre_depends",
+    b"Provides": "provides",
+    b"Source": "source",
+}
+
+_RELATION = re.compile(r"^\s*([^\s:(\[]+)(?::\S+)?\s*(?:\(\s*([<>=]+)\s*([^)\s]+)\s*\))?")
+
+# Parsed alternatives by text: the same relations (e.g. "libc6 (>= 2.34)")
+# repeat across most packages
+_ALTERNATIVES = {}
+
+
+def iter_stanzas(path=STATUS_FILE):
+    """Yield one dict per package stanza with the fields in FIELDS."""
+    stanza = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if line[:1] in (b" ", b"\t"):
+                continue  # continuation of a multi-line field
+            if line == b"\n":
+                if stanza:
+                    yield stanza
+                    stanza = {}
+                continue
+            field, sep, value = line.partition(b":")
+            key = FIELDS.get(field)
+            if key and sep:
+                stanza[key] = value.strip().decode("utf-8", "replace")
+    if stanza:
+        yield stanza
+
+
+def _parse_alternative(text):
+    """(name, operator, version) of one alternative, or None."""
+    parsed = _ALTERNATIVES.get(text)
+    if parsed is None:
+        match = _RELATION.match(text)
+        parsed = _ALTERNATIVES[text] = (sys.intern(match.group(1)), match.group(2), match.group(3)) if match else None
+    return parsed
+
+
+def parse_relations(value):
+    """Parse a Depends/Provides value into groups of alternatives.
+
+    ``"a (>= 1), b | c:any"`` → ``[[("a", ">=", "1")], [("b", None, None), ("c", None, None)]]``
+    """
+    groups = []
+    if not value:
+        return groups
+    for group in value.split(","):
+        alternatives = [parsed for parsed in map(_parse_alternative, group.split("|")) if parsed]
+        if alternatives:
+            groups.append(alternatives)
+    return groups
+
+
+def is_installed(status):
+    """True for "install ok installed" (and other fully installed states)."""
+    return status.endswith(" installed") and not status.endswith("not-installed")
+
+
+class PackageTable:
+    """Interned table of the packages in a status file, indexed by package id.
+
+    Columns are parallel lists (names, versions, architectures, statuses,
+    source packages and their versions);
+    ``ids`` maps a package name to its ids (one per architecture).
+    """
+
+    def __init__(self):
+        self.names = []
+        self.versions = []
+        self.architectures = []
+        self.statuses = []
+        self.sources = []
+        self.source_versions = []
+        self.depends = []
+        self.provides = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, stanza):
+        package_id = len(self.names)
+        name = sys.intern(stanza.get("name", ""))
+        self.names.append(name)
+        version = stanza.get("version", "")
+        self.versions.append(version)
+        self.architectures.append(sys.intern(stanza.get("architecture", "")))
+        self.statuses.append(sys.intern(stanza.get("status", "")))
+        # "Source: name (version)" when the source version differs (binNMU, split versions)
+        source, _, source_version = stanza.get("source", "").partition(" ")
+        self.sources.append(sys.intern(source or name))
+        self.source_versions.append(source_version.strip(" ()") or version)
+        relations = ", ".join(v for v in (stanza.get("pre_depends"), stanza.get("depends")) if v)
+        self.depends.append(parse_relations(relations))
+        self.provides.append([alternatives[0][0] for alternatives in parse_relations(stanza.get("provides"))])
+        self.ids.setdefault(name, []).append(package_id)
+        return package_id
+
+    def records(self):
+        """Installed packages as dicts (name, version, architecture, source package).
+
+        ``source_version`` is only set when it differs from the binary version.
+        """
+        records = []
+        for i in range(len(self)):
+            if not is_installed(self.statuses[i]):
+                continue
+            record = {"name": self.names[i], "version": self.versions[i], "architecture": self.architectures[i],
+                      "source": self.sources[i]}
+            if self.source_versions[i] != self.versions[i]:
+                record["source_version"] = self.source_versions[i]
+            records.append(record)
+        return records
+
+
+def parse_status(path=STATUS_FILE, installed_only=True):
+    """Parse a dpkg status file into a PackageTable."""
+    table = PackageTable()
+    for stanza in iter_stanzas(path):
+        if installed_only and not is_installed(stanza.get("status", "")):
+            continue
+        table.add(stanza)
+    return table
@@ -0,0 +1,257 @@
+"""
+Sensitive files and permissions (critical paths under /etc and logs).
+
+Trees are walked with os.scandir, one directory per task on a thread
+pool. Every entry's mode, owner, size, mtime and inode go to compact
+arrays (FileTable). Config files are hashed, but only when their
+(inode, mtime, size) differs from the previous sweep: the triple and the
+digest of every hashed file persist in a SweepCache between runs, so a
+sweep of an unchanged tree is only scandir + stat.
+"""
+import hashlib
+import os
+import stat
+import struct
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_ROOTS = ("/etc", "/var/log")
+DEFAULT_CACHE = "data/cache/filesystem.cache"
+
+# Files whose contents are hashed: by extension or by path
+CONFIG_SUFFIXES = (".conf", ".cnf", ".cfg", ".ini", ".yml", ".yaml", ".json", ".toml", ".env")
+CONFIG_PATHS = frozenset({
+    "/etc/passwd", "/etc/group", "/etc/shadow", "/etc/gshadow", "/etc/sudoers",
+    "/etc/hosts", "/etc/crontab", "/etc/ssh/sshd_config", "/etc/ssh/ssh_config",
+})
+MAX_HASH_BYTES = 4 * 1024 * 1024
+# Directories walked by one pool task before the rest is handed back
+DIRS_PER_TASK = 64
+# Trees never descended into
+SKIP_PATHS = ("/proc", "/sys", "/dev", "/run")
+# Files that must not be readable by other users
+PRIVATE_FILES = ("/etc/shadow", "/etc/gshadow", "/etc/sudoers")
+
+_DIGEST_SIZE = 32
+_CACHE_MAGIC = b"FSC1"
+_CACHE_HEADER = struct.Struct("<4sII")  # magic, entry count, bytes of the path block
+
+
+class FileTable:
+    """Columns of the entries found by a sweep (index i = one file or directory)."""
+
+    def __init__(self):
+        self.paths = []
+        self.modes = array("I")
+        self.uids = array("I")
+        self.gids = array("I")
+        self.sizes = array("q")
+        self.mtimes = array("q")  # nanoseconds
+        self.inodes = array("Q")
+
+    def __len__(self):
+        return len(self.paths)
+
+    def extend(self, rows):
+        for path, mode, uid, gid, size, mtime, inode in rows:
+            self.paths.append(path)
+            self.modes.append(mode)
+            self.uids.append(uid)
+            self.gids.append(gid)
+            self.sizes.append(size)
+            self.mtimes.append(mtime)
+            self.inodes.append(inode)
+
+
+class SweepCache:
+    """(inode, mtime, size) and content digest of the files hashed by the last sweep.
+
+    Stored as one binary file: a header, the NUL-separated paths, then the
+    inode/mtime/size arrays and the digests.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}  # path → (inode, mtime_ns, size, digest)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, count, paths_len = _CACHE_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return cls()
+        if magic != _CACHE_MAGIC:
+            return cls()
+        offset = _CACHE_HEADER.size
+        paths = data[offset:offset + paths_len].decode("utf-8", "surrogateescape").split("\0") if count else []
+        offset += paths_len
+        columns = []
+        for typecode in ("Q", "q", "q"):
+            column = array(typecode)
+            column.frombytes(data[offset:offset + 8 * count])
+            columns.append(column)
+            offset += 8 * count
+        digests = data[offset:offset + _DIGEST_SIZE * count]
+        if len(paths) != count or len(digests) != _DIGEST_SIZE * count:
+            return cls()
+        return cls({
+            p: (columns[0][i], columns[1][i], columns[2][i], digests[i * _DIGEST_SIZE:(i + 1) * _DIGEST_SIZE])
+            for i, p in enumerate(paths)
+        })
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        paths = list(self.entries)
+        block = "\0".join(paths).encode("utf-8", "surrogateescape")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, len(paths), len(block)))
+            f.write(block)
+            for column, typecode in enumerate(("Q", "q", "q")):
+                f.write(array(typecode, (self.entries[p][column] for p in paths)).tobytes())
+            f.write(b"".join(self.entries[p][3] for p in paths))
+        os.replace(tmp_path, path)
+
+
+def is_config(path):
+    return path.endswith(CONFIG_SUFFIXES) or path in CONFIG_PATHS
+
+
+def hash_file(path, limit=MAX_HASH_BYTES):
+    """SHA-256 of a file, read without keeping it in the page cache."""
+    digest = hashlib.sha256()
+    with open(path, "rb", buffering=0) as f:
+        remaining = limit
+        while remaining > 0:
+            block = f.read(min(1024 * 1024, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return digest.digest()
+
+
+def _scan_tree(path, device, max_dirs=DIRS_PER_TASK):
+    """Entries of up to max_dirs directories under path (depth first) and
+    the directories left to walk, which go back to the pool."""
+    rows, stack = [], [path]
+    for _ in range(max_dirs):
+        if not stack:
+            break
+        try:
+            iterator = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with iterator:
+            for entry in iterator:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                rows.append((entry.path, st.st_mode, st.st_uid, st.st_gid, st.st_size, st.st_mtime_ns, st.st_ino))
+                if stat.S_ISDIR(st.st_mode) and st.st_dev == device and not entry.path.startswith(SKIP_PATHS):
+                    stack.append(entry.path)
+    return rows, stack
+
+
+def sweep(roots=DEFAULT_ROOTS, workers=4):
+    """Walk the roots in parallel (without crossing filesystems) into a FileTable."""
+    table = FileTable()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}  # future → device of the directory it scans
+        for root in roots:
+            try:
+                st = os.stat(root)
+            except OSError:
+                continue
+            table.extend([(root, st.st_mode, st.st_uid, st.st_gid, st.st_size, st.st_mtime_ns, st.st_ino)])
+            if stat.S_ISDIR(st.st_mode):
+                pending[pool.submit(_scan_tree, root, st.st_dev)] = st.st_dev
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                device = pending.pop(future)
+                rows, subdirs = future.result()
+                table.extend(rows)
+                for subdir in subdirs:
+                    pending[pool.submit(_scan_tree, subdir, device)] = device
+    return table
+
+
+def hash_configs(table, cache, workers=4):
+    """Digest of every config file in the table, hashing only changed files.
+
+    Returns ({path: digest}, number of files hashed) and updates the cache.
+    """
+    digests, to_hash = {}, []
+    for i, path in enumerate(table.paths):
+        if not stat.S_ISREG(table.modes[i]) or not is_config(path):
+            continue
+        key = (table.inodes[i], table.mtimes[i], table.sizes[i])
+        cached = cache.entries.get(path)
+        if cached and cached[:3] == key:
+            digests[path] = cached[3]
+        else:
+            to_hash.append((path, key))
+
+    def run(item):
+        try:
+            return item, hash_file(item[0])
+        except OSError:
+            return item, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (path, key), digest in pool.map(run, to_hash):
+            if digest is not None:
+                digests[path] = digest
+                cache.entries[path] = (*key, digest)
+    for path in cache.entries.keys() - digests.keys():
+        del cache.entries[path]
+    return digests, len(to_hash)
+
+
+def collect_files(roots=DEFAULT_ROOTS, cache_path=DEFAULT_CACHE, workers=4):
+    """Permissions of the sensitive paths and digests of their config files."""
+    previous = SweepCache.load(cache_path)
+    known = dict(previous.entries)
+    table = sweep(roots, workers)
+    digests, hashed = hash_configs(table, previous, workers)
+    previous.save(cache_path)
+
+    world_writable, setuid = [], []
+    flagged = stat.S_IWOTH | stat.S_ISUID | stat.S_ISGID
+    for path, mode in zip(table.paths, table.modes):
+        if not mode & flagged or stat.S_ISLNK(mode):
+            continue
+        if mode & stat.S_IWOTH and not (stat.S_ISDIR(mode) and mode & stat.S_ISVTX):
+            world_writable.append(path)
+        if mode & (stat.S_ISUID | stat.S_ISGID) and stat.S_ISREG(mode):
+            setuid.append(path)
+    position = {path: i for i, path in enumerate(table.paths) if path in digests or path in PRIVATE_FILES}
+    private_readable = [p for p in PRIVATE_FILES if p in position and table.modes[position[p]] & stat.S_IROTH]
+
+    return {
+        "roots": list(roots),
+        "entries": len(table),
+        "bytes": sum(table.sizes),
+        "hashed": hashed,
+        "changed_configs": sorted(p for p, d in digests.items() if p in known and known[p][3] != d),
+        "new_configs": sorted(digests.keys() - known.keys()) if known else [],
+        "removed_configs": sorted(known.keys() - digests.keys()),
+        "world_writable": sorted(world_writable),
+        "setuid": sorted(setuid),
+        "private_readable": private_readable,
+        "configs": [
+            {
+                "path": path,
+                "mode": oct(stat.S_IMODE(table.modes[i])),
+                "uid": table.uids[i],
+                "gid": table.gids[i],
+                "sha256": digests[path].hex(),
+            }
+            for path, i in sorted((p, position[p]) for p in digests)
+        ],
+    }
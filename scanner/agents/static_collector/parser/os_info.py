@@ -0,0 +1,20 @@
+"""Host and OS metadata."""
+import platform
+import socket
+
+
+def collect_os_metadata():
+    """Hostname, OS type, kernel and /etc/os-release fields."""
+    try:
+        release = platform.freedesktop_os_release()
+    except OSError:
+        release = {}
+    return {
+        "hostname": socket.gethostname(),
+        "os_type": platform.system(),
+        "kernel": platform.release(),
+        "architecture": platform.machine(),
+        "distribution": release.get("ID", ""),
+        "distribution_version": release.get("VERSION_ID", ""),
+        "pretty_name": release.get("PRETTY_NAME", ""),
+    }
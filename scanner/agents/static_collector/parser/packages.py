@@ -0,0 +1,29 @@
+"""Installed packages (dpkg on Debian/Ubuntu)."""
+import os
+
+from agents.static_collector.parser.dpkg_status import STATUS_FILE, parse_status
+from agents.static_collector.utils.commands import run_command
+
+_FORMAT = "${Package}\t${Version}\t${Architecture}\t${db:Status-Abbrev}\t${source:Package}\t${source:Version}\n"
+
+
+def collect_packages(status_file=STATUS_FILE):
+    """Installed dpkg packages with version, architecture and source package (and its version if different).
+
+    Reads the dpkg status database directly; dpkg-query is only used when
+    the database is not at its usual path.
+    """
+    if os.path.exists(status_file):
+        return parse_status(status_file).records()
+
+    output = run_command(["dpkg-query", "-W", f"-f={_FORMAT}"])
+    packages = []
+    for line in output.splitlines():
+        fields = line.split("\t")
+        if len(fields) < 6 or not fields[3].startswith("ii"):
+            continue
+        package = {"name": fields[0], "version": fields[1], "architecture": fields[2], "source": fields[4]}
+        if fields[5] != fields[1]:
+            package["source_version"] = fields[5]
+        packages.append(package)
+    return packages
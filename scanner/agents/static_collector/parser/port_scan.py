@@ -0,0 +1,187 @@
+"""
+Asyncio TCP connect sweep with banner grabbing.
+
+Every port is tried with a non-blocking connect_ex on a bare socket: a
+refused port costs no event loop round trip, a pending connect waits for
+writability under a per-connect timeout. A fixed pool of workers takes
+the ports, so at most ``concurrency`` sockets are open at once. Open
+ports are then read for a banner; silent ones get a short HTTP request
+and the first bytes of the answer identify the protocol.
+"""
+import asyncio
+import errno
+import re
+import socket
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CONCURRENCY = 1000
+CONNECT_TIMEOUT = 0.5
+BANNER_TIMEOUT = 1.0
+BANNER_SIZE = 512
+# Sent to ports that stay silent: HTTP servers answer it, most others close or complain
+PROBE = b"HEAD / HTTP/1.0\r\n\r\n"
+
+# (protocol, pattern on the first bytes, group holding the version or None)
+FINGERPRINTS = [
+    ("ssh", re.compile(rb"^SSH-[\d.]+-(\S+)"), 1),
+    ("http", re.compile(rb"^HTTP/\d(?:\.\d)? \d{3}"), None),
+    ("ftp", re.compile(rb"^220[ -].*?(\S*FTP\S*[^\r\n]*)", re.I), 1),
+    ("smtp", re.compile(rb"^220[ -]\S+ (?:E?SMTP) ?([^\r\n]*)"), 1),
+    ("pop3", re.compile(rb"^\+OK ?([^\r\n]*)"), 1),
+    ("imap", re.compile(rb"^\* OK ?([^\r\n]*)"), 1),
+    ("redis", re.compile(rb"^-(?:ERR|NOAUTH|DENIED)\b"), None),
+    ("vnc", re.compile(rb"^RFB (\d{3}\.\d{3})"), 1),
+    ("tls", re.compile(rb"^\x15\x03[\x00-\x04]"), None),  # TLS alert in answer to the plain-text probe
+    ("smb", re.compile(rb"^\x00...\xffSMB|^\x00...\xfeSMB", re.S), None),
+]
+_HTTP_SERVER = re.compile(rb"\r?\nServer: *([^\r\n]+)", re.I)
+# MySQL/MariaDB greeting: 3-byte length, sequence 0, protocol 10, NUL-terminated version
+_MYSQL = re.compile(rb"^...\x00\x0a([\w.\-~+]+)\x00", re.S)
+# Well-known ports, used when the banner says nothing
+PORT_NAMES = {
+    21: "ftp", 22: "ssh", 23: "telnet", 25: "smtp", 53: "dns", 80: "http", 110: "pop3", 111: "rpcbind",
+    139: "netbios-ssn", 143: "imap", 443: "https", 445: "smb", 465: "smtps", 587: "submission",
+    631: "ipp", 993: "imaps", 995: "pop3s", 1433: "mssql", 2049: "nfs", 3306: "mysql",
+    3389: "rdp", 5432: "postgresql", 5672: "amqp", 5900: "vnc", 6379: "redis", 8080: "http-alt",
+    8443: "https-alt", 9200: "elasticsearch", 11211: "memcached", 27017: "mongodb",
+}
+
+
+def fingerprint(data, port=None):
+    """(protocol, version) from the first bytes a port sent; version may be None."""
+    if data:
+        for protocol, pattern, group in FINGERPRINTS:
+            match = pattern.match(data)
+            if match:
+                version = match.group(group) if group else None
+                if protocol == "http":
+                    server = _HTTP_SERVER.search(data)
+                    version = server.group(1) if server else None
+                if version:
+                    version = version.decode("utf-8", "replace").strip() or None
+                return protocol, version
+        match = _MYSQL.match(data)
+        if match:
+            return "mysql", match.group(1).decode("ascii", "replace")
+    return PORT_NAMES.get(port, "unknown"), None
+
+
+def parse_ports(spec):
+    """Ports of a spec like "22,80,8000-8100" (sorted, deduplicated)."""
+    ports = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        ports.update(range(int(first), int(last or first) + 1))
+    return sorted(p for p in ports if 0 < p < 65536)
+
+
+def max_concurrency(requested=CONCURRENCY):
+    """Concurrency capped below the soft limit of open files."""
+    if resource is None:
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    return max(1, min(requested, soft - 64)) if soft != resource.RLIM_INFINITY else requested
+
+
+def _resolve(waiter, ready):
+    if not waiter.done():
+        waiter.set_result(ready)
+
+
+def _self_connected(sock):
+    """Whether a loopback connect landed on its own ephemeral port (TCP simultaneous open)."""
+    try:
+        return sock.getsockname() == sock.getpeername()
+    except OSError:
+        return True  # reset meanwhile: not a listener either
+
+
+async def _connect(loop, sock, address, timeout):
+    """Whether a non-blocking connect reaches a listener within timeout."""
+    error = sock.connect_ex(address)
+    if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+        return False  # refused or unreachable right away
+    if error:
+        waiter = loop.create_future()
+        fd = sock.fileno()
+        loop.add_writer(fd, _resolve, waiter, True)
+        timer = loop.call_later(timeout, _resolve, waiter, False)
+        try:
+            ready = await waiter
+        finally:
+            loop.remove_writer(fd)
+            timer.cancel()
+        if not ready or sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+            return False
+    return not _self_connected(sock)
+
+
+def _printable(data):
+    text = data[:120].decode("utf-8", "replace").split("\n", 1)[0].strip()
+    return "".join(c if c.isprintable() else "." for c in text)
+
+
+async def _banner(loop, sock, timeout):
+    """First bytes a connected socket sends by itself or in answer to PROBE."""
+    try:
+        return await asyncio.wait_for(loop.sock_recv(sock, BANNER_SIZE), timeout)
+    except asyncio.TimeoutError:
+        pass
+    except OSError:
+        return b""
+    try:
+        await loop.sock_sendall(sock, PROBE)
+        return await asyncio.wait_for(loop.sock_recv(sock, BANNER_SIZE), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return b""
+
+
+async def probe_port(host, port, family=socket.AF_INET, timeout=CONNECT_TIMEOUT, banner_timeout=BANNER_TIMEOUT):
+    """Service dict of an open port, or None if closed or filtered."""
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        if not await _connect(loop, sock, (host, port), timeout):
+            return None
+        data = await _banner(loop, sock, banner_timeout) if banner_timeout else b""
+    finally:
+        sock.close()
+    service, version = fingerprint(data, port)
+    return {
+        "port": port,
+        "service": service,
+        "version": version,
+        "banner": _printable(data),
+    }
+
+
+async def scan(host, ports, concurrency=CONCURRENCY, timeout=CONNECT_TIMEOUT, banner_timeout=BANNER_TIMEOUT):
+    """Open ports of a host among ports, as service dicts sorted by port."""
+    family, _, _, _, address = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)[0]
+    ports = list(ports)
+    pending = iter(ports)
+    found = []
+
+    async def worker():
+        for port in pending:  # shared iterator: every port is taken by one worker
+            result = await probe_port(address[0], port, family, timeout, banner_timeout)
+            if result:
+                found.append(result)
+
+    workers = min(max_concurrency(concurrency), len(ports))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return sorted(found, key=lambda r: r["port"])
+
+
+def scan_host(host, ports=range(1, 65536), **kwargs):
+    """Blocking wrapper around scan()."""
+    return asyncio.run(scan(host, ports, **kwargs))
+
@@ -0,0 +1,94 @@
+"""
+Exposed services: listening sockets mapped to their processes, with the
+protocol and version of every TCP listener from its banner.
+
+Listening sockets come from psutil in one call. Their TCP ports are then
+banner-grabbed concurrently (parser/port_scan.py) on the loopback address
+of their family. When psutil cannot list sockets (no permission), the
+loopback addresses are swept over the whole port range instead.
+"""
+import asyncio
+import socket
+
+import psutil
+
+from agents.static_collector.parser.port_scan import BANNER_TIMEOUT, CONCURRENCY, PORT_NAMES, probe_port, scan
+
+_ANY = {"0.0.0.0": "127.0.0.1", "::": "::1"}
+
+
+def _owner(pid, owners):
+    """(process name, exe, username) of a pid, cached per collection."""
+    if pid not in owners:
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                owners[pid] = (process.name(), process.exe() or None, process.username())
+        except (psutil.Error, OSError):
+            owners[pid] = (None, None, None)
+    return owners[pid]
+
+
+def listening_sockets():
+    """Listening TCP sockets and bound UDP sockets, or None if they cannot be listed."""
+    try:
+        connections = psutil.net_connections(kind="inet")
+    except psutil.AccessDenied:
+        return None
+    owners = {}
+    sockets = {}
+    for conn in connections:
+        tcp = conn.type == socket.SOCK_STREAM
+        if (tcp and conn.status != psutil.CONN_LISTEN) or (not tcp and conn.raddr) or not conn.laddr:
+            continue
+        protocol = ("tcp" if tcp else "udp") + ("6" if conn.family == socket.AF_INET6 else "")
+        name, exe, user = _owner(conn.pid, owners) if conn.pid else (None, None, None)
+        # SO_REUSEPORT listeners show up once per process: keep one entry per endpoint
+        sockets.setdefault((protocol, conn.laddr.ip, conn.laddr.port), {
+            "protocol": protocol,
+            "address": conn.laddr.ip,
+            "port": conn.laddr.port,
+            "process": name,
+            "exe": exe,
+            "user": user,
+        })
+    return sorted(sockets.values(), key=lambda s: (s["protocol"], s["port"], s["address"]))
+
+
+async def _grab_banners(entries, banner_timeout):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def grab(entry):
+        host = _ANY.get(entry["address"], entry["address"])
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        async with semaphore:
+            return await probe_port(host.split("%", 1)[0], entry["port"], family, banner_timeout=banner_timeout)
+
+    return await asyncio.gather(*(grab(entry) for entry in entries))
+
+
+def _sweep_loopback(ports, banner_timeout):
+    entries = []
+    for protocol, host in (("tcp", "127.0.0.1"), ("tcp6", "::1")):
+        try:
+            found = asyncio.run(scan(host, ports, banner_timeout=banner_timeout))
+        except OSError:
+            continue  # no IPv6 loopback
+        entries += [{"protocol": protocol, "address": host, "process": None, "exe": None, "user": None, **r}
+                    for r in found]
+    return entries
+
+
+def collect_ports(banner_timeout=BANNER_TIMEOUT, sweep_ports=range(1, 65536)):
+    """Exposed services: protocol, address, port, owning process and user, service and version."""
+    entries = listening_sockets()
+    if entries is None:
+        return _sweep_loopback(sweep_ports, banner_timeout)
+
+    for entry in entries:
+        entry.update(service=PORT_NAMES.get(entry["port"], "unknown"), version=None, banner="")
+    tcp = [e for e in entries if e["protocol"].startswith("tcp")]
+    for entry, result in zip(tcp, asyncio.run(_grab_banners(tcp, banner_timeout))):
+        if result:
+            entry.update(service=result["service"], version=result["version"], banner=result["banner"])
+    return entries
@@ -0,0 +1,180 @@
+"""
+Columnar process snapshots.
+
+A ProcessTable holds one row per process in parallel columns: arrays for
+pid, ppid, create_time and uid, lists of interned strings for name, exe,
+cmdline, username and status. A process is identified across snapshots by
+(pid, create_time), so a reused pid is a new process.
+
+ProcessSampler takes successive snapshots. On Linux a refresh reads only
+/proc/<pid>/stat for each process and copies the other columns from the
+previous snapshot when (pid, create_time) and the command name are
+unchanged. psutil (one oneshot() per process) is only queried for new
+processes or after an exec. Elsewhere every snapshot goes through
+psutil.process_iter.
+"""
+import os
+import sys
+from array import array
+
+import psutil
+
+# Columns of ProcessTable.records(), in output order
+PROCESS_ATTRS = ["pid", "ppid", "name", "exe", "cmdline", "username", "status", "create_time"]
+
+_PSUTIL_ATTRS = ["pid", "ppid", "name", "exe", "cmdline", "uids", "username", "status", "create_time"]
+
+# /proc/<pid>/stat state → psutil status
+_STATES = {
+    "R": psutil.STATUS_RUNNING,
+    "S": psutil.STATUS_SLEEPING,
+    "D": psutil.STATUS_DISK_SLEEP,
+    "Z": psutil.STATUS_ZOMBIE,
+    "T": psutil.STATUS_STOPPED,
+    "t": psutil.STATUS_TRACING_STOP,
+    "X": psutil.STATUS_DEAD,
+    "I": psutil.STATUS_IDLE,
+    "P": psutil.STATUS_PARKED,
+}
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+class ProcessTable:
+    def __init__(self):
+        self.pids = array("i")
+        self.ppids = array("i")
+        self.create_times = array("d")
+        self.uids = array("i")
+        self.names = []
+        self.exes = []
+        self.cmdlines = []
+        self.usernames = []
+        self.statuses = []
+        self._comms = []  # command name as in /proc/<pid>/stat, to detect exec
+        self._rows = None
+
+    def __len__(self):
+        return len(self.pids)
+
+    def append(self, pid, ppid, create_time, uid, name, exe, cmdline, username, status, comm=""):
+        self.pids.append(pid)
+        self.ppids.append(ppid)
+        self.create_times.append(create_time)
+        self.uids.append(uid)
+        self.names.append(_intern(name))
+        self.exes.append(_intern(exe))
+        self.cmdlines.append(_intern(cmdline))
+        self.usernames.append(_intern(username))
+        self.statuses.append(_intern(status))
+        self._comms.append(comm)
+        self._rows = None
+
+    def keys(self):
+        """(pid, create_time) of every row."""
+        return list(zip(self.pids, self.create_times))
+
+    def row(self, key):
+        """Row index of a (pid, create_time) key, or None."""
+        if self._rows is None:
+            self._rows = dict(zip(self.keys(), range(len(self))))
+        return self._rows.get(key)
+
+    def records(self, rows=None):
+        """Rows as dicts with the PROCESS_ATTRS fields (None for fields psutil could not read)."""
+        rows = range(len(self)) if rows is None else rows
+        return [
+            {
+                "pid": self.pids[i],
+                "ppid": self.ppids[i],
+                "name": self.names[i],
+                "exe": self.exes[i],
+                "cmdline": self.cmdlines[i],
+                "username": self.usernames[i],
+                "status": self.statuses[i],
+                "create_time": self.create_times[i],
+            }
+            for i in rows
+        ]
+
+
+def diff(before, after):
+    """(rows of after that are new processes, rows of before that exited)."""
+    old_keys, new_keys = set(before.keys()), set(after.keys())
+    forked, exited = new_keys - old_keys, old_keys - new_keys
+    return sorted(after.row(k) for k in forked), sorted(before.row(k) for k in exited)
+
+
+class ProcessSampler:
+    def __init__(self, proc="/proc"):
+        self.proc = proc
+        self.latest = None
+        self.refreshed = 0  # processes read through psutil by the last snapshot
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._boot_time = None
+        self._fast = sys.platform.startswith("linux") and os.path.isdir(proc)
+
+    def sample(self):
+        """Take a snapshot and keep it as the previous one of the next call."""
+        table = self._sample_proc() if self._fast else self._sample_psutil()
+        self.latest = table
+        return table
+
+    def _sample_psutil(self):
+        table = ProcessTable()
+        for proc in psutil.process_iter(_PSUTIL_ATTRS, ad_value=None):
+            self._append_info(table, proc.info)
+        self.refreshed = len(table)
+        return table
+
+    @staticmethod
+    def _append_info(table, info, create_time=None, comm=""):
+        uids = info.get("uids")
+        table.append(
+            info["pid"], info.get("ppid") or 0,
+            create_time if create_time is not None else info.get("create_time") or 0.0,
+            uids.real if uids else -1,
+            info.get("name"), info.get("exe"), " ".join(info.get("cmdline") or []),
+            info.get("username"), info.get("status"), comm,
+        )
+
+    def _sample_proc(self):
+        if self._boot_time is None:
+            self._boot_time = psutil.boot_time()
+        previous = self.latest
+        table = ProcessTable()
+        refreshed = 0
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"{self.proc}/{entry}/stat", "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue  # exited meanwhile
+            # "pid (comm) state ppid ... starttime" where comm may hold spaces and parentheses
+            head, _, rest = stat.rpartition(b")")
+            comm = head.partition(b"(")[2].decode("utf-8", "replace")
+            fields = rest.split()
+            pid, state, ppid = int(entry), fields[0].decode(), int(fields[1])
+            create_time = self._boot_time + int(fields[19]) / self._clock_ticks
+
+            row = previous.row((pid, create_time)) if previous is not None else None
+            if row is not None and previous._comms[row] == comm:
+                table.append(pid, ppid, create_time, previous.uids[row], previous.names[row], previous.exes[row],
+                             previous.cmdlines[row], previous.usernames[row], _STATES.get(state, state), comm)
+                continue
+
+            try:
+                process = psutil.Process(pid)
+                with process.oneshot():
+                    info = process.as_dict(["name", "exe", "cmdline", "uids", "username"], ad_value=None)
+            except psutil.NoSuchProcess:
+                continue
+            info.update(pid=pid, ppid=ppid, status=_STATES.get(state, state))
+            self._append_info(table, info, create_time, comm)
+            refreshed += 1
+        self.refreshed = refreshed
+        return table
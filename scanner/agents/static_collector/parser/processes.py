@@ -0,0 +1,10 @@
+"""Running processes via psutil."""
+from agents.static_collector.parser.process_table import PROCESS_ATTRS, ProcessSampler  # noqa: F401
+
+# Shared by successive probe runs so refreshes only query new processes
+SAMPLER = ProcessSampler()
+
+
+def collect_processes():
+    """One dict per running process; fields psutil cannot read are None."""
+    return SAMPLER.sample().records()
@@ -0,0 +1,31 @@
+"""Systemd services and auto-start units, parsed from the unit files."""
+from agents.static_collector.parser.systemd_units import (
+    DEFAULT_CACHE, UnitCache, UnitInventory, autostart_records, runtime_states, service_records,
+)
+
+# Shared by successive probe runs so rescans only stat unchanged directories
+_CACHES = {}
+
+
+def _inventory(cache_path, root=""):
+    cache = _CACHES.get(cache_path)
+    if cache is None:
+        cache = _CACHES[cache_path] = UnitCache(cache_path)
+    inventory = UnitInventory(cache, root)
+    return inventory, cache
+
+
+def collect_services(cache_path=DEFAULT_CACHE, root=""):
+    """Service units: unit file state (enabled/disabled/...), load/active/sub state, command and user."""
+    inventory, cache = _inventory(cache_path, root)
+    records = service_records(inventory, runtime_states() if not root else None)
+    cache.save()
+    return records
+
+
+def collect_autostart(cache_path=DEFAULT_CACHE, root=""):
+    """Services, timers, sockets and paths started at boot, with the command they run."""
+    inventory, cache = _inventory(cache_path, root)
+    records = autostart_records(inventory)
+    cache.save()
+    return records
@@ -0,0 +1,360 @@
+"""
+Systemd units from their unit files, without one systemctl call per unit.
+
+The unit search paths are read in one pass: unit files, their drop-ins
+(``<unit>.d/*.conf``, template and type-wide ``<type>.d``), alias and
+mask symlinks, and the ``.wants``/``.requires`` links that record which
+units are enabled. Directory listings are cached by directory mtime and
+parsed files by (mtime, size) in data/cache/systemd_units.json, so a
+rescan of an unchanged system only stats the directories and files.
+
+Runtime state (load/active/sub) needs the running manager: it comes from
+a single ``systemctl list-units`` call for all units.
+"""
+import json
+import os
+
+from agents.static_collector.utils.commands import run_command
+
+DEFAULT_CACHE = "data/cache/systemd_units.json"
+CACHE_VERSION = 2
+
+# System unit search paths, highest priority first (systemd.unit(5))
+UNIT_PATHS = (
+    "/etc/systemd/system.control",
+    "/run/systemd/system.control",
+    "/run/systemd/transient",
+    "/run/systemd/generator.early",
+    "/etc/systemd/system",
+    "/etc/systemd/system.attached",
+    "/run/systemd/system",
+    "/run/systemd/system.attached",
+    "/run/systemd/generator",
+    "/usr/local/lib/systemd/system",
+    "/usr/lib/systemd/system",
+    "/lib/systemd/system",
+    "/run/systemd/generator.late",
+)
+# Units whose links in these paths mean enabled (the rest are vendor links: static wants)
+_ENABLED_PATHS = ("/etc/systemd/system", "/etc/systemd/system.attached")
+_RUNTIME_PATHS = ("/run/systemd/system", "/run/systemd/system.attached")
+_GENERATOR_PATHS = ("/run/systemd/generator.early", "/run/systemd/generator", "/run/systemd/generator.late")
+_TRANSIENT_PATHS = ("/run/systemd/transient",)
+
+UNIT_TYPES = (".service", ".socket", ".timer", ".path")
+# Unit file states counted as starting at boot
+AUTOSTART_STATES = ("enabled", "enabled-runtime", "generated", "transient")
+
+_LINK_DIRS = (".wants", ".requires", ".upholds")
+
+
+def parse_unit(text):
+    """{section: {key: [values]}} of a unit file.
+
+    An empty assignment resets a key: its list restarts with a None marker,
+    so that a drop-in's reset also clears the values of the unit it extends.
+    """
+    sections = {}
+    current = None
+    pending = ""
+    for line in text.splitlines():
+        if pending:
+            line = pending + " " + line.lstrip()
+            pending = ""
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if stripped.endswith("\\"):
+            pending = stripped[:-1].rstrip()
+            continue
+        if stripped[0] == "[" and stripped[-1] == "]":
+            current = sections.setdefault(stripped[1:-1], {})
+            continue
+        key, sep, value = stripped.partition("=")
+        if not sep or current is None:
+            continue
+        key, value = key.strip(), value.strip()
+        if value:
+            current.setdefault(key, []).append(value)
+        else:
+            current[key] = [None]
+    return sections
+
+
+def merge_units(base, drop_in):
+    """Unit sections with a drop-in applied (values append, a reset marker clears first)."""
+    merged = {section: {k: [v for v in values if v is not None] for k, values in keys.items()}
+              for section, keys in base.items()}
+    for section, keys in drop_in.items():
+        target = merged.setdefault(section, {})
+        for key, values in keys.items():
+            if values and values[0] is None:
+                target[key] = values[1:]
+            else:
+                target[key] = target.get(key, []) + values
+    return merged
+
+
+class UnitCache:
+    """Directory listings by mtime and parsed unit files by (mtime, size), persisted as JSON."""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                raise ValueError("stale cache format")
+            self.dirs, self.files = data["dirs"], data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.dirs, self.files = {}, {}
+        self.dirty = False
+        self.hits = self.misses = 0
+
+    def listing(self, path):
+        """[(name, is directory, symlink target or None)] of a directory ([] if missing)."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            if self.dirs.pop(path, None) is not None:
+                self.dirty = True
+            return []
+        cached = self.dirs.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                link = os.readlink(entry.path) if entry.is_symlink() else None
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((entry.name, is_dir, link))
+        entries.sort()
+        self.dirs[path] = [mtime, entries]
+        self.dirty = True
+        return entries
+
+    def unit(self, path):
+        """Parsed sections of a unit file or drop-in ({} if unreadable)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return {}
+        cached = self.files.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self.hits += 1
+            return cached[2]
+        self.misses += 1
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                sections = parse_unit(f.read())
+        except OSError:
+            sections = {}
+        self.files[path] = [st.st_mtime_ns, st.st_size, sections]
+        self.dirty = True
+        return sections
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Forget files that are no longer listed anywhere
+        listed = {os.path.join(d, name) for d, (_, entries) in self.dirs.items() for name, _, _ in entries}
+        self.files = {p: v for p, v in self.files.items() if p in listed}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "dirs": self.dirs, "files": self.files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _template(name):
+    """foo@bar.service → foo@.service (None if not an instance)."""
+    prefix, at, rest = name.partition("@")
+    if not at or rest.startswith("."):
+        return None
+    return f"{prefix}@{rest[rest.rfind('.'):]}" if "." in rest else None
+
+
+class UnitInventory:
+    """Unit files, drop-ins and enablement links of one scan of the search paths."""
+
+    def __init__(self, cache=None, root="", paths=UNIT_PATHS):
+        self.cache = cache if cache is not None else UnitCache()
+        self.root = root.rstrip("/")
+        self.paths = self._distinct(paths)
+        self.fragments = {}  # unit name → (search path, file path, symlink target or None)
+        self.drop_in_dirs = {}  # "<unit>.d" → [directory] in priority order
+        self.links = {}  # unit name → [(search path, target unit, kind)]
+        self.aliases = {}  # unit name → names that are symlinks to it
+        self._scan()
+
+    def _distinct(self, paths):
+        # /lib is usually a symlink to /usr/lib: read each real directory once
+        seen, distinct = set(), []
+        for path in paths:
+            real = os.path.realpath(self.root + path)
+            if real not in seen:
+                seen.add(real)
+                distinct.append(path)
+        return distinct
+
+    def _scan(self):
+        for search_path in self.paths:
+            directory = self.root + search_path
+            for name, is_dir, link in self.cache.listing(directory):
+                if is_dir:
+                    if name.endswith(".d"):
+                        self.drop_in_dirs.setdefault(name, []).append(directory)
+                    elif name.endswith(_LINK_DIRS):
+                        target, _, kind = name.rpartition(".")
+                        for unit, _, _ in self.cache.listing(os.path.join(directory, name)):
+                            self.links.setdefault(unit, []).append((search_path, target, kind))
+                    continue
+                if name not in self.fragments:
+                    self.fragments[name] = (search_path, os.path.join(directory, name), link)
+                if link and os.path.basename(link) != name and not link.endswith("/dev/null"):
+                    self.aliases.setdefault(os.path.basename(link), []).append(name)
+
+    def names(self, types=UNIT_TYPES):
+        """Unit names with a unit file (templates excluded) plus enabled template instances."""
+        names = {n for n in self.fragments if n.endswith(types) and not n.endswith(tuple("@" + t for t in types))}
+        names.update(n for n in self.links if n.endswith(types) and _template(n))
+        return sorted(names)
+
+    def fragment(self, name):
+        """(search path, file path, symlink target) of a unit or of its template."""
+        return self.fragments.get(name) or self.fragments.get(_template(name) or "")
+
+    def drop_ins(self, name):
+        """Drop-in files applying to a unit, in application order (by file name)."""
+        suffix = name[name.rfind("."):]
+        levels = [f"{suffix[1:]}.d"]  # type-wide, e.g. service.d
+        template = _template(name)
+        if template:
+            levels.append(f"{template}.d")
+        levels.append(f"{name}.d")
+        chosen = {}
+        for level in levels:  # more specific levels override a file of the same name
+            for directory in reversed(self.drop_in_dirs.get(level, [])):  # higher priority wins
+                for conf, is_dir, _ in self.cache.listing(os.path.join(directory, level)):
+                    if conf.endswith(".conf") and not is_dir:
+                        chosen[conf] = os.path.join(directory, level, conf)
+        return [chosen[conf] for conf in sorted(chosen)]
+
+    def sections(self, name):
+        """Unit file sections with its drop-ins applied, and the drop-in paths."""
+        fragment = self.fragment(name)
+        if fragment and fragment[2] and fragment[2].endswith("/dev/null"):
+            return {}, []  # masked
+        sections = merge_units(self.cache.unit(fragment[1]) if fragment else {}, {})
+        drop_ins = self.drop_ins(name)
+        for path in drop_ins:
+            sections = merge_units(sections, self.cache.unit(path))
+        return sections, drop_ins
+
+    def state(self, name, sections):
+        """Unit file state as systemctl is-enabled reports it."""
+        fragment = self.fragment(name)
+        if fragment is None:
+            return "not-found"
+        search_path, _, link = fragment
+        if link and link.endswith("/dev/null"):
+            return "masked"
+        if search_path in _TRANSIENT_PATHS:
+            return "transient"
+        if search_path in _GENERATOR_PATHS:
+            return "generated"
+        if link and os.path.basename(link) != name and not _template(name):
+            return "alias"
+        link_paths = {path for path, _, _ in self.links.get(name, ())}
+        for alias in self.aliases.get(name, ()):
+            if self.fragments[alias][0] in _ENABLED_PATHS + _RUNTIME_PATHS:
+                link_paths.add(self.fragments[alias][0])
+        if link_paths & set(_ENABLED_PATHS):
+            return "enabled"
+        if link_paths & set(_RUNTIME_PATHS):
+            return "enabled-runtime"
+        install = sections.get("Install", {})
+        if not any(install.get(k) for k in ("WantedBy", "RequiredBy", "UpheldBy", "Alias", "Also")):
+            return "static"
+        if not any(install.get(k) for k in ("WantedBy", "RequiredBy", "UpheldBy", "Alias")):
+            return "indirect"
+        return "disabled"
+
+    def wanted_by(self, name):
+        """Targets/units that pull the unit in through .wants/.requires links."""
+        return sorted({target for _, target, _ in self.links.get(name, ())})
+
+
+def _first(sections, section, key):
+    values = sections.get(section, {}).get(key)
+    return values[-1] if values else None
+
+
+def runtime_states():
+    """{unit: (load, active, sub, description)} from one systemctl call ({} without systemd)."""
+    output = run_command(["systemctl", "list-units", "--type=service,socket,timer,path", "--all",
+                          "--no-legend", "--plain", "--no-pager"])
+    states = {}
+    for line in output.splitlines():
+        fields = line.split(None, 4)
+        if len(fields) >= 4:
+            states[fields[0]] = (fields[1], fields[2], fields[3], fields[4] if len(fields) > 4 else "")
+    return states
+
+
+def service_records(inventory, runtime=None):
+    """One dict per service unit: file state, runtime state, command and dependencies."""
+    runtime = runtime or {}
+    records = []
+    for name in sorted(set(inventory.names((".service",))) | {n for n in runtime if n.endswith(".service")}):
+        sections, drop_ins = inventory.sections(name)
+        state = inventory.state(name, sections)
+        load, active, sub, description = runtime.get(name, (None, None, None, None))
+        fragment = inventory.fragment(name)
+        records.append({
+            "name": name,
+            "description": _first(sections, "Unit", "Description") or description or "",
+            "load": load or ("masked" if state == "masked" else "loaded" if fragment else "not-found"),
+            "active": active,
+            "sub": sub,
+            "enabled": state,
+            "path": fragment[1][len(inventory.root):] if fragment else None,
+            "drop_ins": [p[len(inventory.root):] for p in drop_ins],
+            "type": _first(sections, "Service", "Type") or "simple",
+            "exec_start": _first(sections, "Service", "ExecStart"),
+            "user": _first(sections, "Service", "User"),
+            "wanted_by": inventory.wanted_by(name),
+        })
+    return records
+
+
+def autostart_records(inventory):
+    """Units started at boot (enabled/generated services, timers, sockets and paths) and what they run."""
+    records = []
+    for name in inventory.names():
+        sections, _ = inventory.sections(name)
+        state = inventory.state(name, sections)
+        if state not in AUTOSTART_STATES:
+            continue
+        kind = name[name.rfind(".") + 1:]
+        activates = name
+        if kind != "service":
+            section = kind.capitalize()
+            activates = _first(sections, section, "Unit") or name[:name.rfind(".")] + ".service"
+            if kind == "socket" and _first(sections, "Socket", "Accept") in ("yes", "true", "1"):
+                activates = name[:name.rfind(".")] + "@.service"
+        service, _ = inventory.sections(activates) if activates != name else (sections, None)
+        records.append({
+            "name": name,
+            "type": kind,
+            "enabled": state,
+            "wanted_by": inventory.wanted_by(name),
+            "activates": activates,
+            "command": _first(service, "Service", "ExecStart"),
+            "user": _first(service, "Service", "User"),
+        })
+    return records
@@ -0,0 +1,50 @@
+"""
+Exposed services sweep of a target host.
+
+Connects to every port of the range (asyncio, bounded concurrency) and
+fingerprints the protocol and version of open ports from their banner.
+
+Run from the scanner directory:
+    python agents/static_collector/service_scan.py 192.0.2.10
+    python agents/static_collector/service_scan.py 192.0.2.10 --ports 1-1024,8080 -o services.yml
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agents.static_collector.exporter.yaml_exporter import dump_yaml  # noqa: E402
+from agents.static_collector.parser.port_scan import (  # noqa: E402
+    BANNER_TIMEOUT, CONCURRENCY, CONNECT_TIMEOUT, parse_ports, scan_host,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep the TCP ports of a host and fingerprint its services")
+    parser.add_argument("host", help="target host name or address")
+    parser.add_argument("--ports", default="1-65535", help='ports to try, e.g. "22,80,8000-8100"')
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="connections in flight")
+    parser.add_argument("--timeout", type=float, default=CONNECT_TIMEOUT, help="connect timeout in seconds")
+    parser.add_argument("--banner-timeout", type=float, default=BANNER_TIMEOUT, help="banner wait in seconds (0: none)")
+    parser.add_argument("-o", "--output", default="-", help="output YAML file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    ports = parse_ports(args.ports)
+    started = time.perf_counter()
+    services = scan_host(args.host, ports, concurrency=args.concurrency, timeout=args.timeout,
+                         banner_timeout=args.banner_timeout)
+    print(f"{len(ports)} port(s) of {args.host} swept in {time.perf_counter() - started:.2f}s, "
+          f"{len(services)} open", file=sys.stderr)
+
+    document = dump_yaml({"host": args.host, "ports": [{"protocol": "tcp", "address": args.host, **s} for s in services]})
+    if args.output == "-":
+        sys.stdout.buffer.write(document)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Static collector entrypoint.
+
+Collects OS metadata, processes, services and auto-start units, exposed
+ports, packages and the permissions of sensitive files and writes them to data/output/static.yml (plus its
+offset index).
+
+Run from the scanner directory:
+    python agents/static_collector/static_collector.py
+
+With --watch the probes keep running under an adaptive scheduler that
+stays within the --max-cpu / --max-rss budget, rewriting the output after
+every round. The scheduler metrics go to the "collector" section and the
+process tree goes to "process_edges" as provenance-graph edges. With
+--graph, the edges not seen in the previous round are also appended to
+the segmented graph store (storage/graph_store.py).
+"""
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from agents.common.scheduler import AdaptiveScheduler, Budget  # noqa: E402
+from agents.static_collector.exporter.yaml_exporter import dump_yaml, export_yaml  # noqa: E402
+from agents.static_collector.parser.filesystem import collect_files  # noqa: E402
+from agents.static_collector.parser.os_info import collect_os_metadata  # noqa: E402
+from agents.static_collector.parser.packages import collect_packages  # noqa: E402
+from agents.static_collector.parser.ports import collect_ports  # noqa: E402
+from agents.static_collector.parser.processes import SAMPLER, collect_processes  # noqa: E402
+from agents.static_collector.parser.services import collect_autostart, collect_services  # noqa: E402
+from graphs.process_tree import process_edges  # noqa: E402
+from storage.graph_store import GraphStore  # noqa: E402
+
+DEFAULT_OUTPUT = "data/output/static.yml"
+
+# First parent seen per live process, shared by successive snapshots
+PARENTS = {}
+
+
+# Probe → (function, base interval in seconds, priority: higher runs first and is throttled last)
+PROBES = {
+    "os": (collect_os_metadata, 3600, 3),
+    "processes": (collect_processes, 60, 2),
+    "services": (collect_services, 300, 1),
+    "autostart": (collect_autostart, 300, 1),
+    "ports": (collect_ports, 300, 1),
+    "packages": (collect_packages, 3600, 0),
+    "files": (collect_files, 3600, 0),
+}
+
+
+def build_scheduler(budget=None):
+    scheduler = AdaptiveScheduler(budget)
+    for name, (func, interval, priority) in PROBES.items():
+        scheduler.add_probe(name, func, interval, priority)
+    return scheduler
+
+
+def snapshot(sections, scheduler):
+    """Output document from the latest result of every probe."""
+    os_metadata = sections.get("os") or {}
+    return {
+        "host": os_metadata.get("hostname", ""),
+        "collected_at": datetime.now(timezone.utc).isoformat(),
+        **{name: sections.get(name) for name in PROBES},
+        "process_edges": process_edges(SAMPLER.latest, PARENTS) if SAMPLER.latest is not None else [],
+        "collector": scheduler.metrics(),
+    }
+
+
+def collect(scheduler=None):
+    """Run every static probe once and return the output document."""
+    scheduler = scheduler or build_scheduler()
+    return snapshot(scheduler.run_once(force=True), scheduler)
+
+
+def append_edges(store, document, written):
+    """Append the edges of processes not seen in the previous snapshot; return how many.
+
+    ``written`` holds the child nodes of the previous snapshot: a process
+    has one "spawned" edge, stored when it first appears.
+    """
+    edges = document["process_edges"]
+    if not written and edges:
+        # First round: skip the children an earlier run already stored (same start time)
+        times = sorted({e["ts"] for e in edges})
+        written.update(e["target"] for e in store.query(times[0], times[-1]).edges(times))
+    new = [e for e in edges if e["target"] not in written]
+    written.clear()
+    written.update(e["target"] for e in edges)
+    store.append(new)
+    return len(new)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect static system information")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="output YAML file, or - for stdout")
+    parser.add_argument("--watch", action="store_true", help="keep collecting under the resource budget")
+    parser.add_argument("--max-cpu", type=float, default=1.0, help="CPU budget in percent of one core")
+    parser.add_argument("--max-rss", type=float, default=50.0, help="RSS budget in MB")
+    parser.add_argument("--max-io", type=float, default=None, help="I/O budget in KB/s")
+    parser.add_argument("--graph", help="graph store directory to append the process edges to")
+    args = parser.parse_args(argv)
+
+    scheduler = build_scheduler(Budget(args.max_cpu, args.max_rss, args.max_io))
+    sections = scheduler.run_once(force=True)
+    if args.output == "-":
+        sys.stdout.buffer.write(dump_yaml(snapshot(sections, scheduler)))
+        return
+
+    document = snapshot(sections, scheduler)
+    path = export_yaml(document, args.output)
+    print(f"Static snapshot written to {path}")
+
+    store = GraphStore(args.graph, writable=True) if args.graph else None
+    written = set()
+    if store:
+        count = append_edges(store, document, written)
+        print(f"{count} edge(s) appended to {args.graph}")
+
+    if args.watch:
+        def on_results(results):
+            sections.update(results)
+            document = snapshot(sections, scheduler)
+            export_yaml(document, args.output)
+            if store:
+                append_edges(store, document, written)
+
+        if store:
+            store.start_merger()
+        try:
+            scheduler.run(on_results)
+        except KeyboardInterrupt:
+            pass
+
+    if store:
+        store.compact()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Helpers for running system commands."""
+import shutil
+import subprocess
+
+
+def run_command(args, timeout=30):
+    """Run a command and return its stdout, or "" if it is missing or fails."""
+    if shutil.which(args[0]) is None:
+        return ""
+    try:
+        result = subprocess.run(args, capture_output=True, text=True, timeout=timeout, check=False)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout if result.returncode == 0 else ""
@@ -0,0 +1,74 @@
+"""
+Alert report entrypoint.
+
+Replays dynamic collector events (NDJSON) through the alert rules and
+writes the fired alerts and/or dashboard item updates. Run from the
+scanner directory:
+    python analysis/alert_report.py data/output/events.ndjson --updates alerts_items.ndjson
+    python analysis/alert_report.py events.ndjson --rules my_rules.yml --alerts alerts.ndjson
+
+Events are timed by their "ts" field or their log timestamp, so windows
+apply to when things happened, not to when the file is replayed.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.alerting import DEFAULT_RULES, RuleEngine, to_item_updates  # noqa: E402
+from analysis.dashboard_feed import write_updates  # noqa: E402
+from analysis.vulnerabilities import RISK_LEVELS  # noqa: E402
+
+BATCH_LINES = 65536
+
+
+def read_events(path):
+    """Yield batches of events of an NDJSON file."""
+    with open(path, encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+                if len(batch) >= BATCH_LINES:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate alert rules over collected events")
+    parser.add_argument("events", nargs="+", help="NDJSON event files (dynamic collector output)")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="alert rules YAML")
+    parser.add_argument("--year", type=int, help="year of syslog timestamps (default: current year)")
+    parser.add_argument("--alerts", help="write the fired alerts (NDJSON) to this file")
+    parser.add_argument("--updates", help="write dashboard item updates (NDJSON) to this file")
+    args = parser.parse_args(argv)
+
+    engine = RuleEngine.from_yaml(args.rules)
+    started = time.perf_counter()
+    alerts = []
+    for path in args.events:
+        for batch in read_events(path):
+            alerts += engine.process_batch(batch, year=args.year)
+    elapsed = time.perf_counter() - started
+
+    print(f"{engine.events} event(s) through {len(engine.rules)} rule(s) in {elapsed:.2f}s")
+    counts = {level: sum(1 for a in alerts if a.severity == level) for level in RISK_LEVELS}
+    print(f"{len(alerts)} alert(s): " + ", ".join(f"{n} {level.lower()}" for level, n in counts.items()))
+
+    if args.alerts:
+        with open(args.alerts, "w", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(asdict(alert)) + "\n")
+    if args.updates:
+        count = write_updates(to_item_updates(alerts, engine.rules), args.updates)
+        print(f"{count} item update(s) written to {args.updates}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Rule engine over the collector event stream.
+
+Rules are declarative (YAML): an event type, predicates on event fields,
+and optionally a threshold of matching events within a sliding window per
+key. They are compiled once:
+
+- predicates become one Python expression per rule (compiled with
+  ``compile``), so evaluating a rule is a single function call;
+- rules go into a dispatch table by event type, and rules with an
+  equality predicate are further indexed by (field, value), so an event
+  only reaches the rules that can match it;
+- windowed counts use a ring of time buckets per key (WindowCounter),
+  updated in O(1) amortized per event.
+
+Fired alerts are turned into dashboard item updates with Risk Level.
+"""
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+
+import yaml
+
+from analysis.dashboard_feed import SPEC_ITEMS, item_update
+from analysis.vulnerabilities import RISK_LEVELS
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alert_rules.yml")
+# Number of buckets a rule window is divided into
+WINDOW_BUCKETS = 10
+
+_OPERATORS = {
+    "eq": "{v} == {c}",
+    "ne": "{v} != {c}",
+    "gt": "{n} > {c}",
+    "ge": "{n} >= {c}",
+    "lt": "{n} < {c}",
+    "le": "{n} <= {c}",
+    "in": "{v} in {c}",
+    "not_in": "{v} not in {c}",
+    "contains": "{c} in ({v} or '')",
+    "startswith": "({v} or '').startswith({c})",
+    "regex": "{c}.search({v} or '') is not None",
+    "exists": "({v} is not None) == {c}",
+}
+
+
+class RuleError(ValueError):
+    pass
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")  # every comparison with NaN is False
+
+
+@lru_cache(maxsize=65536)
+def _parse_time(text, year):
+    for fmt in ("%b %d %H:%M:%S", "%d/%b/%Y:%H:%M:%S %z"):
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(year=year)  # syslog lines carry no year
+        return parsed.timestamp()
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def event_time(event, year=None):
+    """Epoch seconds of an event: its "ts" field, else its log "time" (None if neither)."""
+    timestamp = event.get("ts")
+    if timestamp is not None:
+        return timestamp
+    text = event.get("time")
+    if not text:
+        return None
+    return _parse_time(" ".join(text.split()), year or datetime.now().year)
+
+
+@dataclass
+class Rule:
+    id: str
+    event: str
+    description: str = ""
+    where: dict = field(default_factory=dict)
+    group_by: tuple = ()
+    window: float = 0
+    threshold: int = 1
+    cooldown: float = 0
+    severity: str = "Medium"
+    item: str = None
+
+    @classmethod
+    def from_dict(cls, data):
+        if "id" not in data or "event" not in data:
+            raise RuleError(f"Rule needs an id and an event type: {data}")
+        group_by = data.get("group_by") or ()
+        severity = str(data.get("severity", "Medium")).capitalize()
+        if severity not in RISK_LEVELS:
+            raise RuleError(f"Rule {data['id']}: unknown severity {severity}")
+        window = float(data.get("window", 0))
+        threshold = int(data.get("threshold", 1))
+        if threshold < 1:
+            raise RuleError(f"Rule {data['id']}: threshold must be at least 1")
+        if threshold > 1 and window <= 0:
+            raise RuleError(f"Rule {data['id']}: a threshold of {threshold} needs a window")
+        item = data.get("item")
+        if item is not None and item not in SPEC_ITEMS:
+            raise RuleError(f"Rule {data['id']}: unknown dashboard item {item}")
+        return cls(
+            id=data["id"],
+            event=data["event"],
+            description=data.get("description", ""),
+            where=data.get("where") or {},
+            group_by=(group_by,) if isinstance(group_by, str) else tuple(group_by),
+            window=window,
+            threshold=threshold,
+            cooldown=float(data.get("cooldown", window)),
+            severity=severity,
+            item=item,
+        )
+
+    def predicates(self):
+        """(field, operator, value) of every predicate."""
+        for name, condition in self.where.items():
+            if isinstance(condition, dict):
+                for op, value in condition.items():
+                    if op not in _OPERATORS:
+                        raise RuleError(f"Rule {self.id}: unknown operator {op}")
+                    yield name, op, value
+            elif isinstance(condition, list):
+                yield name, "in", condition
+            else:
+                yield name, "eq", condition
+
+
+class WindowCounter:
+    """Events per key over a sliding window, in WINDOW_BUCKETS time buckets."""
+
+    def __init__(self, window, buckets=WINDOW_BUCKETS):
+        self.buckets = max(1, int(buckets))
+        self.width = max(window / self.buckets, 1e-3)
+        self._keys = {}  # key → [total, last bucket, counts]
+
+    def add(self, key, timestamp):
+        """Count one event and return the total of the key's window."""
+        bucket = int(timestamp // self.width)
+        state = self._keys.get(key)
+        if state is None:
+            counts = [0] * self.buckets
+            counts[bucket % self.buckets] = 1
+            self._keys[key] = [1, bucket, counts]
+            return 1
+
+        total, last, counts = state
+        if bucket != last:
+            if bucket > last:
+                # Expire the buckets the window moved past
+                for b in range(last + 1, min(bucket, last + self.buckets) + 1):
+                    total -= counts[b % self.buckets]
+                    counts[b % self.buckets] = 0
+                state[1] = bucket
+            elif bucket <= last - self.buckets:
+                return total  # older than the window
+        counts[bucket % self.buckets] += 1
+        state[0] = total + 1
+        return total + 1
+
+    def reset(self, key):
+        self._keys.pop(key, None)
+
+    def prune(self, now):
+        """Drop the keys without events in the window."""
+        bucket = int(now // self.width)
+        for key in [k for k, (_, last, _) in self._keys.items() if last <= bucket - self.buckets]:
+            del self._keys[key]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+@dataclass
+class Alert:
+    rule: str
+    severity: str
+    key: tuple
+    count: int
+    timestamp: float
+    event: dict
+    item: str = None
+    description: str = ""
+
+
+class _CompiledRule:
+    __slots__ = ("rule", "match", "counter", "last_fired", "key_fields")
+
+    def __init__(self, rule, match):
+        self.rule = rule
+        self.match = match
+        self.counter = WindowCounter(rule.window) if rule.window and rule.threshold > 1 else None
+        self.last_fired = {}
+        self.key_fields = rule.group_by
+
+
+def _compile_predicates(rule, skip=None):
+    """One function evaluating every predicate of a rule (except the indexed one)."""
+    constants, terms = {}, []
+    for i, (name, op, value) in enumerate(rule.predicates()):
+        if (name, op, value) == skip:
+            continue
+        constant = f"_c{i}"
+        if op == "regex":
+            value = re.compile(value)
+        elif op in ("in", "not_in"):
+            value = frozenset(value)
+        elif op in ("gt", "ge", "lt", "le"):
+            value = float(value)
+        constants[constant] = value
+        getter = f"e.get({name!r})"
+        terms.append("(" + _OPERATORS[op].format(v=getter, n=f"_number({getter})", c=constant) + ")")
+    if not terms:
+        return None
+    source = f"lambda e: {' and '.join(terms)}"
+    return eval(compile(source, f"<rule {rule.id}>", "eval"), {"_number": _number, **constants})
+
+
+class RuleEngine:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.events = 0
+        self.alerts = 0
+        # event type → rules without an indexed predicate
+        self._any = {}
+        # event type → field → value → rules whose equality predicate on field is value
+        self._indexed = {}
+        for rule in self.rules:
+            equality = next(((n, op, v) for n, op, v in rule.predicates()
+                             if op == "eq" and isinstance(v, (str, int, float, bool))), None)
+            compiled = _CompiledRule(rule, _compile_predicates(rule, skip=equality))
+            if equality:
+                name, _, value = equality
+                (self._indexed.setdefault(rule.event, {}).setdefault(name, {})
+                 .setdefault(value, []).append(compiled))
+            else:
+                self._any.setdefault(rule.event, []).append(compiled)
+        # Flatten per event type for the hot path
+        self._dispatch = {
+            event: (tuple(self._any.get(event, ())), tuple(
+                (name, values) for name, values in self._indexed.get(event, {}).items()))
+            for event in set(self._any) | set(self._indexed)
+        }
+
+    @classmethod
+    def from_yaml(cls, path=DEFAULT_RULES):
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=Loader) or {}
+        return cls(Rule.from_dict(r) for r in data.get("rules", []))
+
+    def process(self, event, timestamp=None):
+        """Alerts fired by one event."""
+        self.events += 1
+        dispatch = self._dispatch.get(event.get("type"))
+        if dispatch is None:
+            return []
+        candidates, indexed = dispatch
+        for name, values in indexed:
+            matched = values.get(event.get(name))
+            if matched:
+                candidates = candidates + tuple(matched)
+        fired = []
+        for compiled in candidates:
+            if compiled.match is None or compiled.match(event):
+                alert = self._count(compiled, event, timestamp)
+                if alert:
+                    fired.append(alert)
+        return fired
+
+    def process_batch(self, events, timestamp=None, year=None):
+        """Alerts fired by a batch of events, timed by event_time (else timestamp, else now)."""
+        now = time.time() if timestamp is None else timestamp
+        process = self.process
+        alerts = []
+        for event in events:
+            fired = process(event, event_time(event, year) or now)
+            if fired:
+                alerts += fired
+        return alerts
+
+    def _count(self, compiled, event, timestamp):
+        rule = compiled.rule
+        key = tuple(event.get(f) for f in compiled.key_fields)
+        timestamp = time.time() if timestamp is None else timestamp
+        count = compiled.counter.add(key, timestamp) if compiled.counter is not None else 1
+        if count < rule.threshold:
+            return None
+        last = compiled.last_fired.get(key)
+        if last is not None and timestamp - last < rule.cooldown:
+            return None
+        compiled.last_fired[key] = timestamp
+        if compiled.counter is not None:
+            compiled.counter.reset(key)
+        self.alerts += 1
+        return Alert(rule.id, rule.severity, key, count, timestamp, event, rule.item, rule.description)
+
+    def prune(self, now=None):
+        """Forget idle window keys and expired cooldowns (call periodically)."""
+        now = time.time() if now is None else now
+        for compiled in (c for rules in self._any.values() for c in rules):
+            self._prune(compiled, now)
+        for fields in self._indexed.values():
+            for values in fields.values():
+                for rules in values.values():
+                    for compiled in rules:
+                        self._prune(compiled, now)
+
+    @staticmethod
+    def _prune(compiled, now):
+        if compiled.counter is not None:
+            compiled.counter.prune(now)
+        cooldown = compiled.rule.cooldown
+        compiled.last_fired = {k: t for k, t in compiled.last_fired.items() if now - t < cooldown}
+
+
+def to_item_updates(alerts, rules, max_notes=500):
+    """Dashboard item updates (with Risk Level) for the items the rules cover.
+
+    Items with alerts go to In Progress / In Review with the highest
+    severity as Risk Level; items whose rules fired nothing are Completed.
+    """
+    by_item = {}
+    for rule in rules:
+        if rule.item:
+            by_item.setdefault(rule.item, {})
+    for alert in alerts:
+        if alert.item:
+            by_item.setdefault(alert.item, {}).setdefault(alert.rule, []).append(alert)
+
+    rows = []
+    for item, fired in by_item.items():
+        if not fired:
+            rows.append(item_update(item, "Completed", "No alerts", risk="Low"))
+            continue
+        severities = {a.severity for alerts_ in fired.values() for a in alerts_}
+        risk = next(s for s in RISK_LEVELS if s in severities)
+        parts = []
+        for rule_id, rule_alerts in sorted(fired.items(), key=lambda kv: -len(kv[1])):
+            keys = sorted({", ".join(str(k) for k in a.key) for a in rule_alerts if a.key})
+            text = f"{rule_id}: {len(rule_alerts)} alert(s)"
+            if keys:
+                text += f" ({'; '.join(keys[:5])}{'…' if len(keys) > 5 else ''})"
+            parts.append(text)
+        text = "; ".join(parts)
+        text = text if len(text) <= max_notes else text[:max_notes - 1] + "…"
+        rows.append(item_update(item, "In Progress", f"Alerts: {text}", validation="In Review", risk=risk))
+
+    rows.append(item_update("alerting", "Completed", f"{len(rules)} alert rule(s) active, {len(alerts)} alert(s) fired"))
+    return rows
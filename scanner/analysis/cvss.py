@@ -0,0 +1,73 @@
+"""
+CVSS base scores from vector strings.
+
+OSV ``severity`` entries carry the vector ("CVSS:3.1/AV:N/AC:L/..."), not
+the score. base_score() computes the score of v3.x vectors (v3.1
+rounding) and of v2 vectors ("AV:N/AC:L/Au:N/..."); other strings give
+None.
+"""
+import math
+
+_V3_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "UI": {"N": 0.85, "R": 0.62},
+    "C": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "I": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "A": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+# Privileges Required weighs more when the scope changes
+_V3_PRIVILEGES = {"U": {"N": 0.85, "L": 0.62, "H": 0.27}, "C": {"N": 0.85, "L": 0.68, "H": 0.5}}
+
+_V2_WEIGHTS = {
+    "AV": {"L": 0.395, "A": 0.646, "N": 1.0},
+    "AC": {"H": 0.35, "M": 0.61, "L": 0.71},
+    "Au": {"M": 0.45, "S": 0.56, "N": 0.704},
+    "C": {"N": 0.0, "P": 0.275, "C": 0.660},
+    "I": {"N": 0.0, "P": 0.275, "C": 0.660},
+    "A": {"N": 0.0, "P": 0.275, "C": 0.660},
+}
+
+
+def _roundup(value):
+    # CVSS 3.1 Roundup: smallest one-decimal number >= value, without float noise
+    scaled = round(value * 100000)
+    return scaled / 100000 if scaled % 10000 == 0 else (math.floor(scaled / 10000) + 1) / 10
+
+
+def _v3(metrics):
+    scope = metrics["S"]
+    w = {name: _V3_WEIGHTS[name][metrics[name]] for name in _V3_WEIGHTS}
+    iss = 1 - (1 - w["C"]) * (1 - w["I"]) * (1 - w["A"])
+    if scope == "U":
+        impact = 6.42 * iss
+    else:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    if impact <= 0:
+        return 0.0
+    exploitability = 8.22 * w["AV"] * w["AC"] * _V3_PRIVILEGES[scope][metrics["PR"]] * w["UI"]
+    total = impact + exploitability if scope == "U" else 1.08 * (impact + exploitability)
+    return _roundup(min(total, 10))
+
+
+def _v2(metrics):
+    w = {name: _V2_WEIGHTS[name][metrics[name]] for name in _V2_WEIGHTS}
+    impact = 10.41 * (1 - (1 - w["C"]) * (1 - w["I"]) * (1 - w["A"]))
+    exploitability = 20 * w["AV"] * w["AC"] * w["Au"]
+    score = (0.6 * impact + 0.4 * exploitability - 1.5) * (1.176 if impact else 0)
+    return round(max(score, 0.0), 1)
+
+
+def base_score(vector):
+    """Base score of a CVSS v2 or v3.x vector string, or None."""
+    parts = vector.strip().split("/")
+    version = parts[0][5:] if parts[0].startswith("CVSS:") else None
+    metrics = dict(part.split(":", 1) for part in parts[version is not None:] if ":" in part)
+    try:
+        if version is not None and version.startswith("3"):
+            return _v3(metrics)
+        if (version is None or version.startswith("2")) and "Au" in metrics:
+            return _v2(metrics)
+    except KeyError:
+        pass  # missing or unknown metric value
+    return None
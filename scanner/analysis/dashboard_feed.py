@@ -0,0 +1,55 @@
+"""
+Findings exported as dashboard item updates.
+
+The rows carry the Category/Subcategory/Item key of the tracked item in
+the data collection spec plus its Priority, Status and Notes (and Risk
+Level when the finding has one). Imported
+through the dashboard's bulk import (Settings → Import), they update only
+those columns of the existing items.
+"""
+import json
+
+# Finding → (Category, Subcategory, Item, Priority) of the spec item it updates
+SPEC_ITEMS = {
+    "lifecycle": ("Asset Inventory", "Additional Considerations", "Asset lifecycle tracking", "Medium"),
+    "packages": ("System Configuration", "Security Controls", "Security patches and updates", "Critical"),
+    "services": ("System Configuration", "OS Configuration", "Enabled/disabled services", "Medium"),
+    "autostart": ("System Configuration", "OS Configuration", "Auto-start programs", "Medium"),
+    "users": ("System Configuration", "User Management", "Local users", "High"),
+    "ports": ("Asset Inventory", "Exposed Services", "Open ports", "High"),
+    "os": ("Company Related Data", "Attack Surface & Vulnerability Mapping", "Insecure default configurations", "High"),
+    "cve": ("Company Related Data", "Attack Surface & Vulnerability Mapping", "CVE matching", "Critical"),
+    "patch_status": ("Company Related Data", "Attack Surface & Vulnerability Mapping", "Patch status", "High"),
+    "dependencies": ("Company Related Data", "Supply Chain Security", "Dependency vulnerabilities", "High"),
+    "alerting": ("Monitoring and Metrics", "Alerting and Response", "Alerting mechanisms", "Medium"),
+    "response_plans": ("Monitoring and Metrics", "Alerting and Response", "Response plans", "High"),
+    "anomalous_logins": ("Monitoring and Metrics", "Alerting and Response", "Anomalous logins detection", "Critical"),
+    "failed_logins": ("Monitoring and Metrics", "Alerting and Response", "Failed login attempts monitoring", "Critical"),
+    "tampering": ("Company Related Data", "Endpoint Security Posture", "Tampering attempts", "Critical"),
+}
+
+
+def item_update(finding, status, notes, validation=None, risk=None):
+    category, subcategory, item, priority = SPEC_ITEMS[finding]
+    row = {
+        "Category": category,
+        "Subcategory": subcategory,
+        "Item": item,
+        "Priority": priority,
+        "Status": status,
+        "Notes": notes,
+    }
+    if validation:
+        row["Validation Status"] = validation
+    if risk:
+        row["Risk Level"] = risk
+    return row
+
+
+def write_updates(rows, path):
+    """Write item updates as NDJSON (one item per line, last update per item wins)."""
+    latest = {(r["Category"], r["Subcategory"], r["Item"]): r for r in rows}
+    with open(path, "w", encoding="utf-8") as f:
+        for row in latest.values():
+            f.write(json.dumps(row) + "\n")
+    return len(latest)
@@ -0,0 +1,52 @@
+"""
+Debian version ordering (dpkg --compare-versions) as sortable keys.
+
+version_key() turns "[epoch:]upstream[-revision]" into a tuple of ints
+whose natural ordering is dpkg's: non-digit runs compare character by
+character with "~" before the end of the string and letters before
+other characters, digit runs compare numerically. Keys are cached, so
+the versions shared by many hosts are parsed once.
+"""
+import re
+from functools import lru_cache
+
+_RUNS = re.compile(r"(\D*)(\d*)")
+
+
+def _order(char):
+    if char == "~":
+        return -1
+    if char.isalpha():
+        return ord(char)
+    return ord(char) + 256
+
+
+def _part_key(text):
+    # Pairs of (non-digit run as char orders + 0 terminator, digit run as int),
+    # then a final 0 that compares like the end of the string
+    key = []
+    for letters, digits in _RUNS.findall(text or "0")[:-1] or [("", "")]:
+        key.extend(map(_order, letters))
+        key.append(0)
+        key.append(int(digits) if digits else 0)
+    key.append(0)
+    return tuple(key)
+
+
+@lru_cache(maxsize=None)
+def version_key(version):
+    """Sortable key of a Debian version string."""
+    version = version.strip()
+    epoch, sep, rest = version.partition(":")
+    if not sep or not epoch.isdigit():
+        epoch, rest = "0", version
+    upstream, sep, revision = rest.rpartition("-")
+    if not sep:
+        upstream, revision = revision, ""
+    return int(epoch), _part_key(upstream), _part_key(revision)
+
+
+def compare_versions(a, b):
+    """-1, 0 or 1 like dpkg --compare-versions."""
+    ka, kb = version_key(a), version_key(b)
+    return (ka > kb) - (ka < kb)
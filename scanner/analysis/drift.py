@@ -0,0 +1,231 @@
+"""
+Drift between collector snapshots of a host.
+
+Unchanged sections are skipped first: by digest when the digests are known
+(stored manifests or section_digests), otherwise by direct comparison.
+Changed list sections are diffed as keyed sets (packages by name and
+architecture, services and users by name, ports by protocol, address and
+port); other sections are diffed field by field. With a SnapshotStore the
+chunk hashes of the manifests play the role of section digests, and only
+the chunks present on one side are decoded.
+"""
+import hashlib
+from dataclasses import dataclass, field
+
+from analysis.dashboard_feed import item_update
+from storage.snapshot_store import canonical
+
+# Fields that identify an entry of each list section
+SECTION_KEYS = {
+    "packages": ("name", "architecture"),
+    "services": ("name",),
+    "autostart": ("name",),
+    "users": ("name",),
+    "ports": ("protocol", "address", "port"),
+}
+
+# Field whose change is reported as version_changed instead of changed
+VERSION_FIELDS = {"packages": "version"}
+
+# Sections that are not compared (metadata or too volatile)
+IGNORED_SECTIONS = {"host", "collected_at", "collector", "processes", "process_edges"}
+
+# Dashboard items fed by drift (see analysis.dashboard_feed)
+DRIFT_FINDINGS = ("lifecycle", "packages", "services", "autostart", "users", "ports", "os")
+
+ADDED = "added"
+REMOVED = "removed"
+VERSION_CHANGED = "version_changed"
+CHANGED = "changed"
+
+
+@dataclass(frozen=True)
+class Change:
+    section: str
+    kind: str
+    key: tuple
+    before: object = None
+    after: object = None
+    fields: tuple = ()
+
+
+@dataclass
+class DriftReport:
+    host: str
+    before: object = None
+    after: object = None
+    changes: list = field(default_factory=list)
+    unchanged_sections: list = field(default_factory=list)
+
+    def counts(self):
+        """Number of changes per (section, kind)."""
+        counts = {}
+        for change in self.changes:
+            counts[(change.section, change.kind)] = counts.get((change.section, change.kind), 0) + 1
+        return counts
+
+    def by_section(self, section):
+        return [c for c in self.changes if c.section == section]
+
+
+def section_digest(value):
+    return hashlib.sha256(canonical(value)).hexdigest()
+
+
+def section_digests(document):
+    """Digest of every section, to be stored with a snapshot and reused when diffing."""
+    return {name: section_digest(value) for name, value in document.items() if name not in IGNORED_SECTIONS}
+
+
+def _keyed(section, entries):
+    key_fields = SECTION_KEYS.get(section)
+    if key_fields is None:
+        return {canonical(entry): entry for entry in entries}
+    if len(key_fields) == 1:
+        name = key_fields[0]
+        return {(entry.get(name),): entry for entry in entries}
+    return {tuple(entry.get(f) for f in key_fields): entry for entry in entries}
+
+
+def diff_entries(section, before, after):
+    """Typed changes between two versions of a list section."""
+    # Drop the entries present unchanged on both sides with C-level set
+    # operations over their values, so only the few that differ get keyed
+    try:
+        old_rows = dict(zip(map(tuple, map(dict.values, before)), before))
+        new_rows = dict(zip(map(tuple, map(dict.values, after)), after))
+    except TypeError:  # entries that are not dicts or hold unhashable values
+        pass
+    else:
+        before = [old_rows[values] for values in old_rows.keys() - new_rows.keys()]
+        after = [new_rows[values] for values in new_rows.keys() - old_rows.keys()]
+
+    old = _keyed(section, before)
+    new = _keyed(section, after)
+    changes = [Change(section, REMOVED, key, before=old[key]) for key in old.keys() - new.keys()]
+    changes += [Change(section, ADDED, key, after=new[key]) for key in new.keys() - old.keys()]
+
+    version_field = VERSION_FIELDS.get(section)
+    for key in old.keys() & new.keys():
+        a, b = old[key], new[key]
+        if a == b:
+            continue
+        fields = tuple(sorted(f for f in a.keys() | b.keys() if a.get(f) != b.get(f)))
+        kind = VERSION_CHANGED if version_field in fields else CHANGED
+        changes.append(Change(section, kind, key, before=a, after=b, fields=fields))
+    return changes
+
+
+def diff_values(section, before, after):
+    """Field-level changes of a non-list section (e.g. OS metadata)."""
+    if not isinstance(before, dict) or not isinstance(after, dict):
+        return [Change(section, CHANGED, (), before=before, after=after)]
+    return [
+        Change(section, ADDED if f not in before else REMOVED if f not in after else CHANGED, (f,),
+               before=before.get(f), after=after.get(f), fields=(f,))
+        for f in sorted(before.keys() | after.keys())
+        if before.get(f) != after.get(f)
+    ]
+
+
+def _diff_section(report, name, before, after):
+    if isinstance(before, list) and isinstance(after, list):
+        report.changes += diff_entries(name, before, after)
+    elif before is None:
+        report.changes.append(Change(name, ADDED, (), after=after))
+    elif after is None:
+        report.changes.append(Change(name, REMOVED, (), before=before))
+    else:
+        report.changes += diff_values(name, before, after)
+
+
+def diff_snapshots(before, after, sections=None, digests=None):
+    """Drift between two snapshot documents of the same host.
+
+    ``digests`` is an optional pair of section_digests() of both snapshots;
+    without it unchanged sections are detected by direct comparison.
+    """
+    report = DriftReport(after.get("host") or before.get("host"), before.get("collected_at"), after.get("collected_at"))
+    names = sections or [n for n in dict.fromkeys([*before, *after]) if n not in IGNORED_SECTIONS]
+    for name in names:
+        a, b = before.get(name), after.get(name)
+        same = digests[0].get(name) == digests[1].get(name) if digests else a == b
+        if same:
+            report.unchanged_sections.append(name)
+            continue
+        _diff_section(report, name, a, b)
+    return report
+
+
+def _decode(store, section):
+    if section is None:
+        return None
+    if "list" in section:
+        return [entry for digest in section["list"] for entry in store.chunk(digest)]
+    return store.chunk(section["value"])
+
+
+def diff_stored(store, host, before_ts, after_ts, sections=None):
+    """Drift between two snapshots in a SnapshotStore, decoding only differing chunks."""
+    before, after = store.manifest(host, before_ts), store.manifest(host, after_ts)
+    if before is None or after is None:
+        raise KeyError(f"No snapshot of {host} at {before_ts if before is None else after_ts}")
+
+    report = DriftReport(host, before_ts, after_ts)
+    names = sections or [n for n in dict.fromkeys([*before["sections"], *after["sections"]]) if n not in IGNORED_SECTIONS]
+    for name in names:
+        a, b = before["sections"].get(name), after["sections"].get(name)
+        if a == b:
+            report.unchanged_sections.append(name)
+        elif a and b and "list" in a and "list" in b:
+            # Chunks on both sides hold identical entries: only diff the rest
+            shared = set(a["list"]) & set(b["list"])
+            old = [e for digest in a["list"] if digest not in shared for e in store.chunk(digest)]
+            new = [e for digest in b["list"] if digest not in shared for e in store.chunk(digest)]
+            report.changes += diff_entries(name, old, new)
+        else:
+            _diff_section(report, name, _decode(store, a), _decode(store, b))
+    return report
+
+
+def drift_series(store, host, runs=None):
+    """Drift between consecutive snapshots of a host (the last ``runs`` snapshots)."""
+    timestamps = [t for _, t in store.snapshots(host)]
+    if runs:
+        timestamps = timestamps[-runs:]
+    return [diff_stored(store, host, a, b) for a, b in zip(timestamps, timestamps[1:])]
+
+
+def summarize(report):
+    """One-line description of the changes in a report, per section."""
+    parts = {}
+    for (section, kind), count in sorted(report.counts().items()):
+        parts.setdefault(section, []).append(f"{count} {kind.replace('_', ' ')}")
+    return {section: ", ".join(items) for section, items in parts.items()}
+
+
+def to_item_updates(reports, max_notes=500):
+    """Dashboard item updates from drift reports (see analysis.dashboard_feed).
+
+    Items with drift on some host go to In Progress / In Review with the
+    changes per host in the notes; items without drift are Completed.
+    """
+    notes = {finding: [] for finding in DRIFT_FINDINGS}
+    hosts = set()
+    for report in reports:
+        hosts.add(report.host)
+        for section, summary in summarize(report).items():
+            if section in notes:
+                notes[section].append(f"{report.host}: {summary}")
+        if report.by_section("os"):
+            notes["lifecycle"].append(f"{report.host}: OS changed ({', '.join(c.key[0] for c in report.by_section('os'))})")
+
+    rows = []
+    for finding, lines in notes.items():
+        if lines:
+            text = "; ".join(lines)
+            text = text if len(text) <= max_notes else text[:max_notes - 1] + "…"
+            rows.append(item_update(finding, "In Progress", f"Drift: {text}", validation="In Review"))
+        else:
+            rows.append(item_update(finding, "Completed", f"No drift across {len(hosts)} host(s)"))
+    return rows
@@ -0,0 +1,61 @@
+"""
+Drift report entrypoint.
+
+Run from the scanner directory:
+    python analysis/drift_report.py --store data/store --runs 5 --updates drift.ndjson
+    python analysis/drift_report.py --before old.yml --after new.yml
+
+--updates writes dashboard item updates that can be loaded from the
+dashboard's Settings → Import.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.dashboard_feed import write_updates  # noqa: E402
+from analysis.drift import diff_snapshots, drift_series, summarize, to_item_updates  # noqa: E402
+from storage.snapshot_store import SnapshotStore  # noqa: E402
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report drift between collector snapshots")
+    parser.add_argument("--store", help="snapshot store directory")
+    parser.add_argument("--host", action="append", help="host to report (default: every host in the store)")
+    parser.add_argument("--runs", type=int, default=2, help="number of most recent snapshots to compare")
+    parser.add_argument("--before", help="older snapshot YAML file")
+    parser.add_argument("--after", help="newer snapshot YAML file")
+    parser.add_argument("--updates", help="write dashboard item updates (NDJSON) to this file")
+    args = parser.parse_args(argv)
+
+    if args.store:
+        store = SnapshotStore(args.store)
+        hosts = args.host or sorted({host for host, _ in store.snapshots()})
+        reports = [report for host in hosts for report in drift_series(store, host, args.runs)]
+    elif args.before and args.after:
+        with open(args.before, "rb") as f:
+            before = yaml.load(f, Loader=Loader)
+        with open(args.after, "rb") as f:
+            after = yaml.load(f, Loader=Loader)
+        reports = [diff_snapshots(before, after)]
+    else:
+        parser.error("either --store or --before/--after is required")
+
+    for report in reports:
+        summary = summarize(report)
+        print(f"{report.host} {report.before} → {report.after}: {len(report.changes)} change(s)")
+        for section, text in summary.items():
+            print(f"  {section}: {text}")
+
+    if args.updates:
+        count = write_updates(to_item_updates(reports), args.updates)
+        print(f"{count} item update(s) written to {args.updates}")
+
+
+if __name__ == "__main__":
+    main()
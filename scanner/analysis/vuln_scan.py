@@ -0,0 +1,95 @@
+"""
+Vulnerability scan entrypoint.
+
+Matches the packages of collector snapshots against a local OSV-style
+advisory feed. Run from the scanner directory:
+    python analysis/vuln_scan.py --feed advisories.ndjson --store data/store --updates vulns.ndjson
+    python analysis/vuln_scan.py --feed osv/ data/output/static.yml
+
+--updates writes dashboard item updates (with Risk Level) that can be
+loaded from the dashboard's Settings → Import; --findings writes one
+finding per line.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agents.static_collector.exporter.offset_index import OutputIndex  # noqa: E402
+from analysis.dashboard_feed import write_updates  # noqa: E402
+from analysis.vulnerabilities import RISK_LEVELS, AdvisoryIndex, to_item_updates  # noqa: E402
+from storage.snapshot_store import SnapshotStore  # noqa: E402
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_inventories(paths=(), store=None, hosts=None):
+    """{host: packages} from YAML snapshots and/or the latest snapshot of every host in a store."""
+    inventories = {}
+    for path in paths:
+        index = OutputIndex.open(path)
+        if index is not None:
+            # Only decode the packages section of every host in the file
+            for host in index.hosts():
+                inventories[host] = index.section("packages", host) or []
+            index.close()
+            continue
+        with open(path, "rb") as f:
+            document = yaml.load(f, Loader=Loader) or {}
+        inventories[document.get("host") or path] = document.get("packages") or []
+
+    if store is not None:
+        for host in hosts or sorted({host for host, _ in store.snapshots()}):
+            manifest = store.manifest(host)
+            section = manifest and manifest["sections"].get("packages")
+            if section and "list" in section:
+                inventories[host] = [entry for digest in section["list"] for entry in store.chunk(digest)]
+    return inventories
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match installed packages against a local advisory feed")
+    parser.add_argument("snapshots", nargs="*", help="collector output YAML files")
+    parser.add_argument("--feed", required=True, help="OSV advisories: JSON list, NDJSON or a directory of .json files")
+    parser.add_argument("--ecosystem", action="append", help="only use ranges of these ecosystems (e.g. Debian:12)")
+    parser.add_argument("--store", help="snapshot store directory (latest snapshot of every host)")
+    parser.add_argument("--host", action="append", help="hosts to match from the store")
+    parser.add_argument("--findings", help="write the findings (NDJSON) to this file")
+    parser.add_argument("--updates", help="write dashboard item updates (NDJSON) to this file")
+    args = parser.parse_args(argv)
+    if not args.snapshots and not args.store:
+        parser.error("give collector YAML files or --store")
+
+    started = time.perf_counter()
+    index = AdvisoryIndex.from_feed(args.feed, args.ecosystem)
+    loaded = time.perf_counter()
+    inventories = load_inventories(args.snapshots, SnapshotStore(args.store) if args.store else None, args.host)
+    findings = index.match_hosts(inventories)
+    matched = time.perf_counter()
+
+    packages = sum(len(p) for p in inventories.values())
+    print(f"{len(index)} advisories indexed in {loaded - started:.2f}s; "
+          f"{len(inventories)} host(s), {packages} packages matched in {matched - loaded:.2f}s")
+    counts = {level: 0 for level in RISK_LEVELS}
+    for finding in findings:
+        counts[finding.risk] += len(finding.hosts)
+    print(f"{sum(counts.values())} finding(s) across hosts: "
+          + ", ".join(f"{n} {level.lower()}" for level, n in counts.items()))
+
+    if args.findings:
+        with open(args.findings, "w", encoding="utf-8") as f:
+            for finding in findings:
+                f.write(json.dumps(asdict(finding)) + "\n")
+    if args.updates:
+        count = write_updates(to_item_updates(findings, inventories), args.updates)
+        print(f"{count} item update(s) written to {args.updates}")
+
+
+if __name__ == "__main__":
+    main()
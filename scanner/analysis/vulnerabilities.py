@@ -0,0 +1,267 @@
+"""
+Offline matching of installed packages against a local advisory feed.
+
+The feed is OSV-style JSON (a list of advisories, one advisory per line,
+or a directory of .json files); nothing is fetched. Every affected range
+becomes an interval [introduced, fixed) of Debian version keys in a
+per-package index sorted by upper bound, so matching one version is a
+bisect plus a scan of the ranges that end above it (for the usual
+"introduced 0" ranges, exactly the matches). Explicitly listed versions
+go to an exact-match table.
+
+Hosts are matched in batches: the distinct (package, version) pairs of
+the whole inventory are matched once and fanned out to the hosts that
+have them.
+"""
+import json
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from analysis.cvss import base_score
+from analysis.dashboard_feed import item_update
+from analysis.debian_version import version_key
+
+# Severity → dashboard Risk Level, from the most to the least severe
+RISK_LEVELS = ("Critical", "High", "Medium", "Low")
+_SEVERITY_NAMES = {
+    "critical": "Critical",
+    "high": "High",
+    "important": "High",
+    "medium": "Medium",
+    "moderate": "Medium",
+    "low": "Low",
+    "negligible": "Low",
+    "unimportant": "Low",
+}
+
+# Upper bound of a range that is not fixed
+_UNFIXED = (float("inf"),)
+
+
+@dataclass(frozen=True)
+class Advisory:
+    id: str
+    summary: str
+    risk: str
+    aliases: tuple = ()
+
+
+@dataclass(frozen=True)
+class Finding:
+    package: str
+    version: str
+    advisory: str
+    risk: str
+    fixed: str = None
+    hosts: tuple = ()
+
+
+def _score(value):
+    """CVSS score of a number, numeric string or CVSS vector, or None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return float(value) if value.replace(".", "", 1).isdigit() else base_score(value)
+    return None
+
+
+def risk_level(record):
+    """Risk Level of an OSV record from its CVSS score or vector, or severity name."""
+    candidates = [record.get("database_specific", {}).get(k) for k in ("cvss_score", "severity", "urgency")]
+    candidates += [s.get("score") for s in record.get("severity", [])]
+    for value in candidates:
+        score = _score(value)
+        if score is not None:
+            return "Critical" if score >= 9 else "High" if score >= 7 else "Medium" if score >= 4 else "Low"
+        if isinstance(value, str) and value.lower() in _SEVERITY_NAMES:
+            return _SEVERITY_NAMES[value.lower()]
+    return "Medium"
+
+
+def iter_feed(path):
+    """Advisory records of a feed file (JSON list or one record per line) or directory."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".json"):
+                yield from iter_feed(os.path.join(path, name))
+        return
+    with open(path, "rb") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == b"[":
+            yield from json.load(f)
+        elif first == b"{" and not os.path.basename(path).endswith((".ndjson", ".jsonl")):
+            yield json.load(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class AdvisoryIndex:
+    """Per-package interval index of the affected version ranges of a feed."""
+
+    def __init__(self, ecosystems=None):
+        self.ecosystems = tuple(ecosystems) if ecosystems else None
+        self.advisories = []
+        self._ranges = {}  # package → [(fixed key, introduced key, advisory id, fixed version)]
+        self._exact = {}  # package → {version: [advisory id]}
+        self._bounds = {}  # package → fixed keys of its ranges, sorted
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.advisories)
+
+    @classmethod
+    def from_feed(cls, path, ecosystems=None):
+        index = cls(ecosystems)
+        for record in iter_feed(path):
+            index.add(record)
+        index.build()
+        return index
+
+    def add(self, record):
+        """Add one OSV advisory record; build() must be called afterwards."""
+        advisory_id = len(self.advisories)
+        self.advisories.append(Advisory(record.get("id", ""), record.get("summary") or record.get("details", "")[:200],
+                                        risk_level(record), tuple(record.get("aliases", ()))))
+        for affected in record.get("affected", []):
+            package = affected.get("package", {})
+            if self.ecosystems and not package.get("ecosystem", "").startswith(self.ecosystems):
+                continue
+            name = package.get("name")
+            if not name:
+                continue
+            for version in affected.get("versions", []):
+                self._exact.setdefault(name, {}).setdefault(version, []).append(advisory_id)
+            for affected_range in affected.get("ranges", []):
+                if affected_range.get("type", "ECOSYSTEM") != "ECOSYSTEM":
+                    continue
+                self._add_events(name, affected_range.get("events", []), advisory_id)
+
+    def _add_events(self, name, events, advisory_id):
+        ranges = self._ranges.setdefault(name, [])
+        introduced = None
+        for event in events:
+            if "introduced" in event:
+                introduced = event["introduced"]
+            elif introduced is not None and ("fixed" in event or "last_affected" in event):
+                fixed = event.get("fixed")
+                if fixed is not None:
+                    upper = version_key(fixed)
+                else:
+                    # last_affected is inclusive: bound just above it
+                    upper = version_key(event["last_affected"]) + ((float("inf"),),)
+                ranges.append((upper, self._lower(introduced), advisory_id, fixed))
+                introduced = None
+        if introduced is not None:
+            ranges.append((_UNFIXED, self._lower(introduced), advisory_id, None))
+
+    @staticmethod
+    def _lower(introduced):
+        return None if introduced in ("0", "") else version_key(introduced)
+
+    def build(self):
+        """Sort the ranges of every package by upper bound."""
+        for name, ranges in self._ranges.items():
+            ranges.sort(key=lambda r: r[0])
+            self._bounds[name] = [r[0] for r in ranges]
+        self._cache.clear()
+
+    def match(self, package, version):
+        """[(advisory id, fixed version)] affecting one installed version (cached)."""
+        cache_key = (package, version)
+        result = self._cache.get(cache_key)
+        if result is not None:
+            return result
+
+        result = [(a, None) for a in self._exact.get(package, {}).get(version, ())]
+        ranges = self._ranges.get(package)
+        if ranges:
+            key = version_key(version)
+            # Ranges whose upper bound is above the version, then check the lower bound
+            for upper, lower, advisory_id, fixed in ranges[bisect_right(self._bounds[package], key):]:
+                if lower is None or lower <= key:
+                    result.append((advisory_id, fixed))
+        self._cache[cache_key] = result
+        return result
+
+    def match_hosts(self, inventories):
+        """Findings of {host: packages}, every distinct (package, version) matched once.
+
+        Packages are collector entries (name, version, optional source and
+        source_version); Debian advisories are usually filed against the
+        source package, whose version differs from the binary one for binNMUs
+        and split-version packages. A finding lists every host with the
+        vulnerable version installed.
+        """
+        hosts_by_pair = {}
+        for host, packages in inventories.items():
+            for package in packages or []:
+                name, version = package.get("name"), package.get("version")
+                if name and version:
+                    source = package.get("source") or name
+                    key = (name, source, package.get("source_version") or version, version)
+                    hosts_by_pair.setdefault(key, []).append(host)
+
+        findings = []
+        for (name, source, source_version, version), hosts in hosts_by_pair.items():
+            hits = dict(self.match(name, version))
+            if (source, source_version) != (name, version):
+                hits.update(self.match(source, source_version))
+            hosts = tuple(hosts)
+            for advisory_id, fixed in hits.items():
+                advisory = self.advisories[advisory_id]
+                findings.append(Finding(name, version, advisory.id, advisory.risk, fixed, hosts))
+        return findings
+
+
+def highest_risk(findings):
+    risks = {f.risk for f in findings}
+    return next((level for level in RISK_LEVELS if level in risks), None)
+
+
+def to_item_updates(findings, hosts, max_notes=500):
+    """Dashboard item updates (with Risk Level) for CVE matching, Patch status
+    and Dependency vulnerabilities."""
+    hosts = set(hosts)
+    if not findings:
+        notes = f"No known vulnerabilities on {len(hosts)} host(s)"
+        return [item_update(f, "Completed", notes, risk="Low") for f in ("cve", "patch_status", "dependencies")]
+
+    risk = highest_risk(findings)
+    affected_hosts = {host for f in findings for host in f.hosts}
+    advisories = {}
+    for f in findings:
+        advisories.setdefault(f.advisory, f.risk)
+    by_risk = {level: sum(1 for r in advisories.values() if r == level) for level in RISK_LEVELS}
+    installations = {}  # (package, version) → (hosts, has a fix)
+    for f in findings:
+        hosts_with, fixed = installations.get((f.package, f.version), (f.hosts, False))
+        installations[(f.package, f.version)] = (hosts_with, fixed or f.fixed is not None)
+    fixable = sum(len(h) for h, fixed in installations.values() if fixed)
+    unfixed = sum(len(h) for h, fixed in installations.values() if not fixed)
+    packages = {}
+    for (name, _), (hosts_with, _) in installations.items():
+        packages.setdefault(name, set()).update(hosts_with)
+    top = sorted(packages.items(), key=lambda item: -len(item[1]))[:10]
+
+    def clip(text):
+        return text if len(text) <= max_notes else text[:max_notes - 1] + "…"
+
+    levels = ", ".join(f"{count} {level.lower()}" for level, count in by_risk.items() if count)
+    return [
+        item_update("cve", "In Progress", clip(
+            f"{len(advisories)} advisories ({levels}) on {len(affected_hosts)}/{len(hosts)} host(s)"),
+            validation="In Review", risk=risk),
+        item_update("patch_status", "In Progress", clip(
+            f"{fixable} vulnerable package installation(s) have a fixed version available; "
+            f"{unfixed} have no fix yet"),
+            validation="In Review", risk=risk),
+        item_update("dependencies", "In Progress", clip(
+            "Most affected packages: " + ", ".join(f"{name} ({len(h)} host(s))" for name, h in top)),
+            validation="In Review", risk=risk),
+    ]
@@ -0,0 +1,139 @@
+"""
+Package dependency graph built from a dpkg PackageTable.
+
+Edges go from a package to every installed package (or provider of a
+virtual package) that satisfies one of its dependency alternatives. They
+are stored as CSR adjacency arrays: ``forward_targets[forward_offsets[i]:
+forward_offsets[i + 1]]`` are the dependencies of package i, and the
+reverse arrays hold its dependents.
+"""
+import os
+from array import array
+from collections import deque
+
+from agents.static_collector.parser.dpkg_status import parse_status
+
+DPKG_INFO_DIR = "/var/lib/dpkg/info"
+UNIT_DIRS = ("/etc/systemd/system", "/lib/systemd/system", "/usr/lib/systemd/system")
+
+
+def _csr(edges, count, column):
+    """Offsets and targets of the adjacency lists of ``edges`` grouped by edges[column]."""
+    counts = [0] * (count + 1)
+    for edge in edges:
+        counts[edge[column] + 1] += 1
+    for i in range(count):
+        counts[i + 1] += counts[i]
+    offsets = array("i", counts)
+    targets = array("i", bytes(4 * len(edges)))
+    position = list(counts[:-1])
+    other = 1 - column
+    for edge in edges:
+        source = edge[column]
+        targets[position[source]] = edge[other]
+        position[source] += 1
+    return offsets, targets
+
+
+class PackageGraph:
+    def __init__(self, table):
+        self.table = table
+        providers = {}
+        for package_id, provided in enumerate(table.provides):
+            for name in provided:
+                providers.setdefault(name, []).append(package_id)
+
+        # Every dependency group becomes the tuple of installed ids that satisfy it
+        self.groups = []
+        edges = set()
+        for package_id, groups in enumerate(table.depends):
+            resolved = []
+            for alternatives in groups:
+                satisfied = tuple(dict.fromkeys(
+                    target
+                    for name, _, _ in alternatives
+                    for target in table.ids.get(name, []) + providers.get(name, [])
+                    if target != package_id
+                ))
+                if satisfied:
+                    resolved.append(satisfied)
+                    edges.update((package_id, target) for target in satisfied)
+            self.groups.append(resolved)
+
+        edges = sorted(edges)
+        self.forward_offsets, self.forward_targets = _csr(edges, len(table), 0)
+        self.reverse_offsets, self.reverse_targets = _csr(edges, len(table), 1)
+
+    @classmethod
+    def from_status(cls, path=None):
+        return cls(parse_status(path) if path else parse_status())
+
+    def _ids(self, name):
+        ids = self.table.ids.get(name)
+        if not ids:
+            raise KeyError(f"Package not installed: {name}")
+        return ids
+
+    def dependencies(self, package_id):
+        return self.forward_targets[self.forward_offsets[package_id]:self.forward_offsets[package_id + 1]]
+
+    def dependents(self, package_id):
+        return self.reverse_targets[self.reverse_offsets[package_id]:self.reverse_offsets[package_id + 1]]
+
+    def transitive_dependencies(self, name):
+        """Names of every package ``name`` needs, directly or indirectly."""
+        start = self._ids(name)
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            for target in self.dependencies(queue.popleft()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return sorted({self.table.names[i] for i in seen - set(start)})
+
+    def removal_impact(self, name):
+        """Names of the packages that break if ``name`` is removed.
+
+        A dependent breaks when one of its dependency groups has no
+        alternative left outside the removed set; packages that break are
+        removed in turn.
+        """
+        removed = set(self._ids(name))
+        queue = deque(removed)
+        while queue:
+            for dependent in self.dependents(queue.popleft()):
+                if dependent in removed:
+                    continue
+                if any(all(target in removed for target in group) for group in self.groups[dependent]):
+                    removed.add(dependent)
+                    queue.append(dependent)
+        return sorted({self.table.names[i] for i in removed} - {name})
+
+    def service_dependencies(self, unit, info_dir=DPKG_INFO_DIR, unit_dirs=UNIT_DIRS):
+        """Package owning a systemd unit and its transitive dependencies."""
+        for directory in unit_dirs:
+            path = os.path.join(directory, unit)
+            if os.path.exists(path):
+                owner = owning_package(os.path.realpath(path), info_dir) or owning_package(path, info_dir)
+                if owner:
+                    return owner, self.transitive_dependencies(owner)
+        return None, []
+
+
+def owning_package(path, info_dir=DPKG_INFO_DIR):
+    """Name of the package whose file list contains ``path`` (None if not found)."""
+    target = path.encode() + b"\n"
+    # /lib is a symlink to /usr/lib on merged-/usr systems; lists use either form
+    alternatives = {target, (path[4:] if path.startswith("/usr/") else "/usr" + path).encode() + b"\n"}
+    try:
+        names = os.listdir(info_dir)
+    except FileNotFoundError:
+        return None
+    for file_name in names:
+        if not file_name.endswith(".list"):
+            continue
+        with open(os.path.join(info_dir, file_name), "rb") as f:
+            if any(line in alternatives for line in f):
+                return file_name[:-5].split(":", 1)[0]
+    return None
@@ -0,0 +1,39 @@
+"""
+Process tree as provenance-graph edges.
+
+Nodes are processes identified by (pid, create_time), written as
+"process:<pid>:<create_time>"; every process whose parent is in the same
+snapshot gets a "spawned" edge from the parent, timed ("ts") by the
+child's start. With a ``parents`` map shared across snapshots, a process
+keeps the parent it had when first seen, so an orphan reparented to init
+(or a subreaper) does not gain a false "spawned" edge.
+"""
+
+
+def process_node(pid, create_time):
+    return f"process:{pid}:{create_time:.2f}"
+
+
+def process_edges(table, parents=None):
+    """Parent → child edges of a ProcessTable.
+
+    ``parents`` maps process node → parent node (None without a parent in
+    the snapshot) and is updated in place to the processes of this table.
+    """
+    start = dict(zip(table.pids, table.create_times))
+    current = {}
+    for pid, ppid, create_time in zip(table.pids, table.ppids, table.create_times):
+        node = process_node(pid, create_time)
+        if parents is not None and node in parents:
+            current[node] = (parents[node], create_time)
+        else:
+            parent = process_node(ppid, start[ppid]) if ppid in start and ppid != pid else None
+            current[node] = (parent, create_time)
+    if parents is not None:
+        parents.clear()
+        parents.update((node, parent) for node, (parent, _) in current.items())
+    return [
+        {"source": parent, "target": node, "relation": "spawned", "ts": create_time}
+        for node, (parent, create_time) in current.items()
+        if parent is not None
+    ]
@@ -0,0 +1,103 @@
+"""
+Fleet scan entrypoint.
+
+Run from the scanner directory:
+    python orchestrator/fleet_scan.py --targets hosts.txt --command "ssh {host} python3 static_collector.py -o -"
+    python orchestrator/fleet_scan.py --simulate 5000 --concurrency 500
+    python orchestrator/fleet_scan.py --simulate 5000 --benchmark 10,50,100,500,1000
+
+The targets file has one host per line, optionally followed by a comma and
+a priority (higher is scanned first). Results are written to --output-dir,
+or added to the deduplicated snapshot store with --store, as they complete.
+"""
+import argparse
+import json
+import shlex
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from orchestrator.orchestrator import Orchestrator, Target  # noqa: E402
+from orchestrator.sinks import DirectorySink, SnapshotStoreSink  # noqa: E402
+from orchestrator.transports import SimulatedTransport, SubprocessTransport  # noqa: E402
+from storage.snapshot_store import SnapshotStore  # noqa: E402
+
+
+def read_targets(path):
+    targets = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            host, _, priority = line.partition(",")
+            targets.append(Target(host.strip(), int(priority or 0)))
+    return targets
+
+
+def benchmark(transport_factory, targets, levels, args):
+    """Sweep the same targets at increasing concurrency and print the scaling."""
+    print(f"{'concurrency':>11} {'wall_s':>8} {'hosts/s':>9} {'speedup':>8} {'failed':>7}")
+    base = None
+    for level in levels:
+        report = Orchestrator(transport_factory(), concurrency=level, timeout=args.timeout,
+                              retries=args.retries, backoff=args.backoff).run(targets)
+        base = base or report.throughput / level
+        print(f"{level:>11} {report.wall_time:>8.2f} {report.throughput:>9.1f} "
+              f"{report.throughput / base:>8.1f} {report.failed:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run collectors across a fleet of hosts")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--targets", help="file with one host[,priority] per line")
+    source.add_argument("--simulate", type=int, metavar="N", help="scan N simulated hosts")
+    parser.add_argument("--command", help="collector command, {host} is replaced by the target (default: local collector)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-host timeout in seconds")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=1.0, help="base retry delay in seconds")
+    parser.add_argument("--output-dir", help="write each host's output here as it completes")
+    parser.add_argument("--store", help="add each host's output to the snapshot store in this directory")
+    parser.add_argument("--keep-last", type=int, help="with --store, keep only the newest N snapshots per host")
+    parser.add_argument("--benchmark", help="comma-separated concurrency levels to compare")
+    parser.add_argument("--sim-latency", default="0.05,0.5", help="simulated latency range in seconds")
+    parser.add_argument("--sim-failure-rate", type=float, default=0.02)
+    parser.add_argument("--sim-cpu-ms", type=float, default=0.0, help="simulated CPU cost per host in ms")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        targets = [Target(f"sim-{i:05d}", priority=2 if i % 50 == 0 else 0) for i in range(args.simulate)]
+        latency = tuple(float(x) for x in args.sim_latency.split(","))
+        def transport_factory():
+            return SimulatedTransport(latency, args.sim_failure_rate, cpu_ms=args.sim_cpu_ms, seed=0)
+    else:
+        targets = read_targets(args.targets)
+        command = shlex.split(args.command) if args.command else None
+        def transport_factory():
+            return SubprocessTransport(command)
+
+    if args.benchmark:
+        benchmark(transport_factory, targets, [int(x) for x in args.benchmark.split(",")], args)
+        return
+
+    store = SnapshotStore(args.store) if args.store else None
+    if store:
+        sink = SnapshotStoreSink(store)
+    else:
+        sink = DirectorySink(args.output_dir) if args.output_dir else None
+    orchestrator = Orchestrator(transport_factory(), concurrency=args.concurrency, timeout=args.timeout,
+                                retries=args.retries, backoff=args.backoff, sink=sink)
+    report = orchestrator.run(targets)
+    print(json.dumps(report.summary(), indent=2))
+
+    if store:
+        if args.keep_last:
+            store.apply_retention(keep_last=args.keep_last)
+            store.gc()
+        print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
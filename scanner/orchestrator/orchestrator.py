@@ -0,0 +1,169 @@
+"""
+Asyncio orchestrator that runs collectors across a fleet of targets.
+
+Targets wait in a priority queue (highest priority first, then FIFO) and
+a fixed pool of workers bounds concurrency. Each attempt has a per-host
+timeout; failed attempts are requeued after an exponential backoff with
+jitter, without holding a worker slot while they wait. Results are handed
+to the sink as soon as each target finishes.
+"""
+import asyncio
+import inspect
+import itertools
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Target:
+    host: str
+    priority: int = 0
+
+
+@dataclass
+class ScanResult:
+    host: str
+    ok: bool
+    document: dict = None
+    error: str = None
+    attempts: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class SweepReport:
+    targets: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    attempts: int = 0
+    sink_errors: int = 0
+    wall_time: float = 0.0
+    latencies: list = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self):
+        """Targets completed per second."""
+        return (self.succeeded + self.failed) / self.wall_time if self.wall_time else 0.0
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        percentile = (lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)]) if latencies else (lambda q: None)
+        return {
+            "targets": self.targets,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "attempts": self.attempts,
+            "sink_errors": self.sink_errors,
+            "wall_time": round(self.wall_time, 3),
+            "throughput": round(self.throughput, 1),
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_mean": statistics.fmean(latencies) if latencies else None,
+        }
+
+
+class Orchestrator:
+    def __init__(self, transport, concurrency=100, timeout=60.0, retries=2,
+                 backoff=1.0, max_backoff=60.0, jitter=0.5, sink=None):
+        self.transport = transport
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.sink = sink
+        self._sequence = itertools.count()
+
+    def _retry_delay(self, attempt):
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def _emit(self, result):
+        if self.sink is None:
+            return
+        outcome = self.sink(result)
+        if inspect.isawaitable(outcome):
+            await outcome
+
+    async def sweep(self, targets):
+        """Scan every target once (with retries) and return a SweepReport."""
+        queue = asyncio.PriorityQueue()
+        report = SweepReport()
+        started = {}
+        remaining = 0
+        finished = asyncio.Event()
+        retry_tasks = set()
+
+        def enqueue(index, target, attempt):
+            queue.put_nowait((-target.priority, next(self._sequence), index, target, attempt))
+
+        # Start times are keyed by position so duplicate hosts stay independent
+        for index, target in enumerate(targets):
+            enqueue(index, target, 1)
+            remaining += 1
+        report.targets = remaining
+        if not remaining:
+            return report
+
+        async def requeue_later(index, target, attempt, delay):
+            await asyncio.sleep(delay)
+            enqueue(index, target, attempt)
+
+        async def worker():
+            nonlocal remaining
+            while True:
+                _, _, index, target, attempt = await queue.get()
+                started.setdefault(index, time.perf_counter())
+                report.attempts += 1
+                requeued = False
+                try:
+                    try:
+                        document = await asyncio.wait_for(self.transport.collect(target), self.timeout)
+                        result = ScanResult(target.host, True, document=document, attempts=attempt)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        error = "timeout" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+                        if attempt <= self.retries:
+                            task = asyncio.create_task(
+                                requeue_later(index, target, attempt + 1, self._retry_delay(attempt)))
+                            retry_tasks.add(task)
+                            task.add_done_callback(retry_tasks.discard)
+                            requeued = True
+                            continue
+                        result = ScanResult(target.host, False, error=error, attempts=attempt)
+
+                    result.duration = time.perf_counter() - started.pop(index)
+                    report.latencies.append(result.duration)
+                    if result.ok:
+                        report.succeeded += 1
+                    else:
+                        report.failed += 1
+                    try:
+                        await self._emit(result)
+                    except Exception:
+                        report.sink_errors += 1
+                finally:
+                    # Always account for the target, or sweep() waits forever
+                    queue.task_done()
+                    if not requeued:
+                        remaining -= 1
+                        if remaining == 0:
+                            finished.set()
+
+        begin = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, remaining))]
+        try:
+            await finished.wait()
+        finally:
+            for task in workers + list(retry_tasks):
+                task.cancel()
+            await asyncio.gather(*workers, *retry_tasks, return_exceptions=True)
+        report.wall_time = time.perf_counter() - begin
+        return report
+
+    def run(self, targets):
+        return asyncio.run(self.sweep(targets))
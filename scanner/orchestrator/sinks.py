@@ -0,0 +1,46 @@
+"""Sinks that receive scan results as they complete."""
+import asyncio
+import os
+
+from agents.static_collector.exporter.yaml_exporter import export_yaml
+
+
+class DirectorySink:
+    """Write each successful result to ``<output_dir>/<host>.yml`` with its offset index.
+
+    Writes to the same path (a host listed twice) run one at a time, so the
+    output and its index always come from the same result.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.failures = []
+        self._locks = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    async def __call__(self, result):
+        if not result.ok:
+            self.failures.append((result.host, result.error))
+            return
+        path = os.path.join(self.output_dir, f"{result.host}.yml")
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            # YAML serialization is CPU-bound: keep it off the event loop
+            await asyncio.to_thread(export_yaml, result.document, path)
+
+
+class SnapshotStoreSink:
+    """Add each successful result to a SnapshotStore, one write at a time."""
+
+    def __init__(self, store):
+        self.store = store
+        self.failures = []
+        self.new_bytes = 0
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, result):
+        if not result.ok:
+            self.failures.append((result.host, result.error))
+            return
+        async with self._lock:
+            _, _, _, new_bytes = await asyncio.to_thread(self.store.put, result.document, result.host)
+        self.new_bytes += new_bytes
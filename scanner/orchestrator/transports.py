@@ -0,0 +1,81 @@
+"""
+Transports used by the orchestrator to run a collector against one target.
+
+A transport is any object with ``async collect(target) -> dict`` that
+returns the collector output document of that target or raises.
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+STATIC_COLLECTOR = Path(__file__).resolve().parents[1] / "agents" / "static_collector" / "static_collector.py"
+
+
+class TransportError(Exception):
+    pass
+
+
+class SubprocessTransport:
+    """Run the collector as a subprocess and parse its YAML from stdout.
+
+    ``command`` is a list of arguments where ``{host}`` is replaced by the
+    target host, e.g. ``["ssh", "{host}", "python3", "static_collector.py", "-o", "-"]``.
+    The default runs the local static collector.
+    """
+
+    def __init__(self, command=None):
+        self.command = command or [sys.executable, str(STATIC_COLLECTOR), "-o", "-"]
+
+    async def collect(self, target):
+        args = [arg.replace("{host}", target.host) for arg in self.command]
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            await proc.wait()
+            raise
+        if proc.returncode != 0:
+            raise TransportError(f"exit {proc.returncode}: {stderr.decode(errors='replace').strip()[-200:]}")
+        return yaml.load(stdout, Loader=Loader)
+
+
+class SimulatedTransport:
+    """Fake hosts with random latency, failures and optional CPU cost per run.
+
+    Used to test and benchmark the orchestrator without a fleet.
+    """
+
+    def __init__(self, latency=(0.05, 0.5), failure_rate=0.0, hang_rate=0.0, cpu_ms=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.cpu_ms = cpu_ms
+        self.random = random.Random(seed)
+
+    async def collect(self, target):
+        roll = self.random.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(3600)  # cut short by the per-host timeout
+        await asyncio.sleep(self.random.uniform(*self.latency))
+        if roll < self.hang_rate + self.failure_rate:
+            raise TransportError(f"simulated failure on {target.host}")
+        if self.cpu_ms:
+            # Parsing/processing cost on the orchestrator side
+            end = time.perf_counter() + self.cpu_ms / 1000
+            while time.perf_counter() < end:
+                pass
+        return {
+            "host": target.host,
+            "collected_at": time.time(),
+            "os": {"hostname": target.host, "os_type": "Linux"},
+            "packages": [{"name": f"pkg{i}", "version": "1.0"} for i in range(5)],
+        }
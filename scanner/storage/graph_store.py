@@ -0,0 +1,471 @@
+"""
+Append-only on-disk store for the provenance graph.
+
+The graph is kept as immutable segments, each covering edges of one time
+partition (one hour by default). A segment is a single file:
+
+    header   MAGIC + JSON (counts, time range, relation and kind names, array offsets)
+    strings  node names, sorted, as one UTF-8 blob plus offsets (the node ids)
+    nodes    kind, first seen, last seen
+    edges    time, source, target, relation; sorted by time
+
+Every array is read in place from a memory map. manifest.json lists the
+segments with their partition and time range: a new collector batch only
+writes new segment files and replaces the manifest atomically, and a
+query maps only the segments overlapping its window, then bisects their
+edge times. Small segments of a partition are merged later (compact(),
+or the background merger), so the number of segments per partition stays
+small however often batches arrive.
+
+Writers (append and compact) update the manifest under an exclusive lock
+on root/manifest.lock, so several collector processes can share a store.
+Where fcntl is unavailable only one writer process may use a store.
+Readers take no lock.
+
+Like storage/timeseries.py this module only depends on NumPy.
+"""
+import json
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: single writer process
+    fcntl = None
+
+MAGIC = b"PGS1"
+HEADER_SIZE = 4096
+PARTITION = 3600
+# Segments with fewer edges are merged with the other small ones of their partition
+SMALL_SEGMENT = 65536
+MANIFEST = "manifest.json"
+LOCK_FILE = "manifest.lock"
+
+# (array name, dtype, length key in the header)
+_ARRAYS = (
+    ("string_offsets", "<u8", "strings+1"),
+    ("string_data", "u1", "string_bytes"),
+    ("node_kind", "<u2", "nodes"),
+    ("node_first", "<f8", "nodes"),
+    ("node_last", "<f8", "nodes"),
+    ("edge_time", "<f8", "edges"),
+    ("edge_source", "<u4", "edges"),
+    ("edge_target", "<u4", "edges"),
+    ("edge_relation", "<u2", "edges"),
+)
+
+
+def _kind(name):
+    """Node kind: the prefix of "kind:identifier" node names."""
+    kind, sep, _ = name.partition(":")
+    return kind if sep else ""
+
+
+def write_segment(path, names, times, sources, targets, relations, relation_names):
+    """Write a segment file from edge columns (sources/targets index names, names sorted)."""
+    order = np.argsort(times, kind="stable")
+    times, sources, targets, relations = times[order], sources[order], targets[order], relations[order]
+
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    kinds = sorted({_kind(name) for name in names})
+    kind_ids = {kind: i for i, kind in enumerate(kinds)}
+
+    # First and last time every node appears in an edge
+    node_first = np.full(len(names), np.inf)
+    node_last = np.full(len(names), -np.inf)
+    for column in (sources, targets):
+        np.minimum.at(node_first, column, times)
+        np.maximum.at(node_last, column, times)
+
+    arrays = {
+        "string_offsets": offsets,
+        "string_data": np.frombuffer(b"".join(encoded), dtype="u1"),
+        "node_kind": np.array([kind_ids[_kind(name)] for name in names], dtype="<u2"),
+        "node_first": node_first,
+        "node_last": node_last,
+        "edge_time": times.astype("<f8"),
+        "edge_source": sources.astype("<u4"),
+        "edge_target": targets.astype("<u4"),
+        "edge_relation": relations.astype("<u2"),
+    }
+    meta = {
+        "version": 1,
+        "strings": len(names),
+        "string_bytes": int(offsets[-1]),
+        "nodes": len(names),
+        "edges": len(times),
+        "t_min": float(times[0]) if len(times) else 0.0,
+        "t_max": float(times[-1]) if len(times) else 0.0,
+        "kinds": kinds,
+        "relations": list(relation_names),
+        "offsets": {},
+    }
+    position = HEADER_SIZE
+    for name, _, _ in _ARRAYS:
+        meta["offsets"][name] = position
+        position += arrays[name].nbytes
+        position += -position % 8  # keep every array 8-byte aligned
+
+    header = MAGIC + json.dumps(meta).encode()
+    if len(header) > HEADER_SIZE:
+        raise ValueError("Too many relation or node kinds for a segment header")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for name, _, _ in _ARRAYS:
+            f.seek(meta["offsets"][name])
+            f.write(arrays[name].tobytes())
+        f.truncate(max(position, HEADER_SIZE))
+    os.replace(tmp_path, path)
+    return meta
+
+
+def encode_edges(edges, timestamp=None):
+    """Edge dicts (source, target, relation, optional ts) as segment columns."""
+    names = sorted({e["source"] for e in edges} | {e["target"] for e in edges})
+    ids = {name: i for i, name in enumerate(names)}
+    relation_names = sorted({e.get("relation", "") for e in edges})
+    relation_ids = {name: i for i, name in enumerate(relation_names)}
+    count = len(edges)
+    default = np.nan if timestamp is None else timestamp
+    times = np.fromiter((e.get("ts", default) for e in edges), dtype="<f8", count=count)
+    sources = np.fromiter((ids[e["source"]] for e in edges), dtype="<u4", count=count)
+    targets = np.fromiter((ids[e["target"]] for e in edges), dtype="<u4", count=count)
+    relations = np.fromiter((relation_ids[e.get("relation", "")] for e in edges), dtype="<u2", count=count)
+    return names, times, sources, targets, relations, relation_names
+
+
+class Segment:
+    """A memory-mapped segment file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:4] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a graph segment")
+        self.meta = json.loads(self._mmap[4:HEADER_SIZE].split(b"\0", 1)[0])
+        self.kinds = self.meta["kinds"]
+        self.relations = self.meta["relations"]
+        for name, dtype, length in _ARRAYS:
+            count = self.meta["strings"] + 1 if length == "strings+1" else self.meta[length]
+            setattr(self, name, np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self.meta["offsets"][name]))
+
+    def __len__(self):
+        return self.meta["edges"]
+
+    def _string(self, node):
+        base = self.meta["offsets"]["string_data"]
+        return self._mmap[base + int(self.string_offsets[node]):base + int(self.string_offsets[node + 1])]
+
+    def name(self, node):
+        return self._string(node).decode("utf-8")
+
+    def names(self):
+        """Every node name, by id."""
+        data = bytes(self.string_data)
+        offsets = self.string_offsets.tolist()
+        if data.isascii():  # decode once: character and byte offsets agree
+            text = data.decode("ascii")
+            return [text[a:b] for a, b in zip(offsets, offsets[1:])]
+        return [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def node_id(self, name):
+        """Id of a node name (binary search over the sorted dictionary), or None."""
+        target = name.encode("utf-8")
+        lo, hi = 0, self.meta["strings"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.meta["strings"] and self._string(lo) == target else None
+
+    def window(self, start, end):
+        """Edge rows [lo, hi) with start <= time <= end."""
+        return (int(np.searchsorted(self.edge_time, start, side="left")),
+                int(np.searchsorted(self.edge_time, end, side="right")))
+
+    def close(self):
+        for name, _, _ in _ARRAYS:
+            setattr(self, name, None)  # drop the exported views before closing the map
+        self._mmap.close()
+
+
+class GraphWindow:
+    """Edges of a time window, as (segment, lo, hi) row ranges; decoded only on demand."""
+
+    def __init__(self, parts):
+        self.parts = [(segment, lo, hi) for segment, lo, hi in parts if hi > lo]
+
+    def __len__(self):
+        return sum(hi - lo for _, lo, hi in self.parts)
+
+    def edges(self, times=None):
+        """Yield the edges as dicts (source, target, relation, ts), in time order per segment.
+
+        With times, only the edges whose time is one of them are decoded.
+        """
+        for segment, lo, hi in self.parts:
+            rows = slice(lo, hi)
+            if times is not None:
+                rows = lo + np.flatnonzero(np.isin(segment.edge_time[lo:hi], times))
+                if not len(rows):
+                    continue
+            names = segment.names()
+            relations = segment.relations
+            for t, s, d, r in zip(segment.edge_time[rows].tolist(), segment.edge_source[rows].tolist(),
+                                  segment.edge_target[rows].tolist(), segment.edge_relation[rows].tolist()):
+                yield {"source": names[s], "target": names[d], "relation": relations[r], "ts": t}
+
+    def neighbors(self, node, direction="out"):
+        """[(relation, other node, time)] of the edges leaving (or entering) a node."""
+        found = []
+        for segment, lo, hi in self.parts:
+            node_id = segment.node_id(node)
+            if node_id is None:
+                continue
+            near, far = (segment.edge_source, segment.edge_target) if direction == "out" else \
+                (segment.edge_target, segment.edge_source)
+            rows = lo + np.flatnonzero(near[lo:hi] == node_id)
+            found += [(segment.relations[segment.edge_relation[i]], segment.name(int(far[i])), float(segment.edge_time[i]))
+                      for i in rows]
+        return found
+
+    def counts(self):
+        """{relation: edges} of the window."""
+        counts = {}
+        for segment, lo, hi in self.parts:
+            for relation, n in zip(*np.unique(segment.edge_relation[lo:hi], return_counts=True)):
+                name = segment.relations[relation]
+                counts[name] = counts.get(name, 0) + int(n)
+        return counts
+
+
+class GraphStore:
+    """Segments under root, listed by root/manifest.json."""
+
+    def __init__(self, root, partition=PARTITION, writable=False):
+        self.root = root
+        self.partition = partition
+        self.writable = writable
+        self._segments = {}  # file → open Segment
+        self._lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._manifest_mtime = None
+        self._merger = None
+        self._stop = threading.Event()
+        self.manifest = {"version": 1, "partition": partition, "next_id": 0, "segments": []}
+        self._load_manifest()
+        self.partition = self.manifest.get("partition", partition)
+
+    def _manifest_path(self):
+        return os.path.join(self.root, MANIFEST)
+
+    def _load_manifest(self):
+        path = self._manifest_path()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._manifest_mtime = mtime
+        # Forget segments merged away since (windows using them keep their maps)
+        listed = {s["file"] for s in self.manifest["segments"]}
+        self._segments = {f: s for f, s in self._segments.items() if f in listed}
+
+    @contextmanager
+    def _writing(self):
+        """Thread lock plus the writers' file lock, with the manifest freshly reread."""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, LOCK_FILE), "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file is closed
+                self._manifest_mtime = None  # another writer may have saved within the same mtime tick
+                self._load_manifest()
+                yield
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._manifest_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self._manifest_mtime = os.stat(path).st_mtime_ns
+
+    def _new_file(self, partition):
+        number = self.manifest["next_id"]
+        self.manifest["next_id"] += 1
+        return f"seg-{partition}-{number:08d}.pgs"
+
+    def append(self, edges, timestamp=None):
+        """Write a batch of edges as new segments (one per time partition); return their count."""
+        if not self.writable:
+            raise PermissionError("GraphStore opened read-only")
+        if not edges:
+            return 0
+        columns = encode_edges(edges, timestamp)
+        names, times, sources, targets, relations, relation_names = columns
+        if np.isnan(times).any():
+            raise ValueError("Every edge needs a ts, or give the batch a timestamp")
+        partitions = (times // self.partition).astype(np.int64)
+        written = []
+        with self._writing():
+            for partition in np.unique(partitions).tolist():
+                rows = np.flatnonzero(partitions == partition)
+                used = np.unique(np.concatenate([sources[rows], targets[rows]]))
+                remap = np.zeros(len(names), dtype="<u4")
+                remap[used] = np.arange(len(used), dtype="<u4")
+                file_name = self._new_file(partition)
+                meta = write_segment(os.path.join(self.root, file_name), [names[i] for i in used.tolist()],
+                                     times[rows], remap[sources[rows]], remap[targets[rows]], relations[rows],
+                                     relation_names)
+                written.append(self._entry(file_name, partition, meta))
+            self.manifest["segments"] += written
+            self._save_manifest()
+        return len(written)
+
+    @staticmethod
+    def _entry(file_name, partition, meta):
+        return {"file": file_name, "partition": partition, "t_min": meta["t_min"], "t_max": meta["t_max"],
+                "nodes": meta["nodes"], "edges": meta["edges"]}
+
+    def segment(self, file_name):
+        segment = self._segments.get(file_name)
+        if segment is None:
+            segment = self._segments[file_name] = Segment(os.path.join(self.root, file_name))
+        return segment
+
+    def segments(self, start, end):
+        """Manifest entries of the segments overlapping [start, end]."""
+        self._load_manifest()
+        return [s for s in self.manifest["segments"] if s["t_max"] >= start and s["t_min"] <= end]
+
+    def query(self, start, end):
+        """GraphWindow of the edges with start <= time <= end."""
+        with self._lock:
+            for attempt in range(3):
+                try:
+                    parts = []
+                    for entry in self.segments(start, end):
+                        segment = self.segment(entry["file"])
+                        parts.append((segment, *segment.window(start, end)))
+                    return GraphWindow(parts)
+                except FileNotFoundError:
+                    if attempt == 2:
+                        raise
+                    self._manifest_mtime = None  # merged meanwhile by another process: reread
+
+    def stats(self):
+        self._load_manifest()
+        segments = self.manifest["segments"]
+        return {
+            "segments": len(segments),
+            "partitions": len({s["partition"] for s in segments}),
+            "edges": sum(s["edges"] for s in segments),
+        }
+
+    def compact(self, small=SMALL_SEGMENT):
+        """Merge the small segments of every partition into one; return the number of segments removed."""
+        if not self.writable:
+            raise PermissionError("GraphStore opened read-only")
+        with self._compacting:
+            return self._compact(small)
+
+    def _compact(self, small):
+        with self._writing():
+            groups = {}
+            for entry in self.manifest["segments"]:
+                if entry["edges"] < small:
+                    groups.setdefault(entry["partition"], []).append(entry)
+            groups = {p: entries for p, entries in groups.items() if len(entries) > 1}
+            planned = {p: (entries, self._new_file(p)) for p, entries in groups.items()}
+            if planned:
+                self._save_manifest()  # reserve the new file numbers
+
+        removed = 0
+        for partition, (entries, file_name) in planned.items():
+            path = os.path.join(self.root, file_name)
+            try:
+                meta = self._merge([e["file"] for e in entries], path)
+            except FileNotFoundError:
+                continue  # merged away meanwhile by another writer process
+            with self._writing():
+                merged = {e["file"] for e in entries}
+                if not merged <= {s["file"] for s in self.manifest["segments"]}:
+                    os.remove(path)  # another writer merged some of them first
+                    continue
+                self.manifest["segments"] = [s for s in self.manifest["segments"] if s["file"] not in merged]
+                self.manifest["segments"].append(self._entry(file_name, partition, meta))
+                self._save_manifest()
+                for old in merged:
+                    # Not closed: windows still using it keep the map (and the unlinked file) alive
+                    self._segments.pop(old, None)
+                    os.remove(os.path.join(self.root, old))
+            removed += len(entries) - 1
+        return removed
+
+    def _merge(self, file_names, path):
+        """Write the union of segments (merged dictionaries) to path."""
+        segments = [Segment(os.path.join(self.root, f)) for f in file_names]
+        try:
+            names = sorted(set().union(*(s.names() for s in segments)))
+            ids = {name: i for i, name in enumerate(names)}
+            relation_names = sorted(set().union(*(s.relations for s in segments)))
+            relation_ids = {name: i for i, name in enumerate(relation_names)}
+            columns = [[], [], [], []]
+            for segment in segments:
+                node_map = np.array([ids[n] for n in segment.names()], dtype="<u4")
+                relation_map = np.array([relation_ids[r] for r in segment.relations], dtype="<u2")
+                columns[0].append(np.array(segment.edge_time))
+                columns[1].append(node_map[segment.edge_source])
+                columns[2].append(node_map[segment.edge_target])
+                columns[3].append(relation_map[segment.edge_relation])
+            times, sources, targets, relations = (np.concatenate(c) for c in columns)
+            return write_segment(path, names, times, sources, targets, relations, relation_names)
+        finally:
+            for segment in segments:
+                segment.close()
+
+    def start_merger(self, interval=60.0, small=SMALL_SEGMENT):
+        """Run compact() every interval seconds on a daemon thread."""
+        if self._merger is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.compact(small)
+
+        self._merger = threading.Thread(target=run, name="graph-merger", daemon=True)
+        self._merger.start()
+
+    def stop_merger(self):
+        if self._merger is not None:
+            self._stop.set()
+            self._merger.join()
+            self._merger = None
+
+    def close(self):
+        """Stop the merger and drop the cached segments.
+
+        Segments are not unmapped: GraphWindows from query() stay valid and
+        release their maps when they are garbage collected.
+        """
+        self.stop_merger()
+        with self._lock:
+            self._segments = {}
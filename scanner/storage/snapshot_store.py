@@ -0,0 +1,295 @@
+"""
+Content-addressed, deduplicated store for collector snapshots.
+
+Each snapshot is split into canonical chunks that are stored once by
+their SHA-256:
+
+- list sections (packages, services, processes...) are sorted by their
+  key field and cut into content-defined chunks: a boundary falls after
+  every entry whose hash is 0 modulo ``CHUNK_FACTOR``, so adding or
+  removing one package only changes the chunk that contained it;
+- any other section is a single chunk.
+
+A snapshot (host, timestamp) is then a small manifest of chunk hashes.
+Manifests and chunk reference counts live in SQLite; chunks are zlib
+files under ``chunks/``. Deleting a manifest decrements the counts and
+``gc()`` removes the chunks nobody references. Storage therefore grows
+with what actually changes, not with hosts × runs.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+
+from agents.static_collector.exporter.yaml_exporter import KEY_FIELDS
+
+CHUNK_FACTOR = 16
+MAX_CHUNK_ENTRIES = 256
+
+# Fields kept in the manifest instead of chunks (they change on every run)
+MANIFEST_FIELDS = ("host", "collected_at")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifests (
+    host TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    manifest TEXT NOT NULL,
+    logical_bytes INTEGER NOT NULL,
+    PRIMARY KEY (host, timestamp)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    refs INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    stored INTEGER NOT NULL
+);
+"""
+
+
+def canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_list(section, entries):
+    """Sort a list section canonically and cut it into content-defined chunks."""
+    key_field = KEY_FIELDS.get(section)
+    encoded = [canonical(entry) for entry in entries]
+    if key_field:
+        order = sorted(range(len(entries)), key=lambda i: (str(entries[i].get(key_field)) if isinstance(entries[i], dict) else "", encoded[i]))
+    else:
+        order = sorted(range(len(entries)), key=encoded.__getitem__)
+
+    chunks, current = [], []
+    for i in order:
+        current.append(entries[i])
+        boundary = int.from_bytes(hashlib.blake2b(encoded[i], digest_size=4).digest(), "little") % CHUNK_FACTOR == 0
+        if boundary or len(current) >= MAX_CHUNK_ENTRIES:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ChunkCache:
+    """LRU cache of decompressed chunk bytes.
+
+    Callers decode on every hit, so each gets its own object and a chunk
+    that decodes to null is still cached.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def get(self, key):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+
+class SnapshotStore:
+    def __init__(self, root, cache_chunks=1024):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, "store.db"), isolation_level=None, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self.cache = ChunkCache(cache_chunks)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest[2:])
+
+    def _write_chunk(self, digest, data):
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return os.path.getsize(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(data, 6)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return len(compressed)
+
+    def chunk(self, digest):
+        """Decoded content of one chunk (a fresh copy, through the LRU cache)."""
+        data = self.cache.get(digest)
+        if data is None:
+            with open(self._chunk_path(digest), "rb") as f:
+                data = zlib.decompress(f.read())
+            self.cache.put(digest, data)
+        return json.loads(data)
+
+    def _chunk(self, value, chunks):
+        data = canonical(value)
+        digest = _digest(data)
+        chunks.setdefault(digest, data)
+        return digest
+
+    def put(self, document, host=None, timestamp=None):
+        """Store a snapshot and return (host, timestamp, new chunks, new stored bytes)."""
+        host = host or document.get("host") or "unknown"
+        timestamp = time.time() if timestamp is None else timestamp
+        chunks = {}
+        sections = {}
+        for name, value in document.items():
+            if name in MANIFEST_FIELDS:
+                continue
+            if isinstance(value, list):
+                sections[name] = {"list": [self._chunk(part, chunks) for part in split_list(name, value)]}
+            else:
+                sections[name] = {"value": self._chunk(value, chunks)}
+        manifest = {
+            "fields": {k: document[k] for k in MANIFEST_FIELDS if k in document},
+            "order": list(document),
+            "sections": sections,
+        }
+        references = [d for s in sections.values() for d in s.get("list", [s.get("value")])]
+        logical = sum(len(chunks[d]) for d in references)
+
+        new_chunks = new_bytes = 0
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            replaced = self.db.execute("SELECT manifest FROM manifests WHERE host = ? AND timestamp = ?",
+                                       (host, timestamp)).fetchone()
+            if replaced:
+                self._release(json.loads(replaced[0]))
+            for digest in references:
+                updated = self.db.execute("UPDATE chunks SET refs = refs + 1 WHERE hash = ?", (digest,)).rowcount
+                if not updated:
+                    stored = self._write_chunk(digest, chunks[digest])
+                    self.db.execute("INSERT INTO chunks (hash, refs, size, stored) VALUES (?, 1, ?, ?)",
+                                    (digest, len(chunks[digest]), stored))
+                    new_chunks += 1
+                    new_bytes += stored
+            self.db.execute("INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?)",
+                            (host, timestamp, json.dumps(manifest), logical))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return host, timestamp, new_chunks, new_bytes
+
+    def _release(self, manifest):
+        for section in manifest["sections"].values():
+            for digest in section.get("list", [section.get("value")]):
+                self.db.execute("UPDATE chunks SET refs = refs - 1 WHERE hash = ?", (digest,))
+
+    def snapshots(self, host=None):
+        """(host, timestamp) of the stored snapshots, oldest first."""
+        if host is None:
+            rows = self.db.execute("SELECT host, timestamp FROM manifests ORDER BY host, timestamp")
+        else:
+            rows = self.db.execute("SELECT host, timestamp FROM manifests WHERE host = ? ORDER BY timestamp", (host,))
+        return rows.fetchall()
+
+    def manifest(self, host, timestamp=None):
+        """Manifest of a snapshot (the latest one of the host if no timestamp)."""
+        if timestamp is None:
+            row = self.db.execute("SELECT manifest FROM manifests WHERE host = ? ORDER BY timestamp DESC LIMIT 1",
+                                  (host,)).fetchone()
+        else:
+            row = self.db.execute("SELECT manifest FROM manifests WHERE host = ? AND timestamp = ?",
+                                  (host, timestamp)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, host, timestamp=None):
+        """Assemble a snapshot (the latest one of the host if no timestamp)."""
+        manifest = self.manifest(host, timestamp)
+        if manifest is None:
+            return None
+
+        document = {}
+        for name in manifest["order"]:
+            if name in manifest["fields"]:
+                document[name] = manifest["fields"][name]
+                continue
+            section = manifest["sections"][name]
+            if "list" in section:
+                document[name] = [entry for digest in section["list"] for entry in self.chunk(digest)]
+            else:
+                document[name] = self.chunk(section["value"])
+        return document
+
+    def delete(self, host, timestamp):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT manifest FROM manifests WHERE host = ? AND timestamp = ?",
+                                  (host, timestamp)).fetchone()
+            if row:
+                self._release(json.loads(row[0]))
+                self.db.execute("DELETE FROM manifests WHERE host = ? AND timestamp = ?", (host, timestamp))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def apply_retention(self, keep_last=None, max_age_days=None, now=None):
+        """Delete snapshots beyond the newest keep_last per host or older than max_age_days.
+
+        The newest snapshot of every host is always kept.
+        """
+        now = time.time() if now is None else now
+        deleted = 0
+        hosts = [row[0] for row in self.db.execute("SELECT DISTINCT host FROM manifests")]
+        for host in hosts:
+            timestamps = [t for _, t in self.snapshots(host)][::-1]
+            for i, timestamp in enumerate(timestamps[1:], start=1):
+                too_many = keep_last is not None and i >= keep_last
+                too_old = max_age_days is not None and now - timestamp > max_age_days * 86400
+                if too_many or too_old:
+                    deleted += self.delete(host, timestamp)
+        return deleted
+
+    def gc(self):
+        """Remove unreferenced chunks; return (chunks removed, bytes freed)."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.db.execute("SELECT hash, stored FROM chunks WHERE refs <= 0").fetchall()
+            for digest, _ in rows:
+                try:
+                    os.remove(self._chunk_path(digest))
+                except FileNotFoundError:
+                    pass
+            self.db.execute("DELETE FROM chunks WHERE refs <= 0")
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return len(rows), sum(stored for _, stored in rows)
+
+    def stats(self):
+        manifests, logical = self.db.execute("SELECT COUNT(*), COALESCE(SUM(logical_bytes), 0) FROM manifests").fetchone()
+        chunks, stored = self.db.execute("SELECT COUNT(*), COALESCE(SUM(stored), 0) FROM chunks").fetchone()
+        return {
+            "snapshots": manifests,
+            "chunks": chunks,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "dedup_ratio": round(logical / stored, 1) if stored else None,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+    def close(self):
+        self.db.close()
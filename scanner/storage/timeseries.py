@@ -0,0 +1,174 @@
+"""
+Embedded time-series store for host metrics.
+
+Every series (host, metric) is one memory-mapped file holding a fixed
+number of slots per resolution:
+
+    raw     1 s   × 3600    (last hour)
+    minute  60 s  × 10080   (last 7 days)
+    hour    3600 s × 8760   (last year)
+
+A slot is (bucket start, min, max, sum, count) and slot i of a level
+holds bucket b with b % capacity == i, so the levels are ring buffers
+addressed by time: appending a sample updates one slot per level (the
+rollups are maintained as samples arrive) and a slot whose bucket start
+is stale is simply overwritten. Files never grow, so disk and memory per
+host stay bounded however long the collector runs.
+
+A range query reads only the slots of one resolution: the finest one
+that still covers the range and returns at most max_points buckets.
+
+This module only depends on NumPy so the dashboard can load it on its own.
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+MAGIC = b"PSTS"
+HEADER_SIZE = 4096
+# (bucket width in seconds, slots)
+LEVELS = ((1, 3600), (60, 10080), (3600, 8760))
+SLOT = np.dtype([("t", "<i8"), ("min", "<f8"), ("max", "<f8"), ("sum", "<f8"), ("count", "<u8")])
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _file_name(name):
+    return _SAFE_NAME.sub("_", name) or "_"
+
+
+class Series:
+    """One metric of one host: a ring buffer per resolution in a memory-mapped file."""
+
+    def __init__(self, path, levels=LEVELS, writable=False):
+        self.path = path
+        if writable and not os.path.exists(path):
+            self._create(path, levels)
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a time-series file")
+        meta = json.loads(header[4:].split(b"\0", 1)[0])
+        self.levels = [tuple(level) for level in meta["levels"]]
+        total = sum(capacity for _, capacity in self.levels)
+        data = np.memmap(path, dtype=SLOT, mode="r+" if writable else "r", offset=HEADER_SIZE, shape=(total,))
+        self._data = data
+        self._rings = []
+        start = 0
+        for _, capacity in self.levels:
+            self._rings.append(data[start:start + capacity])
+            start += capacity
+
+    @staticmethod
+    def _create(path, levels):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        meta = json.dumps({"version": 1, "levels": [list(level) for level in levels]}).encode()
+        total = sum(capacity for _, capacity in levels)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write((MAGIC + meta).ljust(HEADER_SIZE, b"\0"))
+            # Bucket start -1 marks an empty slot
+            empty = np.zeros(total, dtype=SLOT)
+            empty["t"] = -1
+            f.write(empty.tobytes())
+        os.replace(tmp_path, path)
+
+    def append(self, timestamp, value):
+        """Add one sample to the raw ring and its minute and hour rollups."""
+        timestamp = int(timestamp)
+        value = float(value)
+        for (step, capacity), ring in zip(self.levels, self._rings):
+            start = timestamp - timestamp % step
+            slot = ring[(timestamp // step) % capacity]
+            if slot["t"] != start:
+                slot["t"], slot["min"], slot["max"], slot["sum"], slot["count"] = start, value, value, value, 1
+            else:
+                slot["min"] = min(slot["min"], value)
+                slot["max"] = max(slot["max"], value)
+                slot["sum"] += value
+                slot["count"] += 1
+
+    def resolution(self, start, end, max_points=1000, now=None):
+        """Index of the finest level covering [start, end] with at most max_points buckets."""
+        now = end if now is None else now
+        covering = [i for i, (step, capacity) in enumerate(self.levels) if now - start < step * capacity]
+        for i in covering:
+            if (end - start) // self.levels[i][0] + 1 <= max_points:
+                return i
+        return covering[-1] if covering else len(self.levels) - 1
+
+    def query(self, start, end, max_points=1000, level=None, now=None):
+        """Buckets of [start, end] as arrays t, min, max, avg (only filled buckets)."""
+        if level is None:
+            level = self.resolution(start, end, max_points, now)
+        step, capacity = self.levels[level]
+        first, last = int(start) // step, int(end) // step
+        first = max(first, last - capacity + 1)
+        buckets = np.arange(first, last + 1, dtype=np.int64)
+        slots = self._rings[level][buckets % capacity]
+        filled = slots["t"] == buckets * step
+        slots = slots[filled]
+        return {
+            "step": step,
+            "t": slots["t"].copy(),
+            "min": slots["min"].copy(),
+            "max": slots["max"].copy(),
+            "avg": slots["sum"] / np.maximum(slots["count"], 1),
+        }
+
+    def flush(self):
+        self._data.flush()
+
+    def close(self):
+        self._rings = []
+        self._data._mmap.close()
+
+
+class TimeSeriesStore:
+    """Series files under root/<host>/<metric>.ts."""
+
+    def __init__(self, root, levels=LEVELS, writable=False):
+        self.root = root
+        self.levels = levels
+        self.writable = writable
+        self._series = {}
+
+    def series(self, host, metric):
+        key = (host, metric)
+        series = self._series.get(key)
+        if series is None:
+            path = os.path.join(self.root, _file_name(host), f"{_file_name(metric)}.ts")
+            series = self._series[key] = Series(path, self.levels, self.writable)
+        return series
+
+    def append(self, host, samples, timestamp):
+        """Add a {metric: value} sample of one host."""
+        for metric, value in samples.items():
+            if value is not None:
+                self.series(host, metric).append(timestamp, value)
+
+    def query(self, host, metric, start, end, max_points=1000, now=None):
+        return self.series(host, metric).query(start, end, max_points, now=now)
+
+    def hosts(self):
+        try:
+            return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+        except FileNotFoundError:
+            return []
+
+    def metrics(self, host):
+        try:
+            return sorted(f[:-3] for f in os.listdir(os.path.join(self.root, _file_name(host))) if f.endswith(".ts"))
+        except FileNotFoundError:
+            return []
+
+    def flush(self):
+        for series in self._series.values():
+            series.flush()
+
+    def close(self):
+        for series in self._series.values():
+            series.close()
+        self._series = {}
@@ -0,0 +1,5 @@
+"""Put scanner/ on sys.path, as the collector entrypoints do."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scanner"))
@@ -0,0 +1,74 @@
+import os
+
+from agents.dynamic_collector.parser.log_tailer import Checkpoints, LogTailer
+
+
+def _tailer(tmp_path, log, **kwargs):
+    return LogTailer([str(log)], Checkpoints(str(tmp_path / "checkpoints.json")), **kwargs)
+
+
+def _poll(tailer, log):
+    return b"".join(tailer.poll(str(log)))
+
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_partial_line_is_completed_on_a_later_poll(tmp_path):
+    log = tmp_path / "auth.log"
+    log.write_bytes(b"first\nsecond line, half")
+    tailer = _tailer(tmp_path, log, from_start=True, chunk_size=4)
+
+    assert _poll(tailer, log) == b"first\n"
+    assert _poll(tailer, log) == b""
+    _append(log, b" written\nthird\n")
+    assert _poll(tailer, log) == b"second line, half written\nthird\n"
+
+
+def test_new_file_is_read_from_its_end(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(b"old\nold partial")
+    tailer = _tailer(tmp_path, log)
+
+    assert _poll(tailer, log) == b""
+    _append(log, b" line\nnew\n")
+    assert _poll(tailer, log) == b"old partial line\nnew\n"
+
+
+def test_rotation_reads_the_rest_of_the_rotated_file_first(tmp_path):
+    log = tmp_path / "access.log"
+    log.write_bytes(b"a\n")
+    tailer = _tailer(tmp_path, log, from_start=True)
+    assert _poll(tailer, log) == b"a\n"
+
+    _append(log, b"b\n")  # written just before logrotate moves the file
+    os.rename(log, f"{log}.1")
+    log.write_bytes(b"c\n")
+
+    assert _poll(tailer, log) == b"b\nc\n"
+    assert tailer.rotations == 1
+    assert _poll(tailer, log) == b""
+
+
+def test_truncation_restarts_from_the_beginning(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"line one\nline two\n")
+    tailer = _tailer(tmp_path, log, from_start=True)
+    assert _poll(tailer, log) == b"line one\nline two\n"
+
+    log.write_bytes(b"fresh\n")  # copytruncate, then a new write
+    assert _poll(tailer, log) == b"fresh\n"
+    assert tailer.truncations == 1
+
+
+def test_checkpoints_survive_a_restart(tmp_path):
+    log = tmp_path / "auth.log"
+    log.write_bytes(b"one\n")
+    tailer = _tailer(tmp_path, log, from_start=True)
+    assert list(tailer.read_new()) == [(str(log), b"one\n")]
+
+    _append(log, b"two\n")
+    restarted = _tailer(tmp_path, log, from_start=True)
+    assert list(restarted.read_new()) == [(str(log), b"two\n")]
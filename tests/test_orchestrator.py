@@ -0,0 +1,37 @@
+import os
+
+from agents.static_collector.exporter.offset_index import OutputIndex
+from orchestrator.orchestrator import Orchestrator, Target
+from orchestrator.sinks import DirectorySink
+from orchestrator.transports import SimulatedTransport
+
+
+def _orchestrator(sink=None, **kwargs):
+    transport = SimulatedTransport(latency=(0.0, 0.01), seed=0, **kwargs)
+    return Orchestrator(transport, concurrency=8, timeout=0.5, retries=1, backoff=0.01, sink=sink)
+
+
+def test_sweep_accounts_for_every_target():
+    targets = [Target(f"host-{i}", priority=i % 3) for i in range(20)]
+    report = _orchestrator(failure_rate=0.3).run(targets)
+
+    assert report.targets == 20
+    assert report.succeeded + report.failed == 20
+    assert len(report.latencies) == 20
+
+
+def test_duplicate_hosts_finish():
+    report = _orchestrator().run([Target("dup")] * 4)
+
+    assert (report.succeeded, report.failed, report.attempts) == (4, 0, 4)
+
+
+def test_directory_sink_with_duplicate_hosts(tmp_path):
+    sink = DirectorySink(str(tmp_path))
+    report = _orchestrator(sink=sink).run([Target("dup")] * 4 + [Target("other")])
+
+    assert report.succeeded == 5
+    assert report.sink_errors == 0
+    assert sorted(os.listdir(tmp_path)) == ["dup.yml", "dup.yml.idx", "other.yml", "other.yml.idx"]
+    index = OutputIndex.open(str(tmp_path / "dup.yml"))
+    assert index is not None  # the index matches the output that won
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from agents.static_collector.parser.dpkg_status import parse_relations, parse_status
+from graphs.package_graph import PackageGraph
+
+STATUS = Path(__file__).parent / "fixtures" / "dpkg_status"
+
+
+def _label(table, package_id):
+    return f"{table.names[package_id]}:{table.architectures[package_id]}"
+
+
+def _edges(graph):
+    table = graph.table
+    return {
+        (_label(table, source), _label(table, target))
+        for source in range(len(table))
+        for target in graph.dependencies(source)
+    }
+
+
+def test_parse_relations():
+    assert parse_relations("libc6:any (>= 2.34), awk | gawk (<< 5)") == [
+        [("libc6", ">=", "2.34")],
+        [("awk", None, None), ("gawk", "<<", "5")],
+    ]
+
+
+def test_parse_status_keeps_installed_packages():
+    table = parse_status(str(STATUS))
+    records = {(r["name"], r["architecture"]): r for r in table.records()}
+
+    assert len(table) == 10
+    assert ("gawk", "amd64") not in records  # config-files only
+    assert set(records) >= {("libc6", "amd64"), ("libc6", "i386")}
+    assert records[("openssh-server", "amd64")] == {
+        "name": "openssh-server", "version": "1:8.9p1-3ubuntu0.6", "architecture": "amd64", "source": "openssh",
+    }
+    assert records[("libgcc-s1", "amd64")]["source"] == "gcc-12"
+    assert records[("bash", "amd64")]["source"] == "bash"
+    assert "source_version" not in records[("bash", "amd64")]
+    # binNMU: the source keeps the version advisories are filed against
+    assert records[("mawk", "amd64")]["source_version"] == "1.3.4.20200120-3"
+    assert len(parse_status(str(STATUS), installed_only=False)) == 11
+
+
+def test_dependency_graph_edges():
+    graph = PackageGraph.from_status(str(STATUS))
+    libc6 = {"libc6:amd64", "libc6:i386"}
+    expected = {
+        *{("libc6:amd64", "libgcc-s1:amd64"), ("libc6:i386", "libgcc-s1:amd64")},
+        *{("libgcc-s1:amd64", lib) for lib in libc6},
+        *{("mawk:amd64", lib) for lib in libc6},
+        *{("bash:amd64", lib) for lib in libc6}, ("bash:amd64", "base-files:amd64"),
+        *{("passwd:amd64", lib) for lib in libc6},
+        ("adduser:all", "passwd:amd64"), ("adduser:all", "mawk:amd64"),  # awk is provided by mawk
+        *{("openssh-client:amd64", lib) for lib in libc6}, ("openssh-client:amd64", "adduser:all"),
+        *{("openssh-server:amd64", lib) for lib in libc6},
+        ("openssh-server:amd64", "adduser:all"), ("openssh-server:amd64", "openssh-client:amd64"),
+    }
+    assert _edges(graph) == expected
+
+    # The reverse CSR arrays hold the same edges
+    table = graph.table
+    reverse = {
+        (_label(table, source), _label(table, target))
+        for target in range(len(table))
+        for source in graph.dependents(target)
+    }
+    assert reverse == expected
+
+
+def test_transitive_dependencies_and_removal_impact():
+    graph = PackageGraph.from_status(str(STATUS))
+
+    assert graph.transitive_dependencies("openssh-server") == [
+        "adduser", "libc6", "libgcc-s1", "mawk", "openssh-client", "passwd",
+    ]
+    # adduser needs awk, which only mawk provides once gawk is gone
+    assert graph.removal_impact("mawk") == ["adduser", "openssh-client", "openssh-server"]
+    assert graph.removal_impact("openssh-server") == []
+    assert graph.removal_impact("base-files") == ["bash"]
@@ -0,0 +1,92 @@
+import asyncio
+import socket
+
+from agents.static_collector.parser.port_scan import _connect, fingerprint, scan
+
+MYSQL_GREETING = b"\x4a\x00\x00\x00\x0a8.0.36-0ubuntu0.22.04.1\x00\x08\x00\x00\x00"
+
+
+async def _ssh(reader, writer):
+    writer.write(b"SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.6\r\n")
+    await writer.drain()
+    await reader.read(1)
+    writer.close()
+
+
+async def _http(reader, writer):
+    await reader.readuntil(b"\r\n\r\n")  # answers the scanner's probe only
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nServer: nginx/1.18.0\r\n\r\n")
+    await writer.drain()
+    writer.close()
+
+
+async def _mysql(reader, writer):
+    writer.write(MYSQL_GREETING)
+    await writer.drain()
+    await reader.read(1)
+    writer.close()
+
+
+async def _silent(reader, writer):
+    await reader.read()
+    writer.close()
+
+
+async def _sweep():
+    servers = {}
+    for name, handler in (("ssh", _ssh), ("http", _http), ("mysql", _mysql), ("silent", _silent)):
+        servers[name] = await asyncio.start_server(handler, "127.0.0.1", 0)
+    ports = {name: server.sockets[0].getsockname()[1] for name, server in servers.items()}
+    try:
+        found = await scan("127.0.0.1", sorted(ports.values()), timeout=1.0, banner_timeout=0.3)
+    finally:
+        for server in servers.values():
+            server.close()
+            await server.wait_closed()
+    by_port = {result["port"]: result for result in found}
+    return {name: by_port.get(port) for name, port in ports.items()}
+
+
+def test_scan_fingerprints_loopback_listeners():
+    results = asyncio.run(_sweep())
+    assert all(results.values()), results
+
+    assert results["ssh"]["service"] == "ssh"
+    assert results["ssh"]["version"] == "OpenSSH_8.9p1"
+    assert results["ssh"]["banner"].startswith("SSH-2.0-OpenSSH_8.9p1")
+
+    assert results["http"]["service"] == "http"
+    assert results["http"]["version"] == "nginx/1.18.0"
+
+    assert results["mysql"]["service"] == "mysql"
+    assert results["mysql"]["version"] == "8.0.36-0ubuntu0.22.04.1"
+
+    assert results["silent"]["service"] == "unknown"
+    assert results["silent"]["version"] is None
+    assert results["silent"]["banner"] == ""
+
+
+def test_closed_port_is_not_reported():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # bound but not listening: refused
+        found = asyncio.run(scan("127.0.0.1", [port], timeout=0.5, banner_timeout=0))
+    assert found == []
+
+
+def test_self_connect_is_closed():
+    async def connect_to_itself():
+        with socket.socket() as sock:
+            sock.setblocking(False)
+            sock.bind(("127.0.0.1", 0))
+            address = sock.getsockname()
+            # Connecting a socket to its own address is a TCP simultaneous open on Linux
+            return await _connect(asyncio.get_running_loop(), sock, address, 1.0)
+
+    assert asyncio.run(connect_to_itself()) is False
+
+
+def test_fingerprint_falls_back_to_port_names():
+    assert fingerprint(b"", 22) == ("ssh", None)
+    assert fingerprint(b"", 40000) == ("unknown", None)
+    assert fingerprint(b"HTTP/1.0 404 Not Found\r\n\r\n", 8080) == ("http", None)
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from agents.static_collector.parser.systemd_units import (
+    UnitCache, UnitInventory, autostart_records, merge_units, parse_unit, service_records,
+)
+
+VENDOR = "usr/lib/systemd/system"
+ADMIN = "etc/systemd/system"
+
+
+def _write(root, path, text):
+    path = root / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _link(root, path, target):
+    path = root / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.symlink(target, path)
+
+
+@pytest.fixture
+def unit_root(tmp_path):
+    root = tmp_path / "root"
+    _write(root, f"{VENDOR}/web.service",
+           "[Unit]\nDescription=Web server\n[Service]\nExecStart=/usr/bin/web\nUser=www\n"
+           "[Install]\nWantedBy=multi-user.target\n")
+    # Same drop-in name in both paths: the /etc one shadows the vendor one
+    _write(root, f"{VENDOR}/web.service.d/override.conf", "[Service]\nUser=vendor\n")
+    _write(root, f"{VENDOR}/web.service.d/10-limits.conf", "[Service]\nLimitNOFILE=4096\n")
+    _write(root, f"{ADMIN}/web.service.d/override.conf",
+           "[Service]\nExecStart=\nExecStart=/usr/bin/web --port 8080\nUser=admin\n")
+    _link(root, f"{ADMIN}/multi-user.target.wants/web.service", f"/{VENDOR}/web.service")
+
+    _write(root, f"{VENDOR}/legacy.service", "[Service]\nExecStart=/usr/bin/legacy\n"
+                                             "[Install]\nWantedBy=multi-user.target\n")
+    _link(root, f"{ADMIN}/legacy.service", "/dev/null")
+
+    _write(root, f"{VENDOR}/getty@.service", "[Service]\nExecStart=-/sbin/agetty %I\n"
+                                             "[Install]\nWantedBy=getty.target\n")
+    _link(root, f"{ADMIN}/getty.target.wants/getty@tty1.service", f"/{VENDOR}/getty@.service")
+
+    _write(root, f"{VENDOR}/idle.service", "[Service]\nExecStart=/usr/bin/idle\n"
+                                           "[Install]\nWantedBy=multi-user.target\n")
+    _write(root, f"{VENDOR}/helper.service", "[Service]\nExecStart=/usr/bin/helper\n")
+    return root
+
+
+def _inventory(root, tmp_path):
+    return UnitInventory(UnitCache(str(tmp_path / "cache.json")), root=str(root))
+
+
+def test_empty_assignment_resets_across_drop_ins():
+    drop_in = parse_unit("[Service]\nExecStart=/a\nExecStart=\nExecStart=/b \\\n  --flag\n")
+    assert drop_in == {"Service": {"ExecStart": [None, "/b --flag"]}}
+
+    base = parse_unit("[Service]\nExecStart=/usr/bin/daemon\nEnvironment=A=1\n")
+    merged = merge_units(merge_units(base, drop_in), parse_unit("[Service]\nEnvironment=B=2\n"))
+    assert merged == {"Service": {"ExecStart": ["/b --flag"], "Environment": ["A=1", "B=2"]}}
+
+
+def test_drop_ins_shadow_and_reset_exec_start(unit_root, tmp_path):
+    inventory = _inventory(unit_root, tmp_path)
+    sections, drop_ins = inventory.sections("web.service")
+
+    assert [os.path.relpath(p, unit_root) for p in drop_ins] == [
+        f"{VENDOR}/web.service.d/10-limits.conf",
+        f"{ADMIN}/web.service.d/override.conf",
+    ]
+    assert sections["Service"]["ExecStart"] == ["/usr/bin/web --port 8080"]
+    assert sections["Service"]["User"] == ["www", "admin"]
+    assert sections["Service"]["LimitNOFILE"] == ["4096"]
+
+
+def test_unit_file_states(unit_root, tmp_path):
+    inventory = _inventory(unit_root, tmp_path)
+    states = {name: inventory.state(name, inventory.sections(name)[0]) for name in inventory.names()}
+
+    assert states == {
+        "getty@tty1.service": "enabled",
+        "helper.service": "static",
+        "idle.service": "disabled",
+        "legacy.service": "masked",
+        "web.service": "enabled",
+    }
+    assert inventory.sections("legacy.service") == ({}, [])
+    assert inventory.wanted_by("web.service") == ["multi-user.target"]
+
+
+def test_template_instance_records(unit_root, tmp_path):
+    inventory = _inventory(unit_root, tmp_path)
+    services = {record["name"]: record for record in service_records(inventory)}
+
+    getty = services["getty@tty1.service"]
+    assert getty["enabled"] == "enabled"
+    assert getty["path"] == f"/{VENDOR}/getty@.service"
+    assert getty["exec_start"] == "-/sbin/agetty %I"
+    assert getty["wanted_by"] == ["getty.target"]
+    assert services["web.service"]["exec_start"] == "/usr/bin/web --port 8080"
+    assert services["web.service"]["user"] == "admin"
+    assert services["legacy.service"]["load"] == "masked"
+
+    autostart = {record["name"] for record in autostart_records(inventory)}
+    assert autostart == {"getty@tty1.service", "web.service"}
+
+
+def test_rescan_reads_unchanged_files_from_cache(unit_root, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    cache = UnitCache(cache_path)
+    first = service_records(UnitInventory(cache, root=str(unit_root)))
+    cache.save()
+
+    cache = UnitCache(cache_path)
+    assert service_records(UnitInventory(cache, root=str(unit_root))) == first
+    assert cache.misses == 0 and cache.hits > 0
@@ -0,0 +1,41 @@
+from analysis.cvss import base_score
+from analysis.vulnerabilities import AdvisoryIndex, risk_level
+
+
+def test_base_score():
+    assert base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H") == 9.8
+    assert base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H") == 10.0
+    assert base_score("CVSS:3.0/AV:N/AC:H/PR:N/UI:N/S:U/C:H/I:N/A:N") == 5.9
+    assert base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:N/I:N/A:N") == 0.0
+    assert base_score("AV:N/AC:L/Au:N/C:P/I:P/A:P") == 7.5
+    assert base_score("CVSS:3.1/AV:N/AC:L") is None
+    assert base_score("high") is None
+
+
+def test_risk_level():
+    def severity(score, kind="CVSS_V3"):
+        return {"severity": [{"type": kind, "score": score}]}
+
+    assert risk_level(severity("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H")) == "Critical"
+    assert risk_level(severity("CVSS:3.1/AV:L/AC:L/PR:L/UI:N/S:U/C:H/I:H/A:H")) == "High"
+    assert risk_level(severity("AV:N/AC:M/Au:N/C:N/I:P/A:N", "CVSS_V2")) == "Medium"
+    assert risk_level(severity("low", "Ubuntu")) == "Low"
+    assert risk_level({"database_specific": {"cvss_score": 3.1}}) == "Low"
+    assert risk_level({}) == "Medium"
+
+
+def test_source_advisories_use_the_source_version():
+    index = AdvisoryIndex()
+    index.add({"id": "DSA-1", "affected": [{"package": {"ecosystem": "Debian:12", "name": "mawk"}, "ranges": [
+        {"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "1.3.4.20200120-3.1"}]}]}]})
+    index.add({"id": "DSA-2", "affected": [{"package": {"ecosystem": "Debian:12", "name": "glibc"}, "ranges": [
+        {"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "2.36-9+deb12u4"}]}]}]})
+    index.build()
+
+    findings = index.match_hosts({
+        # binNMU: the binary version sorts above the fix, the source version does not
+        "a": [{"name": "mawk", "version": "1.3.4.20200120-3.1+b1", "source": "mawk",
+               "source_version": "1.3.4.20200120-3"}],
+        "b": [{"name": "libc6", "version": "2.36-9+deb12u4", "source": "glibc"}],
+    })
+    assert [(f.package, f.advisory, f.hosts) for f in findings] == [("mawk", "DSA-1", ("a",))]